@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Compara o tempo de extração do preço entre os backends de parsing HTML.
+
+Uso:
+    python benchmarks/benchmark_parsers.py [--repeticoes N]
+    python benchmarks/benchmark_parsers.py --salvar URL SELETOR NOME
+
+As páginas de teste ficam em benchmarks/fixtures/, listadas em seletores.json
+(nome do arquivo -> seletor CSS). Sem páginas salvas, é usada uma página
+sintética de ~2 MB no formato de um marketplace.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scraper.parsers import ParserHTML
+
+DIRETORIO_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+ARQUIVO_SELETORES = os.path.join(DIRETORIO_FIXTURES, 'seletores.json')
+
+def carregar_seletores():
+    if not os.path.exists(ARQUIVO_SELETORES):
+        return {}
+    with open(ARQUIVO_SELETORES, 'r', encoding='utf-8') as arquivo:
+        return json.load(arquivo)
+
+def salvar_fixture(url, seletor, nome):
+    """
+    Baixa uma página e a registra como fixture do benchmark.
+    """
+    import requests
+
+    resposta = requests.get(url, timeout=30, headers={'User-Agent': 'Mozilla/5.0'})
+    resposta.raise_for_status()
+
+    os.makedirs(DIRETORIO_FIXTURES, exist_ok=True)
+    arquivo_html = f"{nome}.html"
+    with open(os.path.join(DIRETORIO_FIXTURES, arquivo_html), 'w', encoding='utf-8') as arquivo:
+        arquivo.write(resposta.text)
+
+    seletores = carregar_seletores()
+    seletores[arquivo_html] = seletor
+    with open(ARQUIVO_SELETORES, 'w', encoding='utf-8') as arquivo:
+        json.dump(seletores, arquivo, indent=2, ensure_ascii=False)
+
+    print(f"Fixture salva: {arquivo_html} ({len(resposta.text) / 1024:.0f} KB)")
+
+def pagina_sintetica():
+    """
+    Gera uma página grande com o preço no início e muitos produtos relacionados depois.
+    """
+    cabecalho = "<html><head><title>Produto</title></head><body><div id='produto'>"
+    preco = "<h1>Produto de teste</h1><span class='preco-principal'>R$ 1.299,90</span></div>"
+    relacionados = "".join(
+        f"<div class='card'><a href='/p/{i}'><img src='/i/{i}.jpg'><span class='nome'>Item {i}</span>"
+        f"<span class='preco'>R$ {i},99</span></a><p>{'descrição ' * 20}</p></div>"
+        for i in range(6000)
+    )
+    return {'sintetica.html': (cabecalho + preco + relacionados + "</body></html>", '.preco-principal')}
+
+def carregar_paginas():
+    paginas = {}
+    for arquivo_html, seletor in carregar_seletores().items():
+        caminho = os.path.join(DIRETORIO_FIXTURES, arquivo_html)
+        if os.path.exists(caminho):
+            with open(caminho, 'r', encoding='utf-8') as arquivo:
+                paginas[arquivo_html] = (arquivo.read(), seletor)
+    return paginas or pagina_sintetica()
+
+def medir(parser, html, seletor, repeticoes):
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        texto = parser.selecionar_texto(html, seletor)
+    return (time.perf_counter() - inicio) / repeticoes, texto
+
+def main():
+    argumentos = argparse.ArgumentParser(description="Benchmark dos backends de parsing HTML")
+    argumentos.add_argument('--repeticoes', type=int, default=5)
+    argumentos.add_argument('--salvar', nargs=3, metavar=('URL', 'SELETOR', 'NOME'))
+    args = argumentos.parse_args()
+
+    if args.salvar:
+        salvar_fixture(*args.salvar)
+        return
+
+    backends = ParserHTML.backends_disponiveis()
+    print(f"Backends disponíveis: {', '.join(backends)}\n")
+    print(f"{'Página':<25} {'KB':>6} {'Backend':<12} {'Modo':<12} {'ms':>9}  Texto")
+
+    for nome, (html, seletor) in carregar_paginas().items():
+        for backend in backends:
+            for modo, progressivo in (('completo', False), ('progressivo', True)):
+                parser = ParserHTML(backend, progressivo=progressivo)
+                segundos, texto = medir(parser, html, seletor, args.repeticoes)
+                print(f"{nome:<25} {len(html) / 1024:>6.0f} {backend:<12} {modo:<12} "
+                      f"{segundos * 1000:>9.1f}  {texto}")
+
+if __name__ == "__main__":
+    main()
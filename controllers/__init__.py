@@ -11,6 +11,9 @@ from .cliente_controller import ClienteController
 from .produto_controller import ProdutoController
 from .admin_controller import AdminController
 from .scheduler_controller import SchedulerController
+from .agendador_daemon import AgendadorDaemon
+from .importador_produtos import ImportadorProdutos
+from .exportador_historico import ExportadorHistorico
 
 # Versão do pacote de controladores
 __version__ = '1.0.0'
\ No newline at end of file
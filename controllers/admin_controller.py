@@ -31,11 +31,15 @@ class AdminController:
                 os.makedirs(pasta_backup)
                 Logger.log("Diretório de backups criado", "INFO")
             
-            # Backup do banco de dados
-            db_file = 'monitor_precos.db'
+            # Backup do banco de dados (via API de backup do SQLite, que inclui o WAL)
+            from database.connector import DatabaseConnector
+            db = DatabaseConnector()
+            db_file = db.DB_FILE
             if os.path.isfile(db_file):
-                shutil.copy2(db_file, f"{pasta_backup}/{db_file}.{data_hora}.bak")
-                print(f"Backup do banco de dados criado: {pasta_backup}/{db_file}.{data_hora}.bak")
+                destino = f"{pasta_backup}/{os.path.basename(db_file)}.{data_hora}.bak"
+                if not db.copiar_banco(destino):
+                    return False
+                print(f"Backup do banco de dados criado: {destino}")
             
             # Backup do arquivo de log
             log_file = 'monitor_precos.log'
@@ -166,7 +170,8 @@ class AdminController:
             resultado = {
                 'tabelas': {},
                 'indices': {},
-                'integridade': None
+                'integridade': None,
+                'perfil': db.verificar_perfil()
             }
             
             # Verificar tabelas existentes
@@ -197,6 +202,9 @@ class AdminController:
                     'tabela': tabela_indice
                 }
             
+            # Verificar índices esperados que estão ausentes
+            resultado['indices_ausentes'] = db.indices_ausentes()
+            
             # Verificar integridade do banco
             cursor.execute("PRAGMA integrity_check")
             integridade = cursor.fetchone()
@@ -253,9 +261,50 @@ class AdminController:
                 
             conexao.close()
             
+            # Recriar índices esperados que estejam ausentes
+            db.migrar_indices()
+            
             Logger.log("Índices reconstruídos com sucesso", "INFO")
             return True
             
         except Exception as e:
             Logger.log(f"Erro ao reconstruir índices: {e}", "ERROR")
-            return False
\ No newline at end of file
+            return False
+    
+    @staticmethod
+    def reconstruir_resumo_precos(id_produto=None):
+        """
+        Recalcula a tabela 'resumo_precos' a partir do histórico de preços.
+        
+        Args:
+            id_produto (int, optional): Produto a recalcular (padrão: todos)
+            
+        Returns:
+            int: Número de produtos resumidos ou None em caso de erro
+        """
+        from models.resumo_precos import ResumoPrecos
+        return ResumoPrecos.reconstruir(id_produto)
+    
+    @staticmethod
+    def limpar_cache_paginas(apenas_antigas=True):
+        """
+        Remove páginas do cache HTTP em disco.
+        
+        Args:
+            apenas_antigas (bool): Se True, remove só as respostas além da idade ou do
+                tamanho máximos do cache; se False, esvazia o cache
+            
+        Returns:
+            int: Número de páginas removidas ou None em caso de erro
+        """
+        try:
+            from scraper.cache_http import CacheHTTP
+            cache = CacheHTTP.obter_instancia()
+            removidas = cache.podar() if apenas_antigas else cache.limpar()
+            
+            Logger.log(f"Cache de páginas limpo: {removidas} páginas removidas", "INFO")
+            return removidas
+            
+        except Exception as e:
+            Logger.log(f"Erro ao limpar cache de páginas: {e}", "ERROR")
+            return None
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Agendador em modo daemon: dorme até o próximo horário configurado e drena a fila em lotes.
+"""
+
+import signal
+import threading
+from datetime import datetime, timedelta
+from controllers.scheduler_controller import SchedulerController
+from scraper.pipeline import PipelineProcessos
+from utils.logger import Logger
+
+class AgendadorDaemon:
+    # Dias aceitos na configuração do agendamento -> datetime.weekday()
+    DIAS_SEMANA = {
+        'segunda': 0,
+        'terca': 1,
+        'quarta': 2,
+        'quinta': 3,
+        'sexta': 4,
+        'sabado': 5,
+        'domingo': 6
+    }
+    # Intervalo máximo (segundos) sem reler a configuração do banco
+    INTERVALO_RECARGA = 300
+
+    def __init__(self, tamanho_lote=None, intervalo_recarga=None):
+        self.tamanho_lote = tamanho_lote or SchedulerController.TAMANHO_LOTE_FILA
+        self.intervalo_recarga = intervalo_recarga or self.INTERVALO_RECARGA
+        self.configuracao = None
+        self._parar = threading.Event()
+        self._acordar = threading.Event()
+        self._recarregar = False
+        self._proxima_anunciada = None
+        # Processos de parsing mantidos entre os lotes (criados no primeiro lote que os usa)
+        self.pipeline = PipelineProcessos()
+
+    def parar(self):
+        """
+        Pede o encerramento; o lote em andamento é concluído antes da saída.
+        """
+        self._parar.set()
+        self._acordar.set()
+
+    def recarregar(self):
+        """
+        Pede a releitura imediata da configuração do agendamento.
+        """
+        self._recarregar = True
+        self._acordar.set()
+
+    def _tratar_sinal(self, numero, _quadro):
+        if hasattr(signal, 'SIGHUP') and numero == signal.SIGHUP:
+            Logger.log("SIGHUP recebido: recarregando configuração do agendamento", "INFO")
+            self.recarregar()
+        else:
+            Logger.log(f"Sinal {numero} recebido: encerrando agendador após o lote atual", "INFO")
+            self.parar()
+
+    def _instalar_sinais(self):
+        """
+        Instala os tratadores de SIGTERM/SIGINT (encerrar) e SIGHUP (recarregar).
+
+        Returns:
+            dict: Tratadores anteriores, para restauração ao final
+        """
+        # Sinais só podem ser tratados na thread principal
+        if threading.current_thread() is not threading.main_thread():
+            return {}
+
+        anteriores = {}
+        for nome in ('SIGTERM', 'SIGINT', 'SIGHUP'):
+            numero = getattr(signal, nome, None)
+            if numero is not None:
+                anteriores[numero] = signal.signal(numero, self._tratar_sinal)
+        return anteriores
+
+    @classmethod
+    def proxima_execucao(cls, configuracao, agora=None):
+        """
+        Calcula o próximo horário previsto que ainda não foi executado.
+
+        Um horário de hoje já passado e sem execução registrada é devolvido como está
+        (execução atrasada); horários de dias anteriores perdidos não são recuperados.
+
+        Args:
+            configuracao (dict): Configuração retornada por obter_configuracao_agendamento
+            agora (datetime, optional): Referência de tempo (padrão: agora)
+
+        Returns:
+            datetime: Próximo horário previsto ou None se o agendamento não tem dias/horário válidos
+        """
+        agora = agora or datetime.now()
+        dias = {cls.DIAS_SEMANA[dia] for dia in configuracao.get('dias') or [] if dia in cls.DIAS_SEMANA}
+
+        try:
+            horario = datetime.strptime(configuracao.get('horario') or '', '%H:%M').time()
+        except ValueError:
+            Logger.log(f"Horário de agendamento inválido: {configuracao.get('horario')!r}", "ERROR")
+            return None
+
+        if not dias:
+            return None
+
+        try:
+            ultima = datetime.strptime(configuracao.get('ultima_execucao') or '', '%Y-%m-%d %H:%M:%S')
+        except ValueError:
+            ultima = None
+
+        for deslocamento in range(8):
+            previsto = datetime.combine(agora.date() + timedelta(days=deslocamento), horario)
+
+            if previsto.weekday() not in dias:
+                continue
+            if ultima and ultima >= previsto:
+                continue
+            if deslocamento == 0 or previsto > agora:
+                return previsto
+
+        return None
+
+    @staticmethod
+    def _chave(configuracao):
+        if not configuracao:
+            return None
+        return configuracao['dias'], configuracao['horario'], configuracao['ativo']
+
+    def carregar_configuracao(self):
+        """
+        Lê a configuração do agendamento, registrando no log quando ela muda.
+
+        Returns:
+            dict: Configuração atual ou None se não houver agendamento
+        """
+        configuracao = SchedulerController.obter_configuracao_agendamento()
+
+        if self._recarregar or self._chave(configuracao) != self._chave(self.configuracao):
+            if not configuracao:
+                Logger.log("Nenhuma configuração de agendamento encontrada", "WARNING")
+            elif not configuracao['ativo']:
+                Logger.log("Agendamento está desativado", "WARNING")
+            else:
+                Logger.log(f"Agendamento: {', '.join(configuracao['dias'])} às {configuracao['horario']}", "INFO")
+            self._proxima_anunciada = None
+
+        self._recarregar = False
+        self.configuracao = configuracao
+        return configuracao
+
+    def _esperar(self, segundos):
+        """
+        Dorme até o tempo indicado ou até um sinal acordar o agendador.
+        """
+        self._acordar.wait(max(0, segundos))
+        self._acordar.clear()
+
+    def _drenar(self, **filtros):
+        """
+        Processa lotes da fila até não restar item pendente para os filtros.
+
+        Args:
+            **filtros: Argumentos repassados a SchedulerController.processar_lote_fila
+
+        Returns:
+            tuple: (produtos processados, lotes com falha, se a fila foi esgotada)
+        """
+        total = 0
+        lotes_com_falha = 0
+
+        while not self._parar.is_set():
+            reservados, sucesso = SchedulerController.processar_lote_fila(
+                self.tamanho_lote, pipeline=self.pipeline, **filtros
+            )
+            if reservados == 0:
+                return total, lotes_com_falha, True
+
+            total += reservados
+            if not sucesso:
+                lotes_com_falha += 1
+
+        return total, lotes_com_falha, False
+
+    def executar_ciclo(self, previsto):
+        """
+        Drena a fila em lotes até que todos os produtos tenham sido verificados
+        (ou tentados) desde o horário previsto. Produtos com intervalo próprio
+        vencidos também são atendidos.
+
+        Args:
+            previsto (datetime): Horário do ciclo
+
+        Returns:
+            bool: True se a fila foi esgotada, False se o ciclo foi interrompido
+        """
+        inicio = previsto.strftime('%Y-%m-%d %H:%M:%S')
+        Logger.log(f"Iniciando ciclo de monitoramento previsto para {inicio}", "INFO")
+
+        total, lotes_com_falha, esgotada = self._drenar(pendentes_desde=inicio)
+        if not esgotada:
+            Logger.log(f"Ciclo interrompido após {total} produtos; será retomado na próxima inicialização", "WARNING")
+            return False
+
+        # Só marca o ciclo como executado depois de esgotar a fila
+        SchedulerController.registrar_execucao()
+
+        nivel = "WARNING" if lotes_com_falha else "INFO"
+        Logger.log(f"Ciclo concluído: {total} produtos processados ({lotes_com_falha} lotes com falhas)", nivel)
+        return True
+
+    def executar_vencidos(self):
+        """
+        Atende os produtos com intervalo próprio cujo vencimento já passou.
+
+        Returns:
+            int: Número de produtos processados
+        """
+        total, lotes_com_falha, _ = self._drenar(incluir_sem_intervalo=False)
+
+        if total:
+            nivel = "WARNING" if lotes_com_falha else "INFO"
+            Logger.log(f"{total} produtos com intervalo próprio verificados "
+                       f"({lotes_com_falha} lotes com falhas)", nivel)
+        return total
+
+    def executar(self):
+        """
+        Executa o agendador até receber SIGTERM/SIGINT.
+
+        Returns:
+            bool: True quando o agendador é encerrado normalmente
+        """
+        anteriores = self._instalar_sinais()
+        Logger.log(f"Agendador iniciado (lotes de {self.tamanho_lote} produtos)", "INFO")
+
+        try:
+            while not self._parar.is_set():
+                configuracao = self.carregar_configuracao()
+
+                previsto = None
+                if configuracao and configuracao['ativo']:
+                    previsto = self.proxima_execucao(configuracao)
+                
+                # Produtos com intervalo próprio vencem mesmo com o agendamento semanal desativado
+                vencimento = SchedulerController.proxima_verificacao_intervalos()
+
+                agora = datetime.now()
+                if previsto and previsto <= agora:
+                    self.executar_ciclo(previsto)
+                    continue
+                if vencimento and vencimento <= agora:
+                    # Nada reservado (ex.: erro no banco): evita repetir a consulta sem pausa
+                    if self.executar_vencidos() == 0:
+                        self._esperar(self.intervalo_recarga)
+                    continue
+
+                proximo = min((momento for momento in (previsto, vencimento) if momento), default=None)
+                if proximo is None:
+                    self._esperar(self.intervalo_recarga)
+                    continue
+
+                if proximo != self._proxima_anunciada:
+                    Logger.log(f"Próxima execução do agendador: {proximo:%Y-%m-%d %H:%M}", "INFO")
+                    self._proxima_anunciada = proximo
+
+                # A configuração é relida periodicamente mesmo sem SIGHUP
+                self._esperar(min((proximo - agora).total_seconds(), self.intervalo_recarga))
+
+            Logger.log("Agendador encerrado", "INFO")
+            return True
+
+        finally:
+            self.pipeline.encerrar()
+            for numero, tratador in anteriores.items():
+                signal.signal(numero, tratador)
@@ -8,6 +8,7 @@ Controlador para autenticação e gerenciamento de usuários.
 import hashlib
 from models.usuario import Usuario
 from models.grupo import Grupo
+from models.permissao import PermissoesUsuario
 from utils.logger import Logger
 
 class AuthController:
@@ -272,35 +273,15 @@ class AuthController:
         
         Args:
             username (str): Nome do usuário
-            cliente (str): Nome do cliente
+            cliente (str | int): Nome ou ID do cliente
             
         Returns:
             bool: True se o usuário tem permissão, False caso contrário
         """
         try:
-            usuario = Usuario.buscar_por_username(username)
-            
-            if not usuario:
-                return False
-            
-            # Administradores têm acesso a todos os clientes
-            if usuario.tipo == 'admin':
-                return True
-            
-            # Buscar grupos do usuário
-            grupos_usuario = usuario.obter_grupos()
-            
-            # Verificar se o usuário pertence ao grupo 'admin'
-            if 'admin' in [g.id_grupo for g in grupos_usuario]:
-                return True
-            
-            # Verificar para cada grupo se o cliente está associado
-            for grupo in grupos_usuario:
-                clientes_grupo = grupo.obter_clientes()
-                if cliente in [c['nome'] for c in clientes_grupo]:
-                    return True
-            
-            return False
+            # Grupos e clientes do usuário são resolvidos em uma consulta e mantidos em cache;
+            # administradores (tipo ou grupo 'admin') têm acesso a todos os clientes
+            return PermissoesUsuario.pode_acessar_cliente(username, cliente)
             
         except Exception as e:
             Logger.log(f"Erro ao verificar permissão de cliente: {e}", "ERROR")
@@ -319,11 +300,7 @@ class AuthController:
             bool: True se o usuário pertence ao grupo, False caso contrário
         """
         try:
-            # Obter grupos do usuário
-            grupos_usuario = AuthController.obter_grupos_usuario(username)
-            
-            # Verificar se o id_grupo está na lista
-            return id_grupo in grupos_usuario
+            return PermissoesUsuario.pertence_grupo(username, id_grupo)
             
         except Exception as e:
             Logger.log(f"Erro ao verificar pertencimento a grupo: {e}", "ERROR")
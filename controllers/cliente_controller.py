@@ -7,6 +7,7 @@ Controlador para operações com clientes.
 
 from models.cliente import Cliente
 from models.grupo import Grupo
+from models.permissao import PermissoesUsuario
 from utils.logger import Logger
 
 class ClienteController:
@@ -42,10 +43,7 @@ class ClienteController:
             
             # Associar o cliente aos grupos apropriados
             # Se for admin, adiciona o cliente aos grupos de admin
-            from controllers.auth_controller import AuthController
-            usuario = AuthController.buscar_usuario_por_username(usuario_atual)
-            
-            if usuario and (usuario.tipo == 'admin' or AuthController.verificar_pertence_grupo(usuario_atual, 'admin')):
+            if PermissoesUsuario.eh_admin(usuario_atual):
                 # Adicionar cliente ao grupo admin
                 grupo_admin = Grupo.buscar_por_id_grupo('admin')
                 if grupo_admin:
@@ -90,28 +88,22 @@ class ClienteController:
             if not usuario_atual:
                 return []
             
-            # Obter permissões do usuário
-            from controllers.auth_controller import AuthController
-            usuario = AuthController.buscar_usuario_por_username(usuario_atual)
+            # Obter permissões do usuário (grupos e clientes em uma única consulta)
+            permissoes = PermissoesUsuario.obter(usuario_atual)
+            if not permissoes:
+                return []
             
             # Se for admin, pode ver todos os clientes
-            if usuario and (usuario.tipo == 'admin' or AuthController.verificar_pertence_grupo(usuario_atual, 'admin')):
+            if permissoes['admin']:
                 clientes = Cliente.listar_todos()
                 return [{'nome': c.nome, 'id': c.id} for c in clientes]
             
-            # Caso contrário, filtra pelos grupos do usuário
-            clientes_permitidos = []
-            grupos_usuario = AuthController.obter_grupos_usuario(usuario_atual)
-            
-            for grupo_id in grupos_usuario:
-                grupo = Grupo.buscar_por_id_grupo(grupo_id)
-                if grupo:
-                    clientes_grupo = grupo.obter_clientes()
-                    for cliente in clientes_grupo:
-                        if cliente['nome'] not in [c['nome'] for c in clientes_permitidos]:
-                            clientes_permitidos.append(cliente)
-            
-            return clientes_permitidos
+            # Caso contrário, os clientes dos grupos do usuário (já sem repetições)
+            clientes_permitidos = [
+                {'nome': nome, 'id': id_cliente}
+                for id_cliente, nome in permissoes['clientes'].items()
+            ]
+            return sorted(clientes_permitidos, key=lambda c: c['nome'])
             
         except Exception as e:
             Logger.log(f"Erro ao listar clientes: {e}", "ERROR")
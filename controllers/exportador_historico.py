@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Exportação do histórico de preços em CSV, JSONL ou Parquet, lendo o banco em fluxo contínuo.
+"""
+
+import csv
+import json
+import os
+from models.historico import Historico
+from models.permissao import PermissoesUsuario
+from utils.logger import Logger
+
+# Saída Parquet opcional: requer pyarrow
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+class ExportadorHistorico:
+    FORMATOS = ('csv', 'jsonl', 'parquet')
+    COLUNAS = ('id', 'data', 'preco', 'id_produto', 'produto', 'concorrente', 'url', 'cliente')
+    # Linhas lidas do banco por vez
+    TAMANHO_BLOCO = 5000
+    # Linhas por row group do Parquet (cada grupo é montado em memória antes de ser gravado)
+    LINHAS_GRUPO_PARQUET = 50000
+
+    def __init__(self, usuario_atual=None, tamanho_bloco=None):
+        self.usuario_atual = usuario_atual
+        self.tamanho_bloco = max(1, tamanho_bloco or self.TAMANHO_BLOCO)
+
+    @staticmethod
+    def parquet_disponivel():
+        """
+        Returns:
+            bool: True se o pyarrow está instalado
+        """
+        return pyarrow is not None
+
+    @classmethod
+    def detectar_formato(cls, destino):
+        """
+        Returns:
+            str: Formato indicado pela extensão do destino ('csv' se não reconhecida)
+        """
+        extensao = os.path.splitext(destino)[1].lower().lstrip('.')
+        if extensao == 'ndjson':
+            return 'jsonl'
+        return extensao if extensao in cls.FORMATOS else 'csv'
+
+    def _escrever_csv(self, linhas, destino):
+        total = 0
+        with open(destino, 'w', encoding='utf-8', newline='') as arquivo:
+            escritor = csv.writer(arquivo)
+            escritor.writerow(self.COLUNAS)
+            for linha in linhas:
+                escritor.writerow(tuple(linha))
+                total += 1
+        return total
+
+    def _escrever_jsonl(self, linhas, destino):
+        total = 0
+        with open(destino, 'w', encoding='utf-8') as arquivo:
+            for linha in linhas:
+                arquivo.write(json.dumps(dict(zip(self.COLUNAS, linha)), ensure_ascii=False))
+                arquivo.write('\n')
+                total += 1
+        return total
+
+    def _escrever_parquet(self, linhas, destino):
+        esquema = pyarrow.schema([
+            ('id', pyarrow.int64()),
+            ('data', pyarrow.string()),
+            ('preco', pyarrow.float64()),
+            ('id_produto', pyarrow.int64()),
+            ('produto', pyarrow.string()),
+            ('concorrente', pyarrow.string()),
+            ('url', pyarrow.string()),
+            ('cliente', pyarrow.string())
+        ])
+
+        total = 0
+        colunas = [[] for _ in self.COLUNAS]
+
+        def gravar_grupo(escritor):
+            escritor.write_table(pyarrow.Table.from_arrays(
+                [pyarrow.array(valores, type=campo.type) for valores, campo in zip(colunas, esquema)],
+                schema=esquema
+            ))
+            for valores in colunas:
+                valores.clear()
+
+        with pyarrow.parquet.ParquetWriter(destino, esquema) as escritor:
+            for linha in linhas:
+                for valores, valor in zip(colunas, linha):
+                    valores.append(valor)
+                total += 1
+
+                if len(colunas[0]) >= self.LINHAS_GRUPO_PARQUET:
+                    gravar_grupo(escritor)
+
+            if colunas[0]:
+                gravar_grupo(escritor)
+
+        return total
+
+    def exportar(self, destino, formato=None, cliente=None, data_inicio=None, data_fim=None, concorrente=None):
+        """
+        Exporta o histórico de preços com os dados de produto e cliente.
+
+        Args:
+            destino (str): Arquivo de saída
+            formato (str, optional): 'csv', 'jsonl' ou 'parquet' (padrão: pela extensão do destino)
+            cliente (str, optional): Restringe a um cliente
+            data_inicio (str, optional): Data inicial 'AAAA-MM-DD' (inclusive)
+            data_fim (str, optional): Data final 'AAAA-MM-DD' (inclusive)
+            concorrente (str, optional): Restringe a um concorrente
+
+        Returns:
+            int: Número de registros exportados ou None em caso de erro
+        """
+        formato = formato or self.detectar_formato(destino)
+
+        if formato not in self.FORMATOS:
+            Logger.log(f"Formato de exportação inválido: {formato}", "ERROR")
+            return None
+        if formato == 'parquet' and not self.parquet_disponivel():
+            Logger.log("Exportação em Parquet indisponível (instale pyarrow)", "ERROR")
+            return None
+
+        # Sem usuário (linha de comando) o histórico de todos os clientes é exportado
+        id_usuario = None
+        if self.usuario_atual:
+            permissoes = PermissoesUsuario.obter(self.usuario_atual)
+            if not permissoes:
+                return None
+            if cliente and not PermissoesUsuario.pode_acessar_cliente(self.usuario_atual, cliente):
+                Logger.log(f"Usuário {self.usuario_atual} tentou exportar histórico de cliente não autorizado: {cliente}", "WARNING")
+                return None
+            if not permissoes['admin']:
+                id_usuario = permissoes['id_usuario']
+
+        linhas = Historico.iterar_detalhado(id_usuario, cliente, data_inicio, data_fim, concorrente,
+                                            self.tamanho_bloco)
+        escrever = {
+            'csv': self._escrever_csv,
+            'jsonl': self._escrever_jsonl,
+            'parquet': self._escrever_parquet
+        }[formato]
+
+        try:
+            total = escrever(linhas, destino)
+        except Exception as e:
+            Logger.log(f"Erro ao exportar histórico para {destino}: {e}", "ERROR")
+            return None
+        finally:
+            linhas.close()
+
+        Logger.log(f"{total} registros de histórico exportados para {destino} ({formato})", "INFO")
+        return total
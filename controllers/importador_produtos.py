@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Importação em lote de produtos a partir de arquivos CSV ou JSONL.
+"""
+
+import csv
+import json
+import os
+from datetime import datetime
+from itertools import islice
+from urllib.parse import urlparse
+from database.connector import DatabaseConnector
+from models.gravador_precos import GravadorPrecos
+from models.grupo import Grupo
+from models.permissao import PermissoesUsuario
+from controllers.produto_controller import ProdutoController
+from scraper.price_scraper import PriceScraper
+from scraper.executor import ExecutorConcorrente
+from scraper.cache_http import CacheHTTP
+from scraper.estrategias import EstrategiasDominio
+from utils.logger import Logger
+
+class ImportadorProdutos:
+    # Registros lidos e processados por vez (a memória usada não depende do tamanho do arquivo)
+    TAMANHO_BLOCO = 200
+    CAMPOS = ('cliente', 'produto', 'concorrente', 'url')
+    # Cabeçalhos alternativos aceitos no arquivo
+    SINONIMOS = {'nome': 'produto', 'link': 'url'}
+    # Falhas mantidas no relatório (as demais são apenas contadas)
+    MAX_FALHAS_RELATORIO = 10000
+
+    def __init__(self, usuario_atual=None, max_workers=None, max_por_dominio=None, tamanho_bloco=None):
+        self.usuario_atual = usuario_atual
+        self.tamanho_bloco = max(1, tamanho_bloco or self.TAMANHO_BLOCO)
+        self.executor = ExecutorConcorrente(max_workers, max_por_dominio)
+        self.scraper = PriceScraper()
+        self.db = DatabaseConnector()
+        # Resolvidos uma vez por importação: nome do cliente -> id, domínio -> seletor
+        self._clientes = {}
+        self._seletores = {}
+
+    @staticmethod
+    def detectar_formato(caminho):
+        """
+        Returns:
+            str: 'jsonl' para arquivos .jsonl/.ndjson, 'csv' para os demais
+        """
+        extensao = os.path.splitext(caminho)[1].lower()
+        return 'jsonl' if extensao in ('.jsonl', '.ndjson') else 'csv'
+
+    @classmethod
+    def _normalizar(cls, registro):
+        campos = {}
+        for chave, valor in registro.items():
+            if not isinstance(chave, str):
+                continue
+            chave = chave.strip().lower()
+            campos[cls.SINONIMOS.get(chave, chave)] = str(valor).strip() if valor is not None else ''
+        return campos
+
+    @classmethod
+    def ler_registros(cls, caminho, formato=None):
+        """
+        Lê o arquivo de produtos registro a registro.
+
+        Args:
+            caminho (str): Caminho do arquivo
+            formato (str, optional): 'csv' ou 'jsonl' (padrão: pela extensão)
+
+        Yields:
+            tuple: (número da linha, dict com os campos normalizados ou None se a linha é inválida)
+        """
+        formato = formato or cls.detectar_formato(caminho)
+
+        with open(caminho, encoding='utf-8-sig', newline='') as arquivo:
+            if formato == 'jsonl':
+                for numero, linha in enumerate(arquivo, 1):
+                    if not linha.strip():
+                        continue
+                    try:
+                        registro = json.loads(linha)
+                    except ValueError:
+                        yield numero, None
+                        continue
+                    yield numero, cls._normalizar(registro) if isinstance(registro, dict) else None
+                return
+
+            # Separador detectado pelo início do arquivo (vírgula, ponto e vírgula ou tabulação)
+            amostra = arquivo.read(4096)
+            arquivo.seek(0)
+            try:
+                dialeto = csv.Sniffer().sniff(amostra, delimiters=',;\t')
+            except csv.Error:
+                dialeto = csv.excel
+
+            leitor = csv.DictReader(arquivo, dialect=dialeto)
+            for registro in leitor:
+                yield leitor.line_num, cls._normalizar(registro)
+
+    @staticmethod
+    def url_valida(url):
+        """
+        Returns:
+            bool: True se a URL é http(s) e tem domínio
+        """
+        try:
+            partes = urlparse(url)
+        except ValueError:
+            return False
+        return partes.scheme in ('http', 'https') and bool(partes.netloc)
+
+    def _registrar_falha(self, relatorio, numero, registro, motivo):
+        relatorio['total_falhas'] += 1
+        if len(relatorio['falhas']) < self.MAX_FALHAS_RELATORIO:
+            relatorio['falhas'].append({
+                'linha': numero,
+                'cliente': (registro or {}).get('cliente', ''),
+                'produto': (registro or {}).get('produto', ''),
+                'url': (registro or {}).get('url', ''),
+                'motivo': motivo
+            })
+
+    def _validar(self, numero, registro, relatorio):
+        """
+        Verifica campos, URL e permissão de um registro.
+
+        Returns:
+            bool: True se o registro pode seguir para o teste de preço
+        """
+        if registro is None:
+            self._registrar_falha(relatorio, numero, None, "Linha inválida")
+            return False
+
+        ausentes = [campo for campo in self.CAMPOS if not registro.get(campo)]
+        if ausentes:
+            self._registrar_falha(relatorio, numero, registro, f"Campos ausentes: {', '.join(ausentes)}")
+            return False
+
+        if not self.url_valida(registro['url']):
+            self._registrar_falha(relatorio, numero, registro, "URL inválida")
+            return False
+
+        if self.usuario_atual and not PermissoesUsuario.pode_acessar_cliente(self.usuario_atual, registro['cliente']):
+            self._registrar_falha(relatorio, numero, registro, "Sem permissão para o cliente")
+            return False
+
+        return True
+
+    def _resolver_clientes(self, nomes, id_grupo):
+        """
+        Obtém os IDs dos clientes do bloco, criando de uma vez os que não existem.
+        Como em ClienteController.adicionar_cliente, os clientes criados entram no
+        grupo 'all' e no grupo do usuário ('admin' ou o grupo pessoal).
+
+        Args:
+            nomes (set): Nomes dos clientes
+            id_grupo (int): Grupo do usuário que está importando
+        """
+        faltando = [nome for nome in nomes if nome not in self._clientes]
+        if not faltando:
+            return
+
+        data_atual = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        marcadores = ', '.join('?' * len(faltando))
+
+        with self.db.transacao() as cursor:
+            cursor.execute(f"SELECT nome FROM clientes WHERE nome IN ({marcadores})", faltando)
+            ja_existentes = {linha['nome'] for linha in cursor.fetchall()}
+
+            cursor.executemany('''
+            INSERT OR IGNORE INTO clientes (nome, data_criacao)
+            VALUES (?, ?)
+            ''', [(nome, data_atual) for nome in faltando if nome not in ja_existentes])
+
+            cursor.execute(f"SELECT id, nome FROM clientes WHERE nome IN ({marcadores})", faltando)
+            ids = {linha['nome']: linha['id'] for linha in cursor.fetchall()}
+            self._clientes.update(ids)
+
+        criados = [id_cliente for nome, id_cliente in ids.items() if nome not in ja_existentes]
+        if not criados:
+            return
+
+        # Associações em lote; Grupo.adicionar_clientes também invalida o cache de permissões
+        for grupo in (Grupo.buscar_por_id_grupo('all'), Grupo.buscar_por_id(id_grupo)):
+            if grupo and grupo.adicionar_clientes(criados) is None:
+                Logger.log(f"Clientes importados não associados ao grupo {grupo.id_grupo}", "WARNING")
+
+        Logger.log(f"{len(criados)} clientes criados na importação de produtos", "INFO")
+
+    def _seletor(self, dominio, url):
+        # Um seletor por domínio, resolvido pelo índice carregado no início da importação
+        if dominio not in self._seletores:
+            self._seletores[dominio] = self.scraper.obter_seletor_para_url(url)
+        return self._seletores[dominio]
+
+    def _existentes(self, id_grupo, candidatos):
+        """
+        Returns:
+            set: Chaves (id_cliente, nome, url) dos candidatos já cadastrados no grupo
+        """
+        urls = list({candidato['url'] for candidato in candidatos})
+        marcadores = ', '.join('?' * len(urls))
+
+        conexao, cursor = self.db.criar_conexao()
+        cursor.execute(f'''
+        SELECT id_cliente, nome, url FROM produtos
+        WHERE id_grupo = ? AND url IN ({marcadores})
+        ''', [id_grupo] + urls)
+        existentes = {(linha['id_cliente'], linha['nome'], linha['url']) for linha in cursor.fetchall()}
+        conexao.close()
+
+        return existentes
+
+    def _testar_preco(self, candidato):
+        """
+        Extrai o preço da página do candidato. A página fica memorizada no cache
+        HTTP enquanto o bloco é testado, então URLs repetidas no bloco são
+        baixadas uma única vez.
+
+        Returns:
+            float: Preço encontrado ou None
+        """
+        texto = self.scraper.extrair_preco(candidato['url'], candidato['seletor'])
+        return self.scraper.converter_preco(texto) if texto else None
+
+    def _inserir(self, id_grupo, aprovados):
+        """
+        Grava os produtos aprovados e suas entradas na fila em uma única transação.
+
+        Args:
+            id_grupo (int): Grupo dos produtos
+            aprovados (list): Tuplas (candidato, preço)
+
+        Returns:
+            list: Tuplas (id_produto, preço)
+        """
+        data_atual = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        inseridos = []
+
+        with self.db.transacao() as cursor:
+            for candidato, valor in aprovados:
+                cursor.execute('''
+                INSERT INTO produtos (id_cliente, nome, concorrente, url, id_grupo, data_criacao)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ''', (candidato['id_cliente'], candidato['produto'], candidato['concorrente'],
+                      candidato['url'], id_grupo, data_atual))
+                inseridos.append((cursor.lastrowid, valor))
+
+            cursor.executemany('''
+            INSERT OR IGNORE INTO fila_agendamento (id_produto, posicao_fila, data_inclusao)
+            VALUES (?, (SELECT COALESCE(MAX(posicao_fila), 0) + 1 FROM fila_agendamento), ?)
+            ''', [(id_produto, data_atual) for id_produto, _ in inseridos])
+
+        return inseridos
+
+    def _processar_bloco(self, bloco, id_grupo, gravador, relatorio):
+        """
+        Valida, testa e grava um bloco de registros.
+
+        Args:
+            bloco (list): Tuplas (número da linha, registro)
+            id_grupo (int): Grupo dos produtos
+            gravador (GravadorPrecos): Gravador do histórico inicial
+            relatorio (dict): Relatório atualizado com o resultado do bloco
+        """
+        candidatos = []
+        for numero, registro in bloco:
+            if self._validar(numero, registro, relatorio):
+                registro['linha'] = numero
+                candidatos.append(registro)
+
+        if not candidatos:
+            return
+
+        self._resolver_clientes({candidato['cliente'] for candidato in candidatos}, id_grupo)
+
+        existentes = self._existentes(id_grupo, candidatos)
+        novos = []
+        for candidato in candidatos:
+            candidato['id_cliente'] = self._clientes.get(candidato['cliente'])
+            chave = (candidato['id_cliente'], candidato['produto'], candidato['url'])
+
+            if candidato['id_cliente'] is None:
+                self._registrar_falha(relatorio, candidato['linha'], candidato, "Cliente não pôde ser criado")
+            elif chave in existentes:
+                relatorio['existentes'] += 1
+            else:
+                # Repetições dentro do bloco contam como já existentes
+                existentes.add(chave)
+                candidato['dominio'] = self.scraper.extrair_dominio(candidato['url'])
+                candidato['seletor'] = self._seletor(candidato['dominio'], candidato['url'])
+                novos.append(candidato)
+
+        if not novos:
+            return
+
+        # Testes de preço em paralelo, respeitando os limites por domínio; as páginas do
+        # bloco saem da memória em seguida (a memória não cresce com o arquivo)
+        try:
+            resultados = self.executor.executar(novos, self._testar_preco, lambda candidato: candidato['dominio'])
+        finally:
+            CacheHTTP.obter_instancia().descartar(candidato['url'] for candidato in novos)
+
+        aprovados = []
+        for candidato, valor in resultados:
+            if valor is None:
+                self._registrar_falha(relatorio, candidato['linha'], candidato, "Preço não encontrado na página")
+            else:
+                aprovados.append((candidato, valor))
+
+        if not aprovados:
+            return
+
+        try:
+            inseridos = self._inserir(id_grupo, aprovados)
+        except Exception as e:
+            Logger.log(f"Erro ao gravar bloco de {len(aprovados)} produtos importados: {e}", "ERROR")
+            for candidato, _ in aprovados:
+                self._registrar_falha(relatorio, candidato['linha'], candidato, f"Erro ao gravar: {e}")
+            return
+
+        # O preço do teste é o primeiro registro do histórico (sem nova requisição)
+        for id_produto, valor in inseridos:
+            gravador.adicionar(id_produto, valor)
+        relatorio['importados'] += len(inseridos)
+
+    def importar(self, caminho, formato=None):
+        """
+        Importa os produtos do arquivo, bloco a bloco: valida os registros, resolve
+        clientes e seletores, testa os preços em paralelo e grava produtos, fila e
+        histórico inicial em transações por lote.
+
+        Args:
+            caminho (str): Arquivo com as colunas cliente, produto, concorrente e url
+            formato (str, optional): 'csv' ou 'jsonl' (padrão: pela extensão)
+
+        Returns:
+            dict: {'lidos', 'importados', 'existentes', 'total_falhas',
+                   'falhas' (list de dicts com linha, cliente, produto, url e motivo)}
+        """
+        relatorio = {'lidos': 0, 'importados': 0, 'existentes': 0, 'total_falhas': 0, 'falhas': []}
+
+        id_grupo = ProdutoController.obter_grupo_usuario(self.usuario_atual)
+        if not id_grupo:
+            self._registrar_falha(relatorio, 0, None, "Grupo do usuário não encontrado")
+            return relatorio
+
+        PriceScraper.carregar_indice_seletores()
+        CacheHTTP.obter_instancia().iniciar_execucao()
+
+        Logger.log(f"Importando produtos de {caminho} por {self.usuario_atual}", "INFO")
+
+        try:
+            registros = self.ler_registros(caminho, formato)
+
+            with GravadorPrecos() as gravador:
+                while True:
+                    bloco = list(islice(registros, self.tamanho_bloco))
+                    if not bloco:
+                        break
+
+                    relatorio['lidos'] += len(bloco)
+                    self._processar_bloco(bloco, id_grupo, gravador, relatorio)
+
+            # Preços iniciais que não puderam ser gravados
+            if gravador.total_falhas:
+                self._registrar_falha(relatorio, 0, None,
+                                      f"{gravador.total_falhas} preços iniciais não gravados no histórico")
+
+        except (OSError, csv.Error, UnicodeDecodeError) as e:
+            Logger.log(f"Erro ao ler arquivo de importação {caminho}: {e}", "ERROR")
+            self._registrar_falha(relatorio, 0, None, f"Erro ao ler o arquivo: {e}")
+
+        finally:
+            CacheHTTP.obter_instancia().encerrar_execucao()
+
+        # Gravar as estratégias de extração aprendidas nos testes
+        EstrategiasDominio.obter_instancia().salvar()
+
+        Logger.log(f"Importação concluída: {relatorio['importados']}/{relatorio['lidos']} produtos importados, "
+                   f"{relatorio['existentes']} já existentes, {relatorio['total_falhas']} falhas",
+                   "WARNING" if relatorio['total_falhas'] else "INFO")
+        return relatorio
+
+    @staticmethod
+    def salvar_falhas(relatorio, caminho):
+        """
+        Grava as falhas do relatório em CSV.
+
+        Args:
+            relatorio (dict): Relatório retornado por importar
+            caminho (str): Arquivo de saída
+
+        Returns:
+            bool: True se o arquivo foi gravado, False caso contrário
+        """
+        try:
+            with open(caminho, 'w', encoding='utf-8', newline='') as arquivo:
+                escritor = csv.DictWriter(arquivo, fieldnames=['linha', 'cliente', 'produto', 'url', 'motivo'])
+                escritor.writeheader()
+                escritor.writerows(relatorio['falhas'])
+            return True
+        except OSError as e:
+            Logger.log(f"Erro ao gravar relatório de importação {caminho}: {e}", "ERROR")
+            return False
@@ -5,11 +5,19 @@
 Controlador para operações com produtos.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from models.produto import Produto
 from models.cliente import Cliente
 from models.grupo import Grupo
+from models.permissao import PermissoesUsuario
+from models.gravador_precos import GravadorPrecos
 from utils.logger import Logger
 from scraper.price_scraper import PriceScraper
+from scraper.executor import ExecutorConcorrente
+from scraper.cache_http import CacheHTTP
+from scraper.estrategias import EstrategiasDominio
+from scraper.fetcher_async import FetcherAssincrono
+from scraper.pipeline import PipelineProcessos
 
 class ProdutoController:
     @staticmethod
@@ -49,28 +57,10 @@ class ProdutoController:
                     return False
             
             # Determinar o grupo do usuário
-            id_grupo = None
-            
-            if usuario_atual:
-                if usuario_atual == "admin" or AuthController.verificar_pertence_grupo(usuario_atual, "admin"):
-                    # Admin usa o grupo 'admin'
-                    grupo = Grupo.buscar_por_id_grupo("admin")
-                    if grupo:
-                        id_grupo = grupo.id
-                else:
-                    # Usuário comum usa seu grupo pessoal
-                    grupo = Grupo.buscar_por_id_grupo(usuario_atual)
-                    if grupo:
-                        id_grupo = grupo.id
+            id_grupo = ProdutoController.obter_grupo_usuario(usuario_atual)
             
             if not id_grupo:
-                # Se não encontrou grupo, usa o grupo 'admin' como padrão
-                grupo = Grupo.buscar_por_id_grupo("admin")
-                if grupo:
-                    id_grupo = grupo.id
-                else:
-                    Logger.log("Grupo 'admin' não encontrado", "ERROR")
-                    return False
+                return False
             
             # Extrair o domínio da URL para buscar seletor
             scraper = PriceScraper()
@@ -80,10 +70,10 @@ class ProdutoController:
             seletor_css = scraper.obter_seletor_para_url(url)
             
             if not seletor_css:
-                Logger.log(f"Não foi possível obter um seletor CSS para a URL: {url}", "WARNING")
-                return False
+                # Sem seletor, o preço ainda pode vir dos dados estruturados da página
+                Logger.log(f"Sem seletor CSS para a URL, usando apenas dados estruturados: {url}", "INFO")
             
-            # Testar o seletor
+            # Testar a extração
             preco_teste = scraper.extrair_preco(url, seletor_css)
             
             if not preco_teste:
@@ -115,6 +105,57 @@ class ProdutoController:
             Logger.log(f"Erro ao adicionar produto: {e}", "ERROR")
             return False
     
+    @staticmethod
+    def obter_grupo_usuario(usuario_atual=None):
+        """
+        Determina o grupo em que os produtos cadastrados pelo usuário são gravados.
+        
+        Args:
+            usuario_atual (str): Nome do usuário
+            
+        Returns:
+            int: ID (chave interna) do grupo ou None se o grupo 'admin' não existe
+        """
+        from controllers.auth_controller import AuthController
+        
+        if usuario_atual:
+            if usuario_atual == "admin" or AuthController.verificar_pertence_grupo(usuario_atual, "admin"):
+                # Admin usa o grupo 'admin'
+                grupo = Grupo.buscar_por_id_grupo("admin")
+            else:
+                # Usuário comum usa seu grupo pessoal
+                grupo = Grupo.buscar_por_id_grupo(usuario_atual)
+            
+            if grupo:
+                return grupo.id
+        
+        # Se não encontrou grupo, usa o grupo 'admin' como padrão
+        grupo = Grupo.buscar_por_id_grupo("admin")
+        if not grupo:
+            Logger.log("Grupo 'admin' não encontrado", "ERROR")
+            return None
+        return grupo.id
+    
+    @staticmethod
+    def importar_produtos(caminho, formato=None, usuario_atual=None, max_workers=None, max_por_dominio=None):
+        """
+        Importa produtos de um arquivo CSV ou JSONL (ver ImportadorProdutos).
+        
+        Args:
+            caminho (str): Arquivo com as colunas cliente, produto, concorrente e url
+            formato (str, optional): 'csv' ou 'jsonl' (padrão: pela extensão do arquivo)
+            usuario_atual (str): Nome do usuário que está importando os produtos
+            max_workers (int, optional): Limite global de testes de preço simultâneos
+            max_por_dominio (int, optional): Limite de testes simultâneos por domínio
+            
+        Returns:
+            dict: Relatório da importação (ver ImportadorProdutos.importar)
+        """
+        from controllers.importador_produtos import ImportadorProdutos
+        
+        importador = ImportadorProdutos(usuario_atual, max_workers, max_por_dominio)
+        return importador.importar(caminho, formato)
+    
     @staticmethod
     def remover_produto(id_produto, usuario_atual=None):
         """
@@ -159,87 +200,72 @@ class ProdutoController:
             return False
     
     @staticmethod
-    def listar_produtos(cliente=None, usuario_atual=None):
+    def listar_produtos(cliente=None, usuario_atual=None, limite=None, deslocamento=0):
         """
         Lista os produtos monitorados, opcionalmente filtrados por cliente.
         
         Args:
             cliente (str): Nome do cliente para filtrar
             usuario_atual (str): Nome do usuário atual
+            limite (int, optional): Número máximo de produtos (paginação)
+            deslocamento (int): Produtos a pular (paginação)
             
         Returns:
             list: Lista dos produtos encontrados
         """
         try:
-            from controllers.auth_controller import AuthController
-            from controllers.cliente_controller import ClienteController
-            
-            # Lista para armazenar os produtos
-            produtos_resultado = []
-            
-            # Se um cliente específico foi informado
-            if cliente:
-                # Buscar cliente
-                cliente_obj = Cliente.buscar_por_nome(cliente)
-                
-                if not cliente_obj:
-                    return []
-                
-                # Verificar permissão do usuário para este cliente
-                if usuario_atual and not AuthController.verificar_permissao_cliente(usuario_atual, cliente):
-                    Logger.log(f"Usuário {usuario_atual} tentou listar produtos para cliente não autorizado: {cliente}", "WARNING")
-                    return []
-                
-                # Buscar produtos do cliente
-                produtos = Produto.listar_por_cliente(cliente_obj.id)
-                
-                # Converter para formato de dicionário
-                for p in produtos:
-                    produtos_resultado.append({
-                        'id': p.id,
-                        'cliente': cliente,
-                        'produto': p.nome,
-                        'concorrente': p.concorrente,
-                        'url': p.url,
-                        'grupo': None  # Será preenchido depois
-                    })
-            else:
-                # Listar todos os clientes que o usuário tem acesso
-                clientes_permitidos = ClienteController.listar_clientes(usuario_atual)
-                
-                for cliente_info in clientes_permitidos:
-                    # Buscar produtos de cada cliente
-                    cliente_obj = Cliente.buscar_por_id(cliente_info['id'])
-                    if cliente_obj:
-                        produtos = Produto.listar_por_cliente(cliente_obj.id)
-                        
-                        # Adicionar à lista de resultados
-                        for p in produtos:
-                            produtos_resultado.append({
-                                'id': p.id,
-                                'cliente': cliente_obj.nome,
-                                'produto': p.nome,
-                                'concorrente': p.concorrente,
-                                'url': p.url,
-                                'grupo': None  # Será preenchido depois
-                            })
-            
-            # Obter informações dos grupos
-            for produto in produtos_resultado:
-                p_obj = Produto.buscar_por_id(produto['id'])
-                if p_obj and p_obj.id_grupo:
-                    grupo = Grupo.buscar_por_id(p_obj.id_grupo)
-                    if grupo:
-                        produto['grupo'] = grupo.id_grupo
-            
-            return produtos_resultado
+            return list(ProdutoController.iterar_produtos(cliente, usuario_atual, limite, deslocamento))
             
         except Exception as e:
             Logger.log(f"Erro ao listar produtos: {e}", "ERROR")
             return []
     
     @staticmethod
-    def monitorar_todos_produtos(usuario_atual=None, verificacao_manual=False, limite_produtos=None):
+    def iterar_produtos(cliente=None, usuario_atual=None, limite=None, deslocamento=0):
+        """
+        Percorre os produtos que o usuário pode ver, lidos do banco em blocos
+        por uma única consulta.
+        
+        Args:
+            cliente (str): Nome do cliente para filtrar
+            usuario_atual (str): Nome do usuário atual
+            limite (int, optional): Número máximo de produtos (paginação)
+            deslocamento (int): Produtos a pular (paginação)
+            
+        Yields:
+            dict: Produto com as chaves 'id', 'cliente', 'produto', 'concorrente', 'url',
+                  'grupo' e as demais colunas de 'produtos' (id_cliente, id_grupo, ...)
+        """
+        from controllers.auth_controller import AuthController
+        
+        id_usuario = None
+        
+        if cliente:
+            # Verificar permissão do usuário para este cliente
+            if usuario_atual and not AuthController.verificar_permissao_cliente(usuario_atual, cliente):
+                Logger.log(f"Usuário {usuario_atual} tentou listar produtos para cliente não autorizado: {cliente}", "WARNING")
+                return
+        else:
+            # Sem cliente, a lista se restringe aos clientes que o usuário pode acessar
+            if not usuario_atual:
+                return
+            
+            permissoes = PermissoesUsuario.obter(usuario_atual)
+            if not permissoes:
+                return
+            
+            # Administradores veem todos os clientes
+            if not permissoes['admin']:
+                id_usuario = permissoes['id_usuario']
+        
+        for linha in Produto.iterar_detalhados(id_usuario, cliente or None, limite, deslocamento):
+            linha['produto'] = linha['nome']
+            yield linha
+    
+    @staticmethod
+    def monitorar_todos_produtos(usuario_atual=None, verificacao_manual=False, limite_produtos=None,
+                                 concorrente=False, max_workers=None, max_por_dominio=None,
+                                 assincrono=False, processos=False, ids_produtos=None, pipeline=None):
         """
         Monitora produtos cadastrados, extraindo e registrando seus preços.
         
@@ -247,36 +273,51 @@ class ProdutoController:
             usuario_atual (str): Nome do usuário que solicitou o monitoramento
             verificacao_manual (bool): Se True, marca os produtos como verificados manualmente
             limite_produtos (int): Limita o número de produtos a serem verificados
+            concorrente (bool): Se True, verifica os produtos em paralelo
+            max_workers (int, optional): Limite global de verificações simultâneas
+            max_por_dominio (int, optional): Limite de verificações simultâneas por domínio
+            assincrono (bool): Se True, baixa antes as páginas estáticas com o FetcherAssincrono,
+                               em janelas de FetcherAssincrono.JANELA produtos
+            processos (bool): Se True, extrai os preços das páginas estáticas em processos
+                              (PipelineProcessos) e usa a extração completa só nos restantes
+            ids_produtos (list, optional): IDs já obtidos da fila (ex.: reservados pelo agendador)
+            pipeline (PipelineProcessos, optional): Pipeline a reutilizar (ex.: o do agendador, que
+                mantém os processos entre os lotes); sem ele, um pipeline é criado e encerrado aqui
             
         Returns:
             bool: True se pelo menos um produto foi monitorado com sucesso, False caso contrário
         """
+        # Os processos de parsing são criados uma vez e reaproveitados em todas as janelas
+        pipeline_proprio = processos and pipeline is None
+        if pipeline_proprio:
+            pipeline = PipelineProcessos(max_workers=max_workers, max_por_dominio=max_por_dominio)
+        
+        # URLs repetidas são baixadas uma única vez por execução
+        CacheHTTP.obter_instancia().iniciar_execucao()
+        
         try:
             scraper = PriceScraper()
             
-            # Se é um monitoramento automático e temos um limite, usamos a fila
-            if not verificacao_manual and limite_produtos:
-                from controllers.scheduler_controller import SchedulerController
-                produtos_ids = SchedulerController.obter_proximos_produtos_fila(limite_produtos)
+            # Recarregar o índice de seletores uma vez por execução
+            PriceScraper.carregar_indice_seletores()
+            
+            # Se é um monitoramento automático e temos um limite (ou os IDs), usamos a fila
+            if ids_produtos is not None or (not verificacao_manual and limite_produtos):
+                if ids_produtos is not None:
+                    produtos_ids = ids_produtos
+                else:
+                    from controllers.scheduler_controller import SchedulerController
+                    produtos_ids = SchedulerController.obter_proximos_produtos_fila(limite_produtos)
                 
                 if not produtos_ids:
                     Logger.log("Fila de agendamento vazia", "INFO")
                     return True
                 
-                produtos = []
-                for id_produto in produtos_ids:
-                    produto = Produto.buscar_por_id(id_produto)
-                    if produto:
-                        produtos.append(produto)
+                produtos = Produto.buscar_por_ids(produtos_ids)
             else:
-                # Buscar produtos com base nas permissões do usuário
-                produtos_info = ProdutoController.listar_produtos(usuario_atual=usuario_atual)
-                
-                produtos = []
-                for info in produtos_info:
-                    produto = Produto.buscar_por_id(info['id'])
-                    if produto:
-                        produtos.append(produto)
+                # Buscar produtos com base nas permissões do usuário (uma única consulta)
+                produtos = [Produto.de_registro(linha)
+                            for linha in ProdutoController.iterar_produtos(usuario_atual=usuario_atual)]
             
             if not produtos:
                 Logger.log("Não há produtos para monitorar", "INFO")
@@ -284,28 +325,147 @@ class ProdutoController:
             
             Logger.log(f"Iniciando monitoramento de {len(produtos)} produtos", "INFO")
             
-            sucesso = False
-            produtos_verificados = 0
-            
-            for produto in produtos:
-                # Buscar seletor CSS adequado para a URL
-                seletor_css = scraper.obter_seletor_para_url(produto.url)
-                
-                if not seletor_css:
-                    Logger.log(f"Não foi possível obter um seletor CSS para o produto ID {produto.id}", "WARNING")
-                    continue
-                
-                # Registrar preço
-                if produto.registrar_preco(seletor_css, verificacao_manual):
-                    sucesso = True
-                    produtos_verificados += 1
+            if assincrono and not FetcherAssincrono.disponivel():
+                Logger.log("Download assíncrono indisponível (instale httpx ou aiohttp); usando requests", "INFO")
+                assincrono = False
+            
+            # Com download assíncrono, os produtos são processados em janelas: a próxima
+            # janela é baixada enquanto a atual é processada, e as páginas de cada janela
+            # saem da memória assim que ela termina
+            tamanho_janela = FetcherAssincrono.JANELA if assincrono else len(produtos)
+            janelas = [produtos[i:i + tamanho_janela] for i in range(0, len(produtos), tamanho_janela)]
+            
+            # Os preços são acumulados e gravados em lotes, uma transação por lote
+            with GravadorPrecos() as gravador, ThreadPoolExecutor(max_workers=1) as antecipacao:
+                download = None
+                if assincrono:
+                    download = antecipacao.submit(ProdutoController._baixar_paginas_assincrono, janelas[0], scraper)
                 
-                import time
-                time.sleep(0.5)  # Pausa pequena entre requisições
+                for indice, janela in enumerate(janelas):
+                    urls_baixadas = []
+                    if download is not None:
+                        urls_baixadas = download.result()
+                        download = None
+                        if indice + 1 < len(janelas):
+                            download = antecipacao.submit(
+                                ProdutoController._baixar_paginas_assincrono, janelas[indice + 1], scraper
+                            )
+                    
+                    ProdutoController._verificar_produtos(
+                        janela, scraper, gravador, verificacao_manual, concorrente,
+                        pipeline if processos else None, max_workers, max_por_dominio
+                    )
+                    
+                    CacheHTTP.obter_instancia().descartar(urls_baixadas)
+            
+            # Gravar as estratégias de extração aprendidas nesta execução
+            EstrategiasDominio.obter_instancia().salvar()
+            
+            # Só contam os preços confirmados no banco (o último lote é gravado ao sair do bloco)
+            produtos_verificados = gravador.total_gravado
+            sucesso = produtos_verificados > 0
             
             Logger.log(f"Monitoramento concluído: {produtos_verificados}/{len(produtos)} produtos verificados", "INFO")
             return sucesso
             
         except Exception as e:
             Logger.log(f"Erro ao executar monitoramento: {e}", "ERROR")
-            return False
\ No newline at end of file
+            return False
+        
+        finally:
+            # Liberar as páginas memorizadas assim que a execução termina
+            CacheHTTP.obter_instancia().encerrar_execucao()
+            
+            if pipeline_proprio:
+                pipeline.encerrar()
+    
+    @staticmethod
+    def _verificar_produtos(produtos, scraper, gravador, verificacao_manual=False, concorrente=False,
+                            pipeline=None, max_workers=None, max_por_dominio=None):
+        """
+        Verifica os preços de um conjunto de produtos, acumulando-os no gravador.
+        
+        Args:
+            produtos (list): Produtos a verificar
+            scraper (PriceScraper): Scraper da execução
+            gravador (GravadorPrecos): Gravador em lote do monitoramento
+            verificacao_manual (bool): Se True, marca os produtos como verificados manualmente
+            concorrente (bool): Se True, verifica os produtos em paralelo
+            pipeline (PipelineProcessos, optional): Se informado, extrai os preços das páginas
+                estáticas nos processos do pipeline
+            max_workers (int, optional): Limite global de verificações simultâneas
+            max_por_dominio (int, optional): Limite de verificações simultâneas por domínio
+        """
+        pendentes = produtos
+        
+        if pipeline is not None:
+            # Os preços extraídos nos processos voltam para este único gravador
+            precos, pendentes = pipeline.extrair(produtos, scraper)
+            
+            for id_produto, valor in precos.items():
+                gravador.adicionar(id_produto, valor, verificacao_manual)
+        
+        if concorrente:
+            executor = ExecutorConcorrente(max_workers, max_por_dominio)
+            executor.executar(
+                pendentes,
+                lambda produto: ProdutoController._monitorar_produto(produto, scraper, verificacao_manual, gravador),
+                lambda produto: scraper.extrair_dominio(produto.url)
+            )
+        else:
+            # O intervalo entre requisições é controlado por domínio (ControladorDominios);
+            # intercalar os domínios evita esperas desnecessárias entre produtos
+            pendentes = ExecutorConcorrente.intercalar_por_dominio(
+                pendentes, lambda produto: scraper.extrair_dominio(produto.url)
+            )
+            for produto in pendentes:
+                ProdutoController._monitorar_produto(produto, scraper, verificacao_manual, gravador)
+    
+    @staticmethod
+    def _baixar_paginas_assincrono(produtos, scraper):
+        """
+        Baixa as páginas de uma janela de produtos extraídos via requests.
+        As respostas ficam memorizadas no cache HTTP da execução, de onde o
+        scraper as lê sem abrir novas conexões.
+        
+        Args:
+            produtos (list): Produtos da janela
+            scraper (PriceScraper): Scraper usado para identificar o domínio
+            
+        Returns:
+            list: URLs baixadas, a descartar da memória quando a janela terminar
+        """
+        # Domínios que exigem JavaScript vão direto ao Selenium
+        estrategias = EstrategiasDominio.obter_instancia()
+        urls = [
+            produto.url for produto in produtos
+            if estrategias.estrategia_atual(scraper.extrair_dominio(produto.url)) != EstrategiasDominio.SELENIUM
+        ]
+        
+        try:
+            FetcherAssincrono().baixar_paginas(urls)
+        except Exception as e:
+            # Sem a antecipação, o scraper baixa as páginas normalmente
+            Logger.log(f"Erro no download antecipado de {len(urls)} páginas: {e}", "WARNING")
+        
+        return urls
+    
+    @staticmethod
+    def _monitorar_produto(produto, scraper, verificacao_manual=False, gravador=None):
+        """
+        Verifica o preço de um único produto.
+        
+        Args:
+            produto (Produto): Produto a ser verificado
+            scraper (PriceScraper): Scraper usado para obter o seletor CSS
+            verificacao_manual (bool): Se True, marca o produto como verificado manualmente
+            gravador (GravadorPrecos, optional): Gravador em lote do monitoramento
+            
+        Returns:
+            bool: True se o preço foi coletado (a gravação fica a cargo do gravador), False caso contrário
+        """
+        # Buscar seletor CSS adequado para a URL (sem ele, usam-se os dados estruturados)
+        seletor_css = scraper.obter_seletor_para_url(produto.url)
+        
+        # Registrar preço
+        return produto.registrar_preco(seletor_css, verificacao_manual, gravador, scraper)
\ No newline at end of file
@@ -5,14 +5,28 @@
 Controlador para agendamento de monitoramento de preços.
 """
 
-from datetime import datetime
-import schedule
-import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+import os
+import socket
+import threading
+from models.frequencia_adaptativa import FrequenciaAdaptativa
 from models.produto import Produto
 from utils.logger import Logger
 from database.connector import DatabaseConnector
 
 class SchedulerController:
+    # Duração (segundos) da reserva de itens da fila por um trabalhador
+    DURACAO_RESERVA = 600
+    # Intervalo (segundos) entre renovações da reserva durante o processamento
+    INTERVALO_HEARTBEAT = 60
+    # Produtos reservados da fila em cada lote
+    TAMANHO_LOTE_FILA = 50
+    # Espera máxima (segundos) para tentar de novo um produto com intervalo próprio que falhou
+    INTERVALO_RETENTATIVA = 3600
+    # Ordem de atendimento: maior prioridade; dentro dela, primeiro os vencidos (o mais
+    # atrasado antes), depois os demais pela posição na fila (ver _selecionar_pendentes)
+    
     @staticmethod
     def configurar_agendamento(dias, horario):
         """
@@ -95,64 +109,32 @@ class SchedulerController:
             return None
     
     @staticmethod
-    def executar_agendador():
+    def executar_agendador(tamanho_lote=None):
         """
-        Inicia o loop de execução do agendador.
+        Inicia o agendador em primeiro plano até receber SIGTERM/SIGINT (Ctrl+C).
         
+        Args:
+            tamanho_lote (int, optional): Produtos reservados da fila por lote
+            
         Returns:
-            bool: True se o agendador foi iniciado com sucesso, False caso contrário
+            bool: True se o agendador foi encerrado normalmente, False em caso de erro
         """
         try:
-            # Obter configuração do agendamento
-            config = SchedulerController.obter_configuracao_agendamento()
-            
-            if not config:
-                Logger.log("Nenhuma configuração de agendamento encontrada", "WARNING")
-                return False
-            
-            if not config['ativo']:
-                Logger.log("Agendamento está desativado", "WARNING")
-                return False
-            
-            # Mapear dias da semana para funções do schedule
-            dias_semana = {
-                'segunda': schedule.every().monday,
-                'terca': schedule.every().tuesday,
-                'quarta': schedule.every().wednesday,
-                'quinta': schedule.every().thursday,
-                'sexta': schedule.every().friday,
-                'sabado': schedule.every().saturday,
-                'domingo': schedule.every().sunday
-            }
-            
-            # Configurar agendamento para cada dia selecionado
-            for dia in config['dias']:
-                if dia in dias_semana:
-                    dias_semana[dia].at(config['horario']).do(SchedulerController.processar_fila_agendamento)
-                    Logger.log(f"Agendamento configurado para {dia} às {config['horario']}", "INFO")
-            
-            Logger.log("Agendador iniciado", "INFO")
-            
-            # Loop principal do agendador
-            try:
-                while True:
-                    schedule.run_pending()
-                    time.sleep(60)  # Verifica a cada minuto
-            except KeyboardInterrupt:
-                Logger.log("Agendador encerrado pelo usuário", "INFO")
-                return True
-                
-            return True
+            from controllers.agendador_daemon import AgendadorDaemon
+            return AgendadorDaemon(tamanho_lote).executar()
             
         except Exception as e:
             Logger.log(f"Erro ao executar agendador: {e}", "ERROR")
             return False
     
     @staticmethod
-    def processar_fila_agendamento():
+    def processar_fila_agendamento(tamanho_lote=None):
         """
-        Processa a fila de agendamento.
+        Processa um lote da fila de agendamento.
         
+        Args:
+            tamanho_lote (int, optional): Produtos reservados no lote
+            
         Returns:
             bool: True se o processamento foi concluído com sucesso, False caso contrário
         """
@@ -160,36 +142,82 @@ class SchedulerController:
             Logger.log("Iniciando processamento da fila de agendamento", "INFO")
             
             # Atualizar registro de última execução
-            db = DatabaseConnector()
-            conexao, cursor = db.criar_conexao()
+            SchedulerController.registrar_execucao()
             
-            data_atual = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            cursor.execute("UPDATE agendamento SET ultima_execucao = ?", (data_atual,))
+            reservados, resultado = SchedulerController.processar_lote_fila(tamanho_lote)
             
-            conexao.commit()
-            conexao.close()
+            if reservados == 0:
+                Logger.log("Fila de agendamento vazia", "INFO")
+            elif resultado:
+                Logger.log("Processamento da fila de agendamento concluído com sucesso", "INFO")
+            else:
+                Logger.log("Processamento da fila concluído, mas com possíveis falhas", "WARNING")
             
-            # Obter produtos da fila
-            produtos_ids = SchedulerController.obter_proximos_produtos_fila(50)  # Processa 50 por vez
+            return resultado
             
+        except Exception as e:
+            Logger.log(f"Erro ao processar fila de agendamento: {e}", "ERROR")
+            return False
+    
+    @staticmethod
+    def processar_lote_fila(tamanho_lote=None, pendentes_desde=None, incluir_sem_intervalo=True, pipeline=None):
+        """
+        Reserva e verifica um lote de produtos da fila.
+        
+        Args:
+            tamanho_lote (int, optional): Produtos reservados no lote
+            pendentes_desde (str, optional): Início do ciclo ('%Y-%m-%d %H:%M:%S'); se
+                informado, só reserva produtos ainda não verificados nem tentados desde então
+            incluir_sem_intervalo (bool): Se False, só reserva produtos com intervalo próprio vencidos
+            pipeline (PipelineProcessos, optional): Pipeline reaproveitado entre os lotes
+            
+        Returns:
+            tuple: (reservados, sucesso) - número de produtos reservados (0 = nada
+                   pendente) e se o monitoramento do lote foi bem-sucedido
+        """
+        tamanho_lote = tamanho_lote or SchedulerController.TAMANHO_LOTE_FILA
+        
+        # Reservar produtos da fila; outros trabalhadores não recebem os mesmos itens
+        with SchedulerController.reserva_fila(tamanho_lote, pendentes_desde, incluir_sem_intervalo) as produtos_ids:
             if not produtos_ids:
-                Logger.log("Fila de agendamento vazia", "INFO")
-                return True
+                return 0, True
             
             Logger.log(f"Processando {len(produtos_ids)} produtos da fila", "INFO")
             
             from controllers.produto_controller import ProdutoController
-            resultado = ProdutoController.monitorar_todos_produtos(verificacao_manual=False, limite_produtos=len(produtos_ids))
+            resultado = ProdutoController.monitorar_todos_produtos(
+                verificacao_manual=False,
+                ids_produtos=produtos_ids,
+                concorrente=True,
+                assincrono=True,
+                processos=True,
+                pipeline=pipeline
+            )
+        
+        return len(produtos_ids), resultado
+    
+    @staticmethod
+    def registrar_execucao(data_hora=None):
+        """
+        Grava a data/hora da última execução do agendamento.
+        
+        Args:
+            data_hora (str, optional): Data/hora no formato '%Y-%m-%d %H:%M:%S' (padrão: agora)
             
-            if resultado:
-                Logger.log("Processamento da fila de agendamento concluído com sucesso", "INFO")
-            else:
-                Logger.log("Processamento da fila concluído, mas com possíveis falhas", "WARNING")
+        Returns:
+            bool: True se o registro foi gravado, False caso contrário
+        """
+        try:
+            db = DatabaseConnector()
             
-            return resultado
+            with db.transacao() as cursor:
+                cursor.execute("UPDATE agendamento SET ultima_execucao = ?",
+                               (data_hora or datetime.now().strftime('%Y-%m-%d %H:%M:%S'),))
+            
+            return True
             
         except Exception as e:
-            Logger.log(f"Erro ao processar fila de agendamento: {e}", "ERROR")
+            Logger.log(f"Erro ao registrar execução do agendamento: {e}", "ERROR")
             return False
     
     @staticmethod
@@ -207,61 +235,472 @@ class SchedulerController:
             db = DatabaseConnector()
             conexao, cursor = db.criar_conexao()
             
-            # Buscar os próximos produtos na fila
-            # Excluindo os que foram verificados manualmente hoje
-            data_hoje = datetime.now().strftime('%Y-%m-%d')
+            # Buscar os próximos produtos pendentes, na ordem de atendimento
+            produtos = SchedulerController._selecionar_pendentes(cursor, datetime.now(), limite)
+            
+            conexao.close()
+            
+            return produtos
+            
+        except Exception as e:
+            Logger.log(f"Erro ao obter produtos da fila: {e}", "ERROR")
+            return []
+    
+    @staticmethod
+    def _consulta_pendentes(agora, pendentes_desde=None, incluir_sem_intervalo=True):
+        """
+        Monta as consultas dos itens da fila prontos para verificação, uma por ramo.
+        
+        Produtos com intervalo próprio (fixo ou adaptativo) vencem em proxima_verificacao
+        (os ainda sem vencimento entram logo); os demais seguem os horários do agendamento
+        e não são verificados no mesmo dia de uma verificação manual. Cada ramo tem a
+        própria ordenação, coberta por um índice, para que o LIMIT pare cedo em vez de
+        ler e ordenar a fila inteira.
+        
+        Args:
+            agora (datetime): Referência de tempo
+            pendentes_desde (str, optional): Início do ciclo; produtos sem intervalo próprio
+                verificados ou tentados a partir dele são ignorados
+            incluir_sem_intervalo (bool): Se False, considera apenas os produtos com intervalo próprio
             
-            cursor.execute('''
-            SELECT id_produto 
+        Returns:
+            list: Tuplas (consulta SQL com colunas id_produto, prioridade, ramo, vencimento
+                  e posicao_fila, terminada em LIMIT ?; lista de parâmetros sem o limite)
+        """
+        agora_str = agora.strftime('%Y-%m-%d %H:%M:%S')
+        intervalo = FrequenciaAdaptativa.expressao_intervalo()
+        livre = "(reservado_por IS NULL OR reserva_expira_em < ?)"
+        
+        # Ramo 0: intervalo próprio vencido; ramo 1: intervalo próprio ainda sem vencimento
+        # (poucos itens, lidos pelo índice de proxima_verificacao e intervalo_verificacao; os
+        # "+" impedem o SQLite de preferir varrer a fila inteira na ordem de atendimento)
+        ramos = [
+            (f'''SELECT id_produto, prioridade, 0 AS ramo, proxima_verificacao AS vencimento, posicao_fila
             FROM fila_agendamento
-            WHERE (verificacao_manual = 0 OR substr(ultima_verificacao, 1, 10) != ?)
-            ORDER BY posicao_fila
-            LIMIT ?
-            ''', (data_hoje, limite))
+            WHERE proxima_verificacao <= ? AND {intervalo} IS NOT NULL AND {livre}
+            ORDER BY prioridade DESC, proxima_verificacao LIMIT ?''', [agora_str, agora_str]),
+            (f'''SELECT id_produto, prioridade, 1 AS ramo, NULL AS vencimento, posicao_fila
+            FROM fila_agendamento
+            WHERE proxima_verificacao IS NULL AND {intervalo} IS NOT NULL AND {livre}
+            ORDER BY +prioridade DESC, +posicao_fila LIMIT ?''', [agora_str])
+        ]
+        
+        # Ramo 1 também: produtos que seguem os horários do agendamento
+        if incluir_sem_intervalo:
+            filtro_padrao = "(verificacao_manual = 0 OR substr(ultima_verificacao, 1, 10) != ?)"
+            parametros = [agora_str, agora_str[:10]]
+            if pendentes_desde:
+                filtro_padrao += '''
+            AND (ultima_verificacao IS NULL OR ultima_verificacao < ?)
+            AND (ultima_tentativa IS NULL OR ultima_tentativa < ?)'''
+                parametros += [pendentes_desde, pendentes_desde]
+            
+            ramos.append((f'''SELECT id_produto, prioridade, 1 AS ramo, NULL AS vencimento, posicao_fila
+            FROM fila_agendamento
+            WHERE {intervalo} IS NULL AND {livre}
+            AND {filtro_padrao}
+            ORDER BY prioridade DESC, posicao_fila LIMIT ?''', parametros))
+        
+        return ramos
+    
+    @staticmethod
+    def _selecionar_pendentes(cursor, agora, limite, pendentes_desde=None, incluir_sem_intervalo=True):
+        """
+        Seleciona os próximos itens pendentes da fila, na ordem de atendimento.
+        
+        Cada ramo de _consulta_pendentes traz no máximo `limite` itens já na própria
+        ordem; os primeiros `limite` da junção são os primeiros da fila inteira.
+        
+        Args:
+            cursor: Cursor da conexão (ou transação) em uso
+            agora (datetime): Referência de tempo
+            limite (int): Número máximo de produtos a retornar
+            pendentes_desde (str, optional): Início do ciclo (ver _consulta_pendentes)
+            incluir_sem_intervalo (bool): Se False, considera apenas os produtos com intervalo próprio
             
-            produtos = [row['id_produto'] for row in cursor.fetchall()]
+        Returns:
+            list: IDs dos produtos na ordem de atendimento
+        """
+        candidatos = []
+        for consulta, parametros in SchedulerController._consulta_pendentes(agora, pendentes_desde, incluir_sem_intervalo):
+            cursor.execute(consulta, parametros + [limite])
+            candidatos.extend(cursor.fetchall())
+        
+        # Maior prioridade; vencidos (ramo 0) pelo atraso; demais pela posição na fila
+        candidatos.sort(key=lambda row: (-row['prioridade'], row['ramo'], row['vencimento'] or '', row['posicao_fila']))
+        return [row['id_produto'] for row in candidatos[:limite]]
+    
+    @staticmethod
+    def proxima_verificacao_intervalos():
+        """
+        Obtém o vencimento mais próximo entre os produtos com intervalo próprio.
+        
+        Returns:
+            datetime: Data/hora do próximo vencimento (no passado se já há itens vencidos)
+                      ou None se nenhum produto tem intervalo próprio
+        """
+        try:
+            db = DatabaseConnector()
+            conexao, cursor = db.criar_conexao()
             
+            intervalo = FrequenciaAdaptativa.expressao_intervalo()
+            livre = "(reservado_por IS NULL OR reserva_expira_em < :agora)"
+            
+            cursor.execute(f'''
+            SELECT EXISTS (
+                       SELECT 1 FROM fila_agendamento
+                       WHERE proxima_verificacao IS NULL AND {intervalo} IS NOT NULL AND {livre}
+                   ) AS sem_vencimento,
+                   (SELECT MIN(proxima_verificacao) FROM fila_agendamento
+                    WHERE proxima_verificacao IS NOT NULL AND {intervalo} IS NOT NULL AND {livre}) AS proxima
+            ''', {'agora': datetime.now().strftime('%Y-%m-%d %H:%M:%S')})
+            
+            resultado = cursor.fetchone()
             conexao.close()
             
+            if resultado['sem_vencimento']:
+                return datetime.now()
+            if not resultado['proxima']:
+                return None
+            return datetime.strptime(resultado['proxima'], '%Y-%m-%d %H:%M:%S')
+            
+        except Exception as e:
+            Logger.log(f"Erro ao obter próximo vencimento da fila: {e}", "ERROR")
+            return None
+    
+    @staticmethod
+    def produtos_por_cliente(id_cliente):
+        """
+        Lista os IDs dos produtos de um cliente.
+        
+        Args:
+            id_cliente (int): ID do cliente
+            
+        Returns:
+            list: IDs dos produtos
+        """
+        try:
+            db = DatabaseConnector()
+            conexao, cursor = db.criar_conexao()
+            
+            cursor.execute("SELECT id FROM produtos WHERE id_cliente = ?", (id_cliente,))
+            produtos = [row['id'] for row in cursor.fetchall()]
+            
+            conexao.close()
             return produtos
             
         except Exception as e:
-            Logger.log(f"Erro ao obter produtos da fila: {e}", "ERROR")
+            Logger.log(f"Erro ao listar produtos do cliente {id_cliente}: {e}", "ERROR")
             return []
     
     @staticmethod
-    def reorganizar_fila():
+    def produtos_por_dominio(dominio):
         """
-        Reorganiza a fila de agendamento para garantir posições sequenciais.
+        Lista os IDs dos produtos cujas URLs pertencem a um domínio.
         
+        Args:
+            dominio (str): Domínio (ex.: 'www.loja.com.br')
+            
         Returns:
-            bool: True se a reorganização foi concluída com sucesso, False caso contrário
+            list: IDs dos produtos
         """
         try:
+            from scraper.price_scraper import PriceScraper
+            
             db = DatabaseConnector()
             conexao, cursor = db.criar_conexao()
             
-            # Obter todos os produtos da fila ordenados pela posição atual
-            cursor.execute('''
-            SELECT id, id_produto, posicao_fila
-            FROM fila_agendamento
-            ORDER BY posicao_fila
-            ''')
+            cursor.execute("SELECT id, url FROM produtos WHERE url LIKE ?", (f"%{dominio}%",))
+            produtos = [row['id'] for row in cursor.fetchall()
+                        if PriceScraper.extrair_dominio(row['url']) == dominio]
             
-            produtos_fila = cursor.fetchall()
+            conexao.close()
+            return produtos
             
-            # Reorganizar as posições
-            for i, produto in enumerate(produtos_fila, 1):
+        except Exception as e:
+            Logger.log(f"Erro ao listar produtos do domínio {dominio}: {e}", "ERROR")
+            return []
+    
+    @staticmethod
+    def definir_intervalo_verificacao(ids_produtos, intervalo):
+        """
+        Define o intervalo de verificação próprio de um conjunto de produtos.
+        
+        O próximo vencimento é recalculado a partir da última verificação
+        (produtos nunca verificados ficam vencidos imediatamente).
+        
+        Args:
+            ids_produtos (list): IDs dos produtos
+            intervalo (int): Intervalo em segundos; None volta aos horários do agendamento
+                (ou ao intervalo adaptativo, se a frequência adaptativa estiver ligada)
+            
+        Returns:
+            int: Número de produtos atualizados
+        """
+        try:
+            if intervalo is not None and int(intervalo) <= 0:
+                Logger.log(f"Intervalo de verificação inválido: {intervalo}", "ERROR")
+                return 0
+            
+            intervalo = int(intervalo) if intervalo is not None else None
+            db = DatabaseConnector()
+            
+            with db.transacao() as cursor:
+                cursor.executemany(f'''
+                UPDATE fila_agendamento
+                SET intervalo_verificacao = ?,
+                    proxima_verificacao = datetime(ultima_verificacao, '+' ||
+                                                   {FrequenciaAdaptativa.expressao_intervalo('?')} || ' seconds')
+                WHERE id_produto = ?
+                ''', [(intervalo, intervalo, id_produto) for id_produto in ids_produtos])
+                
+                atualizados = cursor.rowcount
+            
+            Logger.log(f"Intervalo de verificação de {atualizados} produtos definido para "
+                       f"{intervalo if intervalo is not None else 'automático'}", "INFO")
+            return atualizados
+            
+        except Exception as e:
+            Logger.log(f"Erro ao definir intervalo de verificação: {e}", "ERROR")
+            return 0
+    
+    @staticmethod
+    def definir_prioridade(ids_produtos, prioridade):
+        """
+        Define a prioridade de um conjunto de produtos na fila (maior = atendido antes).
+        
+        Args:
+            ids_produtos (list): IDs dos produtos
+            prioridade (int): Prioridade (padrão dos produtos: 0)
+            
+        Returns:
+            int: Número de produtos atualizados
+        """
+        try:
+            db = DatabaseConnector()
+            
+            with db.transacao() as cursor:
+                cursor.executemany('''
+                UPDATE fila_agendamento
+                SET prioridade = ?
+                WHERE id_produto = ?
+                ''', [(int(prioridade), id_produto) for id_produto in ids_produtos])
+                
+                atualizados = cursor.rowcount
+            
+            Logger.log(f"Prioridade de {atualizados} produtos definida para {prioridade}", "INFO")
+            return atualizados
+            
+        except Exception as e:
+            Logger.log(f"Erro ao definir prioridade: {e}", "ERROR")
+            return 0
+    
+    @staticmethod
+    def identificador_trabalhador():
+        """
+        Identifica este processo como trabalhador da fila.
+        
+        Returns:
+            str: Valor de MONITOR_PRECOS_TRABALHADOR ou 'host:pid'
+        """
+        return os.environ.get('MONITOR_PRECOS_TRABALHADOR') or f"{socket.gethostname()}:{os.getpid()}"
+    
+    @staticmethod
+    def reservar_proximos_produtos_fila(limite=50, trabalhador=None, duracao=None, pendentes_desde=None,
+                                        incluir_sem_intervalo=True):
+        """
+        Reserva atomicamente os próximos produtos livres da fila.
+        
+        Itens com reserva expirada (trabalhador que caiu) voltam a ficar livres.
+        
+        Args:
+            limite (int): Número máximo de produtos a reservar
+            trabalhador (str, optional): Identificador do trabalhador
+            duracao (int, optional): Validade da reserva em segundos
+            pendentes_desde (str, optional): Se informado, ignora produtos sem intervalo próprio
+                verificados ou tentados a partir desta data/hora (já tratados no ciclo atual)
+            incluir_sem_intervalo (bool): Se False, reserva apenas produtos com intervalo próprio vencidos
+            
+        Returns:
+            list: IDs dos produtos reservados, na ordem de atendimento
+        """
+        trabalhador = trabalhador or SchedulerController.identificador_trabalhador()
+        duracao = duracao or SchedulerController.DURACAO_RESERVA
+        
+        try:
+            db = DatabaseConnector()
+            agora = datetime.now()
+            agora_str = agora.strftime('%Y-%m-%d %H:%M:%S')
+            expira_str = (agora + timedelta(seconds=duracao)).strftime('%Y-%m-%d %H:%M:%S')
+            
+            # BEGIN IMMEDIATE: nenhum outro trabalhador lê a fila entre a seleção e a marcação
+            with db.transacao(imediata=True) as cursor:
+                produtos = SchedulerController._selecionar_pendentes(
+                    cursor, agora, limite, pendentes_desde, incluir_sem_intervalo
+                )
+                
+                cursor.executemany('''
+                UPDATE fila_agendamento
+                SET reservado_por = ?, reserva_expira_em = ?, reserva_heartbeat = ?
+                WHERE id_produto = ?
+                ''', [(trabalhador, expira_str, agora_str, id_produto) for id_produto in produtos])
+            
+            if produtos:
+                Logger.log(f"{len(produtos)} produtos da fila reservados por {trabalhador}", "INFO")
+            
+            return produtos
+            
+        except Exception as e:
+            Logger.log(f"Erro ao reservar produtos da fila: {e}", "ERROR")
+            return []
+    
+    @staticmethod
+    def renovar_reservas(trabalhador=None, duracao=None):
+        """
+        Prolonga as reservas ativas do trabalhador (heartbeat).
+        
+        Args:
+            trabalhador (str, optional): Identificador do trabalhador
+            duracao (int, optional): Nova validade da reserva em segundos
+            
+        Returns:
+            int: Número de reservas renovadas
+        """
+        trabalhador = trabalhador or SchedulerController.identificador_trabalhador()
+        duracao = duracao or SchedulerController.DURACAO_RESERVA
+        
+        try:
+            db = DatabaseConnector()
+            agora = datetime.now()
+            
+            with db.transacao() as cursor:
                 cursor.execute('''
                 UPDATE fila_agendamento
+                SET reserva_expira_em = ?, reserva_heartbeat = ?
+                WHERE reservado_por = ?
+                ''', ((agora + timedelta(seconds=duracao)).strftime('%Y-%m-%d %H:%M:%S'),
+                      agora.strftime('%Y-%m-%d %H:%M:%S'), trabalhador))
+                
+                return cursor.rowcount
+            
+        except Exception as e:
+            Logger.log(f"Erro ao renovar reservas da fila: {e}", "ERROR")
+            return 0
+    
+    @staticmethod
+    def liberar_reservas(trabalhador=None):
+        """
+        Libera as reservas restantes do trabalhador (produtos não concluídos),
+        registrando a tentativa para que não sejam repetidos no mesmo ciclo.
+        Produtos com intervalo (fixo ou adaptativo) voltam a vencer após o
+        intervalo, limitado a INTERVALO_RETENTATIVA.
+        
+        Args:
+            trabalhador (str, optional): Identificador do trabalhador
+            
+        Returns:
+            int: Número de reservas liberadas
+        """
+        trabalhador = trabalhador or SchedulerController.identificador_trabalhador()
+        
+        try:
+            db = DatabaseConnector()
+            
+            intervalo = FrequenciaAdaptativa.expressao_intervalo()
+            
+            with db.transacao() as cursor:
+                cursor.execute(f'''
+                UPDATE fila_agendamento
+                SET reservado_por = NULL, reserva_expira_em = NULL, reserva_heartbeat = NULL,
+                    ultima_tentativa = :agora,
+                    proxima_verificacao = CASE
+                        WHEN {intervalo} IS NULL THEN proxima_verificacao
+                        ELSE datetime(:agora, '+' || MIN({intervalo}, :retentativa) || ' seconds')
+                    END
+                WHERE reservado_por = :trabalhador
+                ''', {
+                    'agora': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                    'retentativa': SchedulerController.INTERVALO_RETENTATIVA,
+                    'trabalhador': trabalhador
+                })
+                
+                return cursor.rowcount
+            
+        except Exception as e:
+            Logger.log(f"Erro ao liberar reservas da fila: {e}", "ERROR")
+            return 0
+    
+    @staticmethod
+    @contextmanager
+    def reserva_fila(limite=50, pendentes_desde=None, incluir_sem_intervalo=True):
+        """
+        Context manager que reserva produtos da fila e mantém a reserva viva
+        (heartbeat em segundo plano) até o fim do bloco, liberando ao final
+        os itens que não foram concluídos.
+        
+        Args:
+            limite (int): Número máximo de produtos a reservar
+            pendentes_desde (str, optional): Ver reservar_proximos_produtos_fila
+            incluir_sem_intervalo (bool): Ver reservar_proximos_produtos_fila
+            
+        Yields:
+            list: IDs dos produtos reservados
+        """
+        trabalhador = SchedulerController.identificador_trabalhador()
+        produtos = SchedulerController.reservar_proximos_produtos_fila(
+            limite, trabalhador, pendentes_desde=pendentes_desde, incluir_sem_intervalo=incluir_sem_intervalo
+        )
+        parar = threading.Event()
+        
+        def heartbeat():
+            while not parar.wait(SchedulerController.INTERVALO_HEARTBEAT):
+                SchedulerController.renovar_reservas(trabalhador)
+        
+        thread_heartbeat = threading.Thread(target=heartbeat, name="heartbeat-fila", daemon=True)
+        if produtos:
+            thread_heartbeat.start()
+        
+        try:
+            yield produtos
+        finally:
+            parar.set()
+            if produtos:
+                thread_heartbeat.join()
+                SchedulerController.liberar_reservas(trabalhador)
+    
+    @staticmethod
+    def reorganizar_fila():
+        """
+        Compacta as posições da fila de agendamento em uma sequência 1..N.
+        
+        As posições só precisam ser crescentes, não contíguas; esta operação
+        é apenas uma manutenção opcional e não é necessária após cada
+        verificação. A ordem relativa dos produtos é preservada.
+        
+        Returns:
+            bool: True se a reorganização foi concluída com sucesso, False caso contrário
+        """
+        try:
+            db = DatabaseConnector()
+            
+            with db.transacao() as cursor:
+                # Obter a ordem atual da fila
+                cursor.execute('''
+                SELECT id
+                FROM fila_agendamento
+                ORDER BY posicao_fila, id
+                ''')
+                
+                ids_fila = [row['id'] for row in cursor.fetchall()]
+                
+                # Renumerar em um único lote
+                cursor.executemany('''
+                UPDATE fila_agendamento
                 SET posicao_fila = ?
                 WHERE id = ?
-                ''', (i, produto['id']))
-            
-            conexao.commit()
-            conexao.close()
+                ''', [(i, id_fila) for i, id_fila in enumerate(ids_fila, 1)])
             
-            Logger.log(f"Fila reorganizada: {len(produtos_fila)} produtos", "INFO")
+            Logger.log(f"Fila reorganizada: {len(ids_fila)} produtos", "INFO")
             return True
             
         except Exception as e:
@@ -7,25 +7,348 @@ Módulo de conexão com o banco de dados para o Sistema de Monitoramento de Pre
 
 import os
 import sqlite3
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 from utils.logger import Logger
 
+# Conexões reutilizadas por thread, indexadas pelo caminho do banco
+_conexoes_thread = threading.local()
+
+class _ConexaoReutilizavel:
+    """
+    Envoltório de uma conexão SQLite de longa duração.
+    
+    O código legado chama close() ao terminar cada operação; aqui isso apenas
+    descarta alterações não confirmadas, mantendo a conexão aberta. Dentro de
+    DatabaseConnector.transacao(), commit() e close() são adiados para o final
+    do bloco, de modo que operações aninhadas participem da mesma transação.
+    """
+    
+    def __init__(self, conexao):
+        self._conexao = conexao
+        self.profundidade = 0
+        # Marcada quando um bloco aninhado falha: a transação externa não pode ser confirmada
+        self.abortada = False
+    
+    def commit(self):
+        if self.profundidade == 0:
+            self._conexao.commit()
+    
+    def close(self):
+        if self.profundidade == 0 and self._conexao.in_transaction:
+            self._conexao.rollback()
+    
+    def encerrar(self):
+        """Fecha de fato a conexão subjacente."""
+        self._conexao.close()
+    
+    def __getattr__(self, nome):
+        return getattr(self._conexao, nome)
+
+class TransacaoAbortada(Exception):
+    """
+    Um bloco transacao() aninhado falhou (mesmo que o chamador tenha capturado
+    a exceção); a transação externa é desfeita em vez de confirmada.
+    """
+
 class DatabaseConnector:
     # Caminho do banco de dados
     DB_FILE = 'monitor_precos.db'
     
+    # Se True, cada thread reutiliza uma única conexão em vez de abrir uma por operação
+    CONEXAO_PERSISTENTE = True
+    
+    # Perfis de PRAGMAs aplicados às conexões
+    PERFIS_PRAGMAS = {
+        # Padrões do SQLite: journal de rollback e sincronização completa
+        'padrao': {
+            'journal_mode': 'DELETE',
+            'synchronous': 'FULL',
+            'cache_size': -2000,
+            'mmap_size': 0,
+            'temp_store': 'DEFAULT',
+            'busy_timeout': 5000
+        },
+        # WAL com sincronização completa: leitores não bloqueiam o agendador
+        'seguro': {
+            'journal_mode': 'WAL',
+            'synchronous': 'FULL',
+            'cache_size': -16000,
+            'mmap_size': 0,
+            'temp_store': 'DEFAULT',
+            'busy_timeout': 30000
+        },
+        # WAL com synchronous=NORMAL: um fsync por checkpoint em vez de por commit
+        'desempenho': {
+            'journal_mode': 'WAL',
+            'synchronous': 'NORMAL',
+            'cache_size': -64000,
+            'mmap_size': 268435456,
+            'temp_store': 'MEMORY',
+            'busy_timeout': 30000
+        }
+    }
+    
+    # Perfil ativo (pode ser sobrescrito pela variável de ambiente MONITOR_PRECOS_PERFIL_DB)
+    PERFIL_PRAGMAS = os.environ.get('MONITOR_PRECOS_PERFIL_DB', 'desempenho')
+    
+    # Colunas acrescentadas a tabelas existentes: tabela -> [(coluna, definição)]
+    COLUNAS_ADICIONAIS = {
+        'fila_agendamento': [
+            # Reserva (lease) do item por um trabalhador do agendador
+            ('reservado_por', 'TEXT'),
+            ('reserva_expira_em', 'TEXT'),
+            ('reserva_heartbeat', 'TEXT'),
+            # Última tentativa sem sucesso, para o agendador não repetir o item no mesmo ciclo
+            ('ultima_tentativa', 'TEXT'),
+            # Frequência própria (segundos; NULL = horários do agendamento) e prioridade do produto
+            ('intervalo_verificacao', 'INTEGER'),
+            ('proxima_verificacao', 'TEXT'),
+            ('prioridade', 'INTEGER NOT NULL DEFAULT 0'),
+            # Estatísticas incrementais de volatilidade e intervalo adaptativo (segundos)
+            ('ultimo_preco', 'REAL'),
+            ('verificacoes_estaveis', 'INTEGER NOT NULL DEFAULT 0'),
+            ('intervalo_adaptativo', 'INTEGER')
+        ]
+    }
+    
+    # Índices mantidos pela migração de esquema: nome -> (tabela, colunas)
+    INDICES = {
+        # Fila de agendamento ordenada pela posição
+        'idx_fila_posicao': ('fila_agendamento', ('posicao_fila',)),
+        # Próximo vencimento dos produtos com frequência própria (e os ainda sem vencimento)
+        'idx_fila_proxima_verificacao': ('fila_agendamento', ('proxima_verificacao', 'intervalo_verificacao')),
+        # Vencidos na ordem de atendimento (maior prioridade, depois o mais atrasado)
+        'idx_fila_prioridade_vencimento': ('fila_agendamento', ('prioridade DESC', 'proxima_verificacao')),
+        # Demais pendentes na ordem de atendimento (maior prioridade, depois a posição na fila)
+        'idx_fila_prioridade_posicao': ('fila_agendamento', ('prioridade DESC', 'posicao_fila')),
+        # Histórico por produto em ordem de data (cobre id, preco e data)
+        'idx_historico_produto_data': ('historico_precos', ('id_produto', 'data', 'preco')),
+        # Produtos por cliente em ordem de nome e busca de duplicatas em Produto.salvar
+        'idx_produtos_cliente_nome_url_grupo': ('produtos', ('id_cliente', 'nome', 'url', 'id_grupo')),
+        # Produtos por grupo
+        'idx_produtos_grupo': ('produtos', ('id_grupo',)),
+        # Associações consultadas a partir do grupo
+        'idx_clientes_grupos_grupo': ('clientes_grupos', ('id_grupo', 'id_cliente')),
+        'idx_usuarios_grupos_grupo': ('usuarios_grupos', ('id_grupo', 'id_usuario'))
+    }
+    
+    def obter_perfil(self):
+        """
+        Retorna o nome e os PRAGMAs do perfil ativo.
+        
+        Returns:
+            tuple: (nome_perfil, dicionario_pragmas)
+        """
+        nome = self.PERFIL_PRAGMAS if self.PERFIL_PRAGMAS in self.PERFIS_PRAGMAS else 'padrao'
+        return nome, self.PERFIS_PRAGMAS[nome]
+    
+    def _abrir_conexao(self):
+        """
+        Abre uma nova conexão física com o banco de dados.
+        
+        Returns:
+            sqlite3.Connection: Conexão configurada
+        """
+        _, pragmas = self.obter_perfil()
+        
+        conexao = sqlite3.connect(self.DB_FILE, timeout=pragmas['busy_timeout'] / 1000)
+        conexao.row_factory = sqlite3.Row  # Permite acessar colunas pelo nome
+        
+        # PRAGMAs por conexão (journal_mode é persistente e aplicado na inicialização)
+        conexao.execute(f"PRAGMA busy_timeout = {int(pragmas['busy_timeout'])}")
+        conexao.execute(f"PRAGMA synchronous = {pragmas['synchronous']}")
+        conexao.execute(f"PRAGMA cache_size = {int(pragmas['cache_size'])}")
+        conexao.execute(f"PRAGMA mmap_size = {int(pragmas['mmap_size'])}")
+        conexao.execute(f"PRAGMA temp_store = {pragmas['temp_store']}")
+        
+        return conexao
+    
+    def aplicar_modo_journal(self):
+        """
+        Aplica o journal_mode do perfil ativo ao arquivo do banco.
+        
+        Returns:
+            str: Modo de journal efetivamente em uso
+        """
+        _, pragmas = self.obter_perfil()
+        
+        conexao, cursor = self.criar_conexao()
+        cursor.execute(f"PRAGMA journal_mode = {pragmas['journal_mode']}")
+        modo = cursor.fetchone()[0]
+        conexao.close()
+        
+        return modo
+    
+    def verificar_perfil(self):
+        """
+        Lê os PRAGMAs efetivos da conexão e compara com o perfil ativo.
+        
+        Returns:
+            dict: Nome do perfil, valores configurados, valores efetivos e divergências
+        """
+        nome, pragmas = self.obter_perfil()
+        
+        # Valores numéricos retornados pelo SQLite para os PRAGMAs textuais
+        synchronous = {0: 'OFF', 1: 'NORMAL', 2: 'FULL', 3: 'EXTRA'}
+        temp_store = {0: 'DEFAULT', 1: 'FILE', 2: 'MEMORY'}
+        
+        conexao, cursor = self.criar_conexao()
+        efetivo = {}
+        
+        for pragma in pragmas:
+            cursor.execute(f"PRAGMA {pragma}")
+            valor = cursor.fetchone()[0]
+            
+            if pragma == 'synchronous':
+                valor = synchronous.get(valor, valor)
+            elif pragma == 'temp_store':
+                valor = temp_store.get(valor, valor)
+            elif pragma == 'journal_mode':
+                valor = str(valor).upper()
+            
+            efetivo[pragma] = valor
+        
+        conexao.close()
+        
+        divergencias = [p for p in pragmas if str(efetivo[p]).upper() != str(pragmas[p]).upper()]
+        
+        return {
+            'perfil': nome,
+            'configurado': dict(pragmas),
+            'efetivo': efetivo,
+            'divergencias': divergencias
+        }
+    
+    def copiar_banco(self, destino):
+        """
+        Copia o banco de dados de forma consistente (inclui o conteúdo do WAL).
+        
+        Args:
+            destino (str): Caminho do arquivo de destino
+            
+        Returns:
+            bool: True se a cópia foi bem-sucedida, False caso contrário
+        """
+        try:
+            conexao, _ = self.criar_conexao()
+            copia = sqlite3.connect(destino)
+            conexao.backup(copia)
+            copia.close()
+            conexao.close()
+            return True
+            
+        except Exception as e:
+            Logger.log(f"Erro ao copiar banco de dados: {e}", "ERROR")
+            return False
+    
+    def _conexoes(self):
+        """
+        Retorna o dicionário de conexões reutilizáveis da thread atual.
+        
+        Returns:
+            dict: Mapeamento caminho do banco -> _ConexaoReutilizavel
+        """
+        if not hasattr(_conexoes_thread, 'conexoes'):
+            _conexoes_thread.conexoes = {}
+        return _conexoes_thread.conexoes
+    
+    def _obter_conexao_thread(self):
+        """
+        Obtém (ou cria) a conexão reutilizável da thread atual.
+        
+        Returns:
+            _ConexaoReutilizavel: Conexão da thread
+        """
+        conexoes = self._conexoes()
+        conexao = conexoes.get(self.DB_FILE)
+        
+        if conexao is None:
+            conexao = _ConexaoReutilizavel(self._abrir_conexao())
+            conexoes[self.DB_FILE] = conexao
+        
+        return conexao
+    
     def criar_conexao(self):
         """
         Cria uma conexão com o banco de dados SQLite.
         
+        Com CONEXAO_PERSISTENTE ativo (ou dentro de transacao()), retorna a
+        conexão reutilizável da thread atual.
+        
         Returns:
             tuple: (conexao, cursor) para interagir com o banco de dados
         """
-        conexao = sqlite3.connect(self.DB_FILE)
-        conexao.row_factory = sqlite3.Row  # Permite acessar colunas pelo nome
+        conexao = self._conexoes().get(self.DB_FILE)
+        
+        if conexao is None or conexao.profundidade == 0:
+            if self.CONEXAO_PERSISTENTE:
+                conexao = self._obter_conexao_thread()
+            else:
+                conexao = self._abrir_conexao()
+        
         cursor = conexao.cursor()
         return conexao, cursor
     
+    @contextmanager
+    def transacao(self, imediata=False):
+        """
+        Context manager que executa um bloco em uma única transação.
+        
+        Confirma as alterações ao final do bloco ou as desfaz em caso de
+        exceção. Blocos aninhados (e chamadas a criar_conexao() feitas dentro
+        do bloco) compartilham a mesma transação. Se um bloco aninhado falhar,
+        a transação inteira é desfeita ao final do bloco externo (com
+        TransacaoAbortada), mesmo que o método aninhado tenha capturado a
+        exceção e retornado False.
+        
+        Args:
+            imediata (bool): Se True, inicia com BEGIN IMMEDIATE, obtendo o bloqueio
+                             de escrita antes das leituras (ler-e-marcar atômico
+                             entre processos)
+        
+        Yields:
+            sqlite3.Cursor: Cursor da conexão em uso
+        """
+        conexao = self._obter_conexao_thread()
+        conexao.profundidade += 1
+        
+        if conexao.profundidade == 1:
+            conexao.abortada = False
+        
+        try:
+            if imediata and conexao.profundidade == 1 and not conexao._conexao.in_transaction:
+                conexao._conexao.execute("BEGIN IMMEDIATE")
+            
+            yield conexao.cursor()
+            
+            if conexao.profundidade == 1:
+                if conexao.abortada:
+                    raise TransacaoAbortada("Um bloco aninhado falhou; a transação foi desfeita")
+                conexao._conexao.commit()
+        except Exception:
+            if conexao.profundidade == 1:
+                conexao._conexao.rollback()
+            else:
+                # Propaga a falha até o bloco externo, ainda que o chamador capture a exceção
+                conexao.abortada = True
+            raise
+        finally:
+            conexao.profundidade -= 1
+            
+            if conexao.profundidade == 0 and not self.CONEXAO_PERSISTENTE:
+                self.fechar_conexoes()
+    
+    def fechar_conexoes(self):
+        """
+        Fecha a conexão reutilizável da thread atual, se existir.
+        """
+        conexao = self._conexoes().pop(self.DB_FILE, None)
+        
+        if conexao is not None:
+            conexao.encerrar()
+    
     def inicializar_banco_dados(self):
         """
         Cria as tabelas do banco de dados se não existirem.
@@ -34,6 +357,9 @@ class DatabaseConnector:
             bool: True se a inicialização foi bem-sucedida, False caso contrário
         """
         try:
+            # Aplicar o modo de journal do perfil antes de criar as tabelas
+            modo_journal = self.aplicar_modo_journal()
+            
             conexao, cursor = self.criar_conexao()
             
             # Tabela de plataformas
@@ -145,6 +471,23 @@ class DatabaseConnector:
             )
             ''')
             
+            # Resumo dos preços de cada produto, mantido a cada preço gravado
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'resumo_precos'")
+            resumo_novo = cursor.fetchone() is None
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS resumo_precos (
+                id_produto INTEGER PRIMARY KEY,
+                preco_atual REAL NOT NULL,
+                ultima_data TEXT NOT NULL,
+                ultima_alteracao TEXT NOT NULL,
+                preco_minimo REAL NOT NULL,
+                preco_maximo REAL NOT NULL,
+                preco_medio REAL NOT NULL,
+                total_registros INTEGER NOT NULL,
+                FOREIGN KEY (id_produto) REFERENCES produtos (id)
+            )
+            ''')
+            
             # Tabela de configurações de agendamento
             cursor.execute('''
             CREATE TABLE IF NOT EXISTS agendamento (
@@ -172,17 +515,47 @@ class DatabaseConnector:
             )
             ''')
             
-            # Criar índice para otimizar consultas
+            # Tabela com o método de extração preferido por domínio
             cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_fila_posicao ON fila_agendamento (posicao_fila)
+            CREATE TABLE IF NOT EXISTS estrategias_dominio (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                dominio TEXT UNIQUE NOT NULL,
+                estrategia TEXT NOT NULL DEFAULT 'requests',
+                sucessos_requests INTEGER NOT NULL DEFAULT 0,
+                falhas_requests INTEGER NOT NULL DEFAULT 0,
+                sucessos_selenium INTEGER NOT NULL DEFAULT 0,
+                falhas_selenium INTEGER NOT NULL DEFAULT 0,
+                extracoes_desde_sondagem INTEGER NOT NULL DEFAULT 0,
+                data_atualizacao TEXT
+            )
             ''')
             
             conexao.commit()
             conexao.close()
             
+            # Acrescentar colunas novas às tabelas existentes
+            self.migrar_colunas()
+            
+            # Criar/atualizar os índices das consultas frequentes
+            self.migrar_indices()
+            
+            # Bancos criados antes do resumo: calculá-lo uma vez a partir do histórico
+            if resumo_novo:
+                from models.resumo_precos import ResumoPrecos
+                ResumoPrecos.reconstruir()
+            
             # Criar grupos padrão e usuário admin
             self._criar_dados_padrao()
             
+            # Verificar o perfil de desempenho efetivamente ativo
+            perfil = self.verificar_perfil()
+            Logger.log(f"Perfil do banco de dados: '{perfil['perfil']}' (journal_mode={modo_journal}, "
+                       f"synchronous={perfil['efetivo']['synchronous']})", "INFO")
+            
+            if perfil['divergencias']:
+                Logger.log(f"PRAGMAs divergentes do perfil '{perfil['perfil']}': "
+                           f"{', '.join(perfil['divergencias'])}", "WARNING")
+            
             Logger.log("Banco de dados inicializado com sucesso", "INFO")
             return True
             
@@ -190,6 +563,102 @@ class DatabaseConnector:
             Logger.log(f"Erro ao inicializar banco de dados: {e}", "ERROR")
             return False
     
+    def _colunas_indice(self, cursor, nome_indice):
+        """
+        Obtém as colunas de um índice existente.
+        
+        Args:
+            cursor (sqlite3.Cursor): Cursor do banco
+            nome_indice (str): Nome do índice
+            
+        Returns:
+            tuple: Colunas do índice (com ' DESC' nas decrescentes), ou None se o índice não existir
+        """
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND name = ?", (nome_indice,))
+        if not cursor.fetchone():
+            return None
+        
+        # index_xinfo inclui a direção de cada coluna; key = 0 marca o rowid implícito
+        cursor.execute(f"PRAGMA index_xinfo({nome_indice})")
+        return tuple(
+            coluna['name'] + (' DESC' if coluna['desc'] else '')
+            for coluna in sorted(cursor.fetchall(), key=lambda c: c['seqno']) if coluna['key']
+        )
+    
+    def indices_ausentes(self):
+        """
+        Lista os índices esperados que não existem ou estão desatualizados.
+        
+        Returns:
+            list: Nomes dos índices ausentes ou com colunas diferentes do esperado
+        """
+        conexao, cursor = self.criar_conexao()
+        
+        ausentes = []
+        for nome, (_, colunas) in self.INDICES.items():
+            if self._colunas_indice(cursor, nome) != colunas:
+                ausentes.append(nome)
+        
+        conexao.close()
+        return ausentes
+    
+    def migrar_colunas(self):
+        """
+        Acrescenta às tabelas as colunas de COLUNAS_ADICIONAIS que ainda não existem.
+        
+        Returns:
+            list: Colunas criadas, no formato 'tabela.coluna'
+        """
+        criadas = []
+        
+        with self.transacao() as cursor:
+            for tabela, colunas in self.COLUNAS_ADICIONAIS.items():
+                cursor.execute(f"PRAGMA table_info({tabela})")
+                existentes = {coluna['name'] for coluna in cursor.fetchall()}
+                
+                for nome, definicao in colunas:
+                    if nome not in existentes:
+                        cursor.execute(f"ALTER TABLE {tabela} ADD COLUMN {nome} {definicao}")
+                        criadas.append(f"{tabela}.{nome}")
+        
+        if criadas:
+            Logger.log(f"Colunas acrescentadas: {', '.join(criadas)}", "INFO")
+        
+        return criadas
+    
+    def migrar_indices(self):
+        """
+        Cria os índices ausentes e recria os que estão com colunas diferentes.
+        
+        Returns:
+            list: Nomes dos índices criados ou recriados
+        """
+        alterados = []
+        
+        with self.transacao() as cursor:
+            for nome, (tabela, colunas) in self.INDICES.items():
+                existentes = self._colunas_indice(cursor, nome)
+                
+                if existentes == colunas:
+                    continue
+                
+                if existentes is not None:
+                    cursor.execute(f"DROP INDEX {nome}")
+                
+                cursor.execute(f"CREATE INDEX {nome} ON {tabela} ({', '.join(colunas)})")
+                alterados.append(nome)
+        
+        if alterados:
+            # Atualiza as estatísticas usadas pelo planejador de consultas
+            conexao, cursor = self.criar_conexao()
+            cursor.execute("ANALYZE")
+            conexao.commit()
+            conexao.close()
+            
+            Logger.log(f"Índices criados/atualizados: {', '.join(alterados)}", "INFO")
+        
+        return alterados
+    
     def _criar_dados_padrao(self):
         """
         Cria grupos padrão (admin e all) e usuário admin se não existirem.
@@ -9,7 +9,9 @@ e registra o histórico de variações para análise competitiva.
 Versão com arquitetura MVC para melhor organização e manutenção.
 """
 
+import argparse
 import sys
+from datetime import datetime
 from utils.logger import Logger
 from views.menu_view import MenuView
 
@@ -19,8 +21,7 @@ def verificar_dependencias():
         'requests': 'Para realizar requisições HTTP',
         'bs4': 'Para parsing de HTML',
         'selenium': 'Para extração em sites dinâmicos',
-        'webdriver_manager': 'Para gerenciar o ChromeDriver',
-        'schedule': 'Para agendamento de tarefas'
+        'webdriver_manager': 'Para gerenciar o ChromeDriver'
     }
     
     faltando = []
@@ -41,15 +42,170 @@ def verificar_dependencias():
     
     return True
 
-def iniciar_sistema():
+def validar_data(texto):
+    """Valida uma data AAAA-MM-DD informada na linha de comando."""
+    try:
+        return datetime.strptime(texto, '%Y-%m-%d').strftime('%Y-%m-%d')
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"data inválida: {texto} (use AAAA-MM-DD)")
+
+def criar_parser_argumentos():
+    """Cria o parser da linha de comando."""
+    parser = argparse.ArgumentParser(description="Sistema de Monitoramento de Preços")
+    subcomandos = parser.add_subparsers(dest='comando')
+    
+    agendador = subcomandos.add_parser(
+        'agendador',
+        help='Executa o agendador sem interface (SIGTERM encerra, SIGHUP recarrega a configuração)'
+    )
+    agendador.add_argument('--lote', type=int, default=None,
+                           help='Produtos reservados da fila em cada lote')
+    
+    importar = subcomandos.add_parser(
+        'importar',
+        help='Importa produtos de um arquivo CSV ou JSONL (colunas cliente, produto, concorrente, url)'
+    )
+    importar.add_argument('arquivo', help='Arquivo de produtos')
+    importar.add_argument('--formato', choices=('csv', 'jsonl'), default=None,
+                          help='Formato do arquivo (padrão: pela extensão)')
+    importar.add_argument('--usuario', default=None,
+                          help='Usuário responsável (define o grupo e as permissões; padrão: admin)')
+    importar.add_argument('--workers', type=int, default=None,
+                          help='Testes de preço simultâneos')
+    importar.add_argument('--por-dominio', type=int, default=None,
+                          help='Testes de preço simultâneos por domínio')
+    importar.add_argument('--relatorio', default=None,
+                          help='Grava as falhas em um arquivo CSV')
+    
+    exportar = subcomandos.add_parser(
+        'exportar',
+        help='Exporta o histórico de preços em CSV, JSONL ou Parquet'
+    )
+    exportar.add_argument('destino', help='Arquivo de saída')
+    exportar.add_argument('--formato', choices=('csv', 'jsonl', 'parquet'), default=None,
+                          help='Formato da saída (padrão: pela extensão do arquivo)')
+    exportar.add_argument('--cliente', default=None, help='Exporta apenas este cliente')
+    exportar.add_argument('--concorrente', default=None, help='Exporta apenas este concorrente')
+    exportar.add_argument('--inicio', type=validar_data, default=None,
+                          help='Data inicial (AAAA-MM-DD, inclusive)')
+    exportar.add_argument('--fim', type=validar_data, default=None,
+                          help='Data final (AAAA-MM-DD, inclusive)')
+    exportar.add_argument('--usuario', default=None,
+                          help='Restringe aos clientes deste usuário (padrão: todos)')
+    
+    reconstruir = subcomandos.add_parser(
+        'reconstruir-resumo',
+        help='Recalcula o resumo de preços (resumo_precos) a partir do histórico'
+    )
+    reconstruir.add_argument('--produto', type=int, default=None,
+                             help='Recalcula apenas este produto (padrão: todos)')
+    
+    return parser
+
+def iniciar_agendador(argumentos):
+    """Executa o agendador em modo daemon, sem o menu interativo."""
+    from database.connector import DatabaseConnector
+    from controllers.scheduler_controller import SchedulerController
+    
+    if not DatabaseConnector().inicializar_banco_dados():
+        print("Falha ao inicializar banco de dados. O agendador será encerrado.")
+        sys.exit(1)
+    
+    if not SchedulerController.executar_agendador(argumentos.lote):
+        sys.exit(1)
+
+def iniciar_importacao(argumentos):
+    """Importa produtos de um arquivo e exibe o resumo das falhas."""
+    from database.connector import DatabaseConnector
+    from controllers.produto_controller import ProdutoController
+    from controllers.importador_produtos import ImportadorProdutos
+    
+    if not DatabaseConnector().inicializar_banco_dados():
+        print("Falha ao inicializar banco de dados. A importação será encerrada.")
+        sys.exit(1)
+    
+    relatorio = ProdutoController.importar_produtos(
+        argumentos.arquivo, argumentos.formato, argumentos.usuario,
+        argumentos.workers, argumentos.por_dominio
+    )
+    
+    print(f"Registros lidos: {relatorio['lidos']}")
+    print(f"Produtos importados: {relatorio['importados']}")
+    print(f"Já cadastrados: {relatorio['existentes']}")
+    print(f"Falhas: {relatorio['total_falhas']}")
+    
+    for falha in relatorio['falhas'][:20]:
+        print(f"- linha {falha['linha']}: {falha['motivo']} {falha['url']}".rstrip())
+    if relatorio['total_falhas'] > 20:
+        print(f"... e mais {relatorio['total_falhas'] - 20} falhas")
+    
+    if argumentos.relatorio and ImportadorProdutos.salvar_falhas(relatorio, argumentos.relatorio):
+        print(f"Falhas gravadas em {argumentos.relatorio}")
+    
+    if relatorio['lidos'] and not relatorio['importados'] and not relatorio['existentes']:
+        sys.exit(1)
+
+def iniciar_exportacao(argumentos):
+    """Exporta o histórico de preços para um arquivo."""
+    from database.connector import DatabaseConnector
+    from controllers.exportador_historico import ExportadorHistorico
+    
+    if not DatabaseConnector().inicializar_banco_dados():
+        print("Falha ao inicializar banco de dados. A exportação será encerrada.")
+        sys.exit(1)
+    
+    total = ExportadorHistorico(argumentos.usuario).exportar(
+        argumentos.destino, argumentos.formato, argumentos.cliente,
+        argumentos.inicio, argumentos.fim, argumentos.concorrente
+    )
+    
+    if total is None:
+        print("Falha ao exportar o histórico. Consulte o log para mais detalhes.")
+        sys.exit(1)
+    
+    print(f"{total} registros exportados para {argumentos.destino}")
+
+def iniciar_reconstrucao_resumo(argumentos):
+    """Recalcula o resumo de preços a partir do histórico."""
+    from database.connector import DatabaseConnector
+    from controllers.admin_controller import AdminController
+    
+    if not DatabaseConnector().inicializar_banco_dados():
+        print("Falha ao inicializar banco de dados. A reconstrução será encerrada.")
+        sys.exit(1)
+    
+    total = AdminController.reconstruir_resumo_precos(argumentos.produto)
+    
+    if total is None:
+        print("Falha ao reconstruir o resumo de preços. Consulte o log para mais detalhes.")
+        sys.exit(1)
+    
+    print(f"Resumo de preços reconstruído para {total} produtos")
+
+def iniciar_sistema(argv=None):
     """Função principal que inicia o sistema."""
     try:
+        argumentos = criar_parser_argumentos().parse_args(argv)
+        
         # Verificar dependências
         if not verificar_dependencias():
             sys.exit(1)
         
         Logger.log("Sistema iniciado", "INFO")
         
+        if argumentos.comando == 'agendador':
+            iniciar_agendador(argumentos)
+            return
+        if argumentos.comando == 'importar':
+            iniciar_importacao(argumentos)
+            return
+        if argumentos.comando == 'exportar':
+            iniciar_exportacao(argumentos)
+            return
+        if argumentos.comando == 'reconstruir-resumo':
+            iniciar_reconstrucao_resumo(argumentos)
+            return
+        
         # Iniciar interface principal
         menu = MenuView()
         menu.iniciar()
@@ -7,6 +7,7 @@ Model que representa um cliente no sistema.
 
 from datetime import datetime
 from database.connector import DatabaseConnector
+from models.permissao import PermissoesUsuario
 from utils.logger import Logger
 
 class Cliente:
@@ -181,6 +182,8 @@ class Cliente:
             conexao.commit()
             conexao.close()
             
+            PermissoesUsuario.invalidar()
+            
             Logger.log(f"Cliente ID {id_cliente} excluído com sucesso", "INFO")
             return True
             
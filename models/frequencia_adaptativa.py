@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Intervalo de verificação adaptativo, ajustado pela volatilidade observada de cada produto.
+"""
+
+import os
+
+class FrequenciaAdaptativa:
+    # Ajuste automático opcional (MONITOR_PRECOS_FREQUENCIA_ADAPTATIVA=1 liga); desligado,
+    # os produtos sem intervalo fixo seguem os dias e horários do agendamento
+    ATIVA = os.environ.get('MONITOR_PRECOS_FREQUENCIA_ADAPTATIVA', '0') == '1'
+    # Limites e valor inicial do intervalo (segundos)
+    INTERVALO_MINIMO = 3600
+    INTERVALO_MAXIMO = 7 * 86400
+    INTERVALO_INICIAL = 86400
+    # Após uma mudança de preço o intervalo é multiplicado por FATOR_REDUCAO
+    FATOR_REDUCAO = 0.5
+    # A cada VERIFICACOES_PARA_AUMENTAR verificações sem mudança, por FATOR_AUMENTO
+    FATOR_AUMENTO = 1.5
+    VERIFICACOES_PARA_AUMENTAR = 3
+    # Diferença mínima (em reais) considerada mudança de preço
+    TOLERANCIA_PRECO = 0.005
+
+    @classmethod
+    def expressao_intervalo(cls, intervalo_fixo='intervalo_verificacao'):
+        """
+        Expressão SQL do intervalo efetivo de um item de 'fila_agendamento':
+        o intervalo fixo, se definido, senão o adaptativo (quando ativo).
+
+        Args:
+            intervalo_fixo (str): Coluna ou parâmetro ('?') com o intervalo fixo
+
+        Returns:
+            str: Expressão SQL (NULL = produto segue os horários do agendamento)
+        """
+        if cls.ATIVA:
+            return f"COALESCE({intervalo_fixo}, intervalo_adaptativo)"
+        return intervalo_fixo
+
+    @classmethod
+    def sql_atualizacao(cls):
+        """
+        Comando que incorpora um novo preço às estatísticas do produto na fila,
+        sem consultar o histórico: conta as verificações estáveis seguidas,
+        reduz o intervalo após uma mudança e o aumenta após uma sequência estável.
+
+        Parâmetros nomeados: valor, id_produto e os de parametros().
+
+        Returns:
+            str: Comando UPDATE
+        """
+        return '''
+        UPDATE fila_agendamento
+        SET verificacoes_estaveis = CASE
+                WHEN ABS(ultimo_preco - :valor) < :tolerancia THEN verificacoes_estaveis + 1
+                ELSE 0
+            END,
+            intervalo_adaptativo = CASE
+                WHEN ultimo_preco IS NULL
+                THEN COALESCE(intervalo_adaptativo, :inicial)
+                WHEN ABS(ultimo_preco - :valor) >= :tolerancia
+                THEN MAX(:minimo, CAST(COALESCE(intervalo_adaptativo, :inicial) * :reducao AS INTEGER))
+                WHEN (verificacoes_estaveis + 1) % :estaveis = 0
+                THEN MIN(:maximo, CAST(COALESCE(intervalo_adaptativo, :inicial) * :aumento AS INTEGER))
+                ELSE COALESCE(intervalo_adaptativo, :inicial)
+            END,
+            ultimo_preco = :valor
+        WHERE id_produto = :id_produto
+        '''
+
+    @classmethod
+    def parametros(cls):
+        """
+        Returns:
+            dict: Limites e fatores usados por sql_atualizacao()
+        """
+        return {
+            'tolerancia': cls.TOLERANCIA_PRECO,
+            'inicial': cls.INTERVALO_INICIAL,
+            'minimo': cls.INTERVALO_MINIMO,
+            'maximo': cls.INTERVALO_MAXIMO,
+            'reducao': cls.FATOR_REDUCAO,
+            'aumento': cls.FATOR_AUMENTO,
+            'estaveis': max(1, cls.VERIFICACOES_PARA_AUMENTAR)
+        }
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Gravação em lote dos preços coletados durante um monitoramento.
+"""
+
+import threading
+from datetime import datetime
+from database.connector import DatabaseConnector
+from models.frequencia_adaptativa import FrequenciaAdaptativa
+from models.resumo_precos import ResumoPrecos
+from utils.logger import Logger
+
+class GravadorPrecos:
+    # Número de preços acumulados antes de gravar no banco
+    TAMANHO_LOTE = 100
+
+    def __init__(self, tamanho_lote=None):
+        self.tamanho_lote = max(1, tamanho_lote or self.TAMANHO_LOTE)
+        self.db = DatabaseConnector()
+        # Preços efetivamente confirmados no banco e preços de lotes desfeitos
+        self.total_gravado = 0
+        self.total_falhas = 0
+        self._pendentes = []
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traceback):
+        # Grava o que estiver pendente mesmo se o monitoramento for interrompido
+        self.descarregar()
+        return False
+
+    def adicionar(self, id_produto, valor, verificacao_manual=False):
+        """
+        Acrescenta um preço ao lote, gravando o lote quando ele fica cheio.
+
+        Args:
+            id_produto (int): ID do produto
+            valor (float): Preço coletado
+            verificacao_manual (bool): Se True, marca o produto como verificado manualmente
+
+        Returns:
+            bool: False se a gravação de um lote cheio falhou, True caso contrário
+        """
+        data_hora = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+        with self._lock:
+            self._pendentes.append((id_produto, valor, data_hora, bool(verificacao_manual)))
+
+            if len(self._pendentes) < self.tamanho_lote:
+                return True
+
+            lote, self._pendentes = self._pendentes, []
+
+        return self._gravar(lote)
+
+    def descarregar(self):
+        """
+        Grava imediatamente todos os preços pendentes.
+
+        Returns:
+            bool: True se a gravação foi bem-sucedida (ou não havia pendências), False caso contrário
+        """
+        with self._lock:
+            lote, self._pendentes = self._pendentes, []
+
+        if not lote:
+            return True
+
+        return self._gravar(lote)
+
+    def _gravar(self, lote):
+        """
+        Grava um lote de preços e atualiza o resumo e a fila de agendamento em uma única transação.
+
+        Args:
+            lote (list): Tuplas (id_produto, valor, data_hora, verificacao_manual)
+
+        Returns:
+            bool: True se a gravação foi bem-sucedida, False caso contrário
+        """
+        try:
+            automaticos = [(data_hora, data_hora, id_produto) for id_produto, _, data_hora, manual in lote if not manual]
+            manuais = [(data_hora, data_hora, id_produto) for id_produto, _, data_hora, manual in lote if manual]
+
+            with self.db.transacao() as cursor:
+                # Registrar os preços no histórico
+                cursor.executemany('''
+                INSERT INTO historico_precos (id_produto, preco, data)
+                VALUES (?, ?, ?)
+                ''', [(id_produto, valor, data_hora[:10]) for id_produto, valor, data_hora, _ in lote])
+
+                # Atualizar o resumo de preços de cada produto
+                cursor.executemany(ResumoPrecos.sql_atualizacao(), [
+                    ResumoPrecos.parametros(id_produto, valor, data_hora[:10]) for id_produto, valor, data_hora, _ in lote
+                ])
+
+                # Garantir que todos os produtos estejam na fila
+                cursor.executemany('''
+                INSERT OR IGNORE INTO fila_agendamento (id_produto, posicao_fila, data_inclusao)
+                VALUES (?, (SELECT COALESCE(MAX(posicao_fila), 0) + 1 FROM fila_agendamento), ?)
+                ''', [(id_produto, data_hora) for id_produto, _, data_hora, _ in lote])
+
+                # Atualizar a volatilidade observada e o intervalo adaptativo de cada produto
+                parametros = FrequenciaAdaptativa.parametros()
+                cursor.executemany(FrequenciaAdaptativa.sql_atualizacao(), [
+                    dict(parametros, valor=valor, id_produto=id_produto) for id_produto, valor, _, _ in lote
+                ])
+
+                # Verificações automáticas vão para o final da fila, na ordem de conclusão,
+                # liberando a reserva do trabalhador que as processou; produtos com
+                # intervalo (fixo ou adaptativo) passam a vencer um intervalo depois
+                intervalo = FrequenciaAdaptativa.expressao_intervalo()
+                cursor.executemany(f'''
+                UPDATE fila_agendamento
+                SET posicao_fila = (SELECT COALESCE(MAX(posicao_fila), 0) + 1 FROM fila_agendamento),
+                    ultima_verificacao = ?, verificacao_manual = 0,
+                    proxima_verificacao = datetime(?, '+' || {intervalo} || ' seconds'),
+                    reservado_por = NULL, reserva_expira_em = NULL, reserva_heartbeat = NULL
+                WHERE id_produto = ?
+                ''', automaticos)
+
+                # Verificações manuais saem da fila do dia
+                cursor.executemany(f'''
+                UPDATE fila_agendamento
+                SET verificacao_manual = 1, ultima_verificacao = ?,
+                    proxima_verificacao = datetime(?, '+' || {intervalo} || ' seconds')
+                WHERE id_produto = ?
+                ''', manuais)
+
+            with self._lock:
+                self.total_gravado += len(lote)
+            for id_produto, valor, _, manual in lote:
+                sufixo = " (verificação manual)" if manual else ""
+                Logger.log(f"Preço R$ {valor:.2f} registrado para o produto ID {id_produto}{sufixo}", "INFO")
+            Logger.log(f"Lote de {len(lote)} preços gravado no histórico", "INFO")
+            return True
+
+        except Exception as e:
+            with self._lock:
+                self.total_falhas += len(lote)
+            Logger.log(f"Erro ao gravar lote de {len(lote)} preços: {e}", "ERROR")
+            return False
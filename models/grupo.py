@@ -7,6 +7,7 @@ Model que representa um grupo no sistema.
 
 from datetime import datetime
 from database.connector import DatabaseConnector
+from models.permissao import PermissoesUsuario
 
 class Grupo:
     def __init__(self, id=None, id_grupo=None, nome=None, descricao=None, data_criacao=None):
@@ -93,6 +94,8 @@ class Grupo:
             conexao.commit()
             conexao.close()
             
+            PermissoesUsuario.invalidar()
+            
             from utils.logger import Logger
             Logger.log(f"Usuário ID {id_usuario} adicionado ao grupo {self.id_grupo}", "INFO")
             return True
@@ -157,6 +160,8 @@ class Grupo:
             conexao.commit()
             conexao.close()
             
+            PermissoesUsuario.invalidar(username)
+            
             from utils.logger import Logger
             Logger.log(f"Usuário {username} removido do grupo {self.id_grupo}", "INFO")
             return True
@@ -177,26 +182,23 @@ class Grupo:
             bool: True se a operação foi bem-sucedida, False caso contrário
         """
         try:
-            conexao, cursor = self.db.criar_conexao()
-            
-            # Verificar se a associação já existe
-            cursor.execute('''
-            SELECT id FROM clientes_grupos WHERE id_cliente = ? AND id_grupo = ?
-            ''', (id_cliente, self.id))
-            
-            if cursor.fetchone():
-                conexao.close()
-                return True  # Associação já existe
-            
-            # Criar a associação
-            data_atual = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            cursor.execute('''
-            INSERT INTO clientes_grupos (id_cliente, id_grupo, data_associacao)
-            VALUES (?, ?, ?)
-            ''', (id_cliente, self.id, data_atual))
+            with self.db.transacao() as cursor:
+                # Verificar se a associação já existe
+                cursor.execute('''
+                SELECT id FROM clientes_grupos WHERE id_cliente = ? AND id_grupo = ?
+                ''', (id_cliente, self.id))
+                
+                if cursor.fetchone():
+                    return True  # Associação já existe
+                
+                # Criar a associação
+                data_atual = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                cursor.execute('''
+                INSERT INTO clientes_grupos (id_cliente, id_grupo, data_associacao)
+                VALUES (?, ?, ?)
+                ''', (id_cliente, self.id, data_atual))
             
-            conexao.commit()
-            conexao.close()
+            PermissoesUsuario.invalidar()
             
             from utils.logger import Logger
             Logger.log(f"Cliente ID {id_cliente} adicionado ao grupo {self.id_grupo}", "INFO")
@@ -237,6 +239,8 @@ class Grupo:
             conexao.commit()
             conexao.close()
             
+            PermissoesUsuario.invalidar()
+            
             from utils.logger import Logger
             Logger.log(f"Cliente ID {id_cliente} removido do grupo {self.id_grupo}", "INFO")
             return True
@@ -246,6 +250,140 @@ class Grupo:
             Logger.log(f"Erro ao remover cliente do grupo: {str(e)}", "ERROR")
             return False
     
+    def adicionar_clientes(self, ids_clientes):
+        """
+        Adiciona vários clientes ao grupo em uma única transação.
+        
+        Associações já existentes são ignoradas.
+        
+        Args:
+            ids_clientes (iterable): IDs dos clientes
+            
+        Returns:
+            int: Número de associações criadas ou None em caso de erro
+        """
+        try:
+            data_atual = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            
+            with self.db.transacao() as cursor:
+                cursor.executemany('''
+                INSERT OR IGNORE INTO clientes_grupos (id_cliente, id_grupo, data_associacao)
+                VALUES (?, ?, ?)
+                ''', ((id_cliente, self.id, data_atual) for id_cliente in ids_clientes))
+                criadas = max(cursor.rowcount, 0)
+            
+            PermissoesUsuario.invalidar()
+            
+            from utils.logger import Logger
+            Logger.log(f"{criadas} clientes adicionados ao grupo {self.id_grupo}", "INFO")
+            return criadas
+            
+        except Exception as e:
+            from utils.logger import Logger
+            Logger.log(f"Erro ao adicionar clientes ao grupo: {str(e)}", "ERROR")
+            return None
+    
+    def remover_clientes(self, ids_clientes):
+        """
+        Remove vários clientes do grupo em uma única transação.
+        
+        Args:
+            ids_clientes (iterable): IDs dos clientes
+            
+        Returns:
+            int: Número de associações removidas ou None em caso de erro
+        """
+        try:
+            with self.db.transacao() as cursor:
+                cursor.executemany('''
+                DELETE FROM clientes_grupos WHERE id_cliente = ? AND id_grupo = ?
+                ''', ((id_cliente, self.id) for id_cliente in ids_clientes))
+                removidas = max(cursor.rowcount, 0)
+            
+            PermissoesUsuario.invalidar()
+            
+            from utils.logger import Logger
+            Logger.log(f"{removidas} clientes removidos do grupo {self.id_grupo}", "INFO")
+            return removidas
+            
+        except Exception as e:
+            from utils.logger import Logger
+            Logger.log(f"Erro ao remover clientes do grupo: {str(e)}", "ERROR")
+            return None
+    
+    def adicionar_usuarios(self, ids_usuarios):
+        """
+        Adiciona vários usuários ao grupo em uma única transação.
+        
+        Associações já existentes são ignoradas.
+        
+        Args:
+            ids_usuarios (iterable): IDs dos usuários
+            
+        Returns:
+            int: Número de associações criadas ou None em caso de erro
+        """
+        try:
+            data_atual = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            
+            with self.db.transacao() as cursor:
+                cursor.executemany('''
+                INSERT OR IGNORE INTO usuarios_grupos (id_usuario, id_grupo, data_associacao)
+                VALUES (?, ?, ?)
+                ''', ((id_usuario, self.id, data_atual) for id_usuario in ids_usuarios))
+                criadas = max(cursor.rowcount, 0)
+            
+            PermissoesUsuario.invalidar()
+            
+            from utils.logger import Logger
+            Logger.log(f"{criadas} usuários adicionados ao grupo {self.id_grupo}", "INFO")
+            return criadas
+            
+        except Exception as e:
+            from utils.logger import Logger
+            Logger.log(f"Erro ao adicionar usuários ao grupo: {str(e)}", "ERROR")
+            return None
+    
+    def remover_usuarios(self, ids_usuarios):
+        """
+        Remove vários usuários do grupo em uma única transação.
+        
+        Como em remover_usuario, o admin não sai dos grupos 'admin' e 'all'
+        e nenhum usuário sai do seu próprio grupo pessoal.
+        
+        Args:
+            ids_usuarios (iterable): IDs dos usuários
+            
+        Returns:
+            int: Número de associações removidas ou None em caso de erro
+        """
+        try:
+            # Usuários que não podem deixar este grupo
+            protegidos = [self.id_grupo]
+            if self.id_grupo in ("admin", "all"):
+                protegidos.append("admin")
+            
+            with self.db.transacao() as cursor:
+                cursor.executemany(f'''
+                DELETE FROM usuarios_grupos
+                WHERE id_usuario = ? AND id_grupo = ?
+                AND id_usuario NOT IN (
+                    SELECT id FROM usuarios WHERE username IN ({", ".join("?" * len(protegidos))})
+                )
+                ''', ((id_usuario, self.id, *protegidos) for id_usuario in ids_usuarios))
+                removidas = max(cursor.rowcount, 0)
+            
+            PermissoesUsuario.invalidar()
+            
+            from utils.logger import Logger
+            Logger.log(f"{removidas} usuários removidos do grupo {self.id_grupo}", "INFO")
+            return removidas
+            
+        except Exception as e:
+            from utils.logger import Logger
+            Logger.log(f"Erro ao remover usuários do grupo: {str(e)}", "ERROR")
+            return None
+    
     def obter_usuarios(self):
         """
         Obtém todos os usuários associados ao grupo.
@@ -322,12 +460,13 @@ class Grupo:
             return []
     
     @classmethod
-    def sincronizar_grupo_all(cls, todos_clientes_ids):
+    def sincronizar_grupo_all(cls, todos_clientes_ids=None):
         """
         Sincroniza o grupo 'all' com todos os clientes fornecidos.
         
         Args:
-            todos_clientes_ids (list): Lista de IDs de todos os clientes
+            todos_clientes_ids (list, optional): Lista de IDs dos clientes
+                (padrão: todos os clientes cadastrados)
             
         Returns:
             bool: True se a operação foi bem-sucedida, False caso contrário
@@ -340,12 +479,24 @@ class Grupo:
                 Logger.log("Grupo 'all' não encontrado durante sincronização", "ERROR")
                 return False
             
-            # Adicionar todos os clientes ao grupo 'all'
-            for id_cliente in todos_clientes_ids:
-                grupo_all.adicionar_cliente(id_cliente)
+            if todos_clientes_ids is not None:
+                criadas = grupo_all.adicionar_clientes(todos_clientes_ids)
+                if criadas is None:
+                    return False
+            else:
+                # Todos os clientes cadastrados, em um único INSERT ... SELECT
+                data_atual = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                with grupo_all.db.transacao() as cursor:
+                    cursor.execute('''
+                    INSERT OR IGNORE INTO clientes_grupos (id_cliente, id_grupo, data_associacao)
+                    SELECT id, ?, ? FROM clientes
+                    ''', (grupo_all.id, data_atual))
+                    criadas = max(cursor.rowcount, 0)
+                
+                PermissoesUsuario.invalidar()
             
             from utils.logger import Logger
-            Logger.log(f"Grupo 'all' sincronizado com {len(todos_clientes_ids)} clientes", "INFO")
+            Logger.log(f"Grupo 'all' sincronizado: {criadas} novos clientes associados", "INFO")
             return True
             
         except Exception as e:
@@ -495,6 +646,8 @@ class Grupo:
             conexao.commit()
             conexao.close()
             
+            PermissoesUsuario.invalidar()
+            
             from utils.logger import Logger
             Logger.log(f"Grupo '{id_grupo_str}' excluído com sucesso", "INFO")
             return True
@@ -7,6 +7,7 @@ Model que representa o histórico de preços no sistema.
 
 from datetime import datetime
 from database.connector import DatabaseConnector
+from models.resumo_precos import ResumoPrecos
 
 class Historico:
     def __init__(self, id=None, id_produto=None, preco=None, data=None):
@@ -34,6 +35,9 @@ class Historico:
             
             self.id = cursor.lastrowid
             
+            # Atualizar o resumo do produto na mesma transação
+            cursor.execute(ResumoPrecos.sql_atualizacao(), ResumoPrecos.parametros(self.id_produto, self.preco, self.data))
+            
             conexao.commit()
             conexao.close()
             
@@ -92,6 +96,9 @@ class Historico:
         """
         Obtém um resumo dos preços de um produto.
         
+        O resumo é lido da tabela 'resumo_precos', mantida a cada preço gravado
+        (uma consulta pela chave primária, sem percorrer o histórico).
+        
         Args:
             id_produto (int): ID do produto
             
@@ -99,37 +106,110 @@ class Historico:
             dict: Dicionário com dados resumidos (preço atual, mínimo, máximo, etc.)
         """
         try:
-            db = DatabaseConnector()
-            conexao, cursor = db.criar_conexao()
-            
-            cursor.execute('''
-            SELECT 
-                MAX(data) as ultima_data,
-                (SELECT preco FROM historico_precos WHERE id_produto = ? ORDER BY data DESC LIMIT 1) as preco_atual,
-                MIN(preco) as preco_minimo,
-                MAX(preco) as preco_maximo,
-                AVG(preco) as preco_medio,
-                COUNT(*) as total_registros
-            FROM historico_precos
-            WHERE id_produto = ?
-            ''', (id_produto, id_produto))
+            resumo = ResumoPrecos.obter(id_produto)
             
-            resultado = cursor.fetchone()
-            conexao.close()
-            
-            if resultado:
+            if not resumo:
+                # Produto sem preços registrados
                 return {
-                    'ultima_data': resultado['ultima_data'],
-                    'preco_atual': resultado['preco_atual'],
-                    'preco_minimo': resultado['preco_minimo'],
-                    'preco_maximo': resultado['preco_maximo'],
-                    'preco_medio': resultado['preco_medio'],
-                    'total_registros': resultado['total_registros']
+                    'ultima_data': None,
+                    'ultima_alteracao': None,
+                    'preco_atual': None,
+                    'preco_minimo': None,
+                    'preco_maximo': None,
+                    'preco_medio': None,
+                    'total_registros': 0
                 }
             
-            return None
+            return {
+                'ultima_data': resumo['ultima_data'],
+                'ultima_alteracao': resumo['ultima_alteracao'],
+                'preco_atual': resumo['preco_atual'],
+                'preco_minimo': resumo['preco_minimo'],
+                'preco_maximo': resumo['preco_maximo'],
+                'preco_medio': resumo['preco_medio'],
+                'total_registros': resumo['total_registros']
+            }
             
         except Exception as e:
             from utils.logger import Logger
             Logger.log(f"Erro ao obter resumo do produto: {str(e)}", "ERROR")
-            return None
\ No newline at end of file
+            return None
+    
+    @classmethod
+    def iterar_detalhado(cls, id_usuario=None, nome_cliente=None, data_inicio=None, data_fim=None,
+                         concorrente=None, tamanho_bloco=1000):
+        """
+        Percorre o histórico de preços com os dados do produto e do cliente
+        (historico_precos ⋈ produtos ⋈ clientes), lendo as linhas do banco em
+        blocos: a memória usada não depende do tamanho do histórico.
+        
+        Args:
+            id_usuario (int, optional): Restringe aos clientes dos grupos deste usuário
+                (None = sem restrição, ex.: administradores)
+            nome_cliente (str, optional): Restringe a um cliente
+            data_inicio (str, optional): Data inicial 'AAAA-MM-DD' (inclusive)
+            data_fim (str, optional): Data final 'AAAA-MM-DD' (inclusive)
+            concorrente (str, optional): Restringe a um concorrente
+            tamanho_bloco (int): Linhas lidas do banco por vez
+            
+        Yields:
+            sqlite3.Row: Colunas id, data, preco, id_produto, produto, concorrente, url e cliente,
+                         em ordem de produto e data
+        """
+        condicoes = []
+        parametros = []
+        
+        if id_usuario is not None:
+            condicoes.append('''p.id_cliente IN (
+                SELECT cg.id_cliente
+                FROM clientes_grupos cg
+                JOIN usuarios_grupos ug ON ug.id_grupo = cg.id_grupo
+                WHERE ug.id_usuario = ?
+            )''')
+            parametros.append(id_usuario)
+        
+        if nome_cliente is not None:
+            condicoes.append("c.nome = ?")
+            parametros.append(nome_cliente)
+        
+        if data_inicio is not None:
+            condicoes.append("h.data >= ?")
+            parametros.append(data_inicio)
+        
+        if data_fim is not None:
+            condicoes.append("h.data <= ?")
+            parametros.append(data_fim)
+        
+        if concorrente is not None:
+            condicoes.append("p.concorrente = ?")
+            parametros.append(concorrente)
+        
+        where = f"WHERE {' AND '.join(condicoes)}" if condicoes else ""
+        
+        db = DatabaseConnector()
+        conexao, _ = db.criar_conexao()
+        # Cursor próprio: o consumidor pode usar a mesma conexão durante a leitura
+        cursor = conexao.cursor()
+        
+        try:
+            # A ordem (id_produto, data) é a do índice idx_historico_produto_data,
+            # então o SQLite percorre o índice em vez de ordenar o histórico
+            cursor.execute(f'''
+            SELECT h.id, h.data, h.preco, h.id_produto,
+                   p.nome AS produto, p.concorrente, p.url, c.nome AS cliente
+            FROM historico_precos h
+            JOIN produtos p ON p.id = h.id_produto
+            JOIN clientes c ON c.id = p.id_cliente
+            {where}
+            ORDER BY h.id_produto, h.data
+            ''', parametros)
+            
+            while True:
+                linhas = cursor.fetchmany(tamanho_bloco)
+                if not linhas:
+                    break
+                yield from linhas
+        
+        finally:
+            cursor.close()
+            conexao.close()
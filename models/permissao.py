@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Resolução e cache das permissões de acesso de cada usuário aos clientes.
+"""
+
+import threading
+from database.connector import DatabaseConnector
+from utils.logger import Logger
+
+class PermissoesUsuario:
+    # Permissões resolvidas na sessão: username -> dict (ver resolver)
+    _cache = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def resolver(cls, username):
+        """
+        Resolve em uma única consulta os grupos e os clientes acessíveis ao usuário.
+
+        Args:
+            username (str): Nome do usuário
+
+        Returns:
+            dict: {'id_usuario', 'admin', 'grupos' (set de id_grupo), 'clientes' (dict id -> nome),
+                   'nomes_clientes' (set)} ou None se o usuário não existe
+        """
+        db = DatabaseConnector()
+        conexao, cursor = db.criar_conexao()
+
+        cursor.execute('''
+        SELECT u.id AS id_usuario, u.tipo, g.id_grupo, c.id AS id_cliente, c.nome AS cliente
+        FROM usuarios u
+        LEFT JOIN usuarios_grupos ug ON ug.id_usuario = u.id
+        LEFT JOIN grupos g ON g.id = ug.id_grupo
+        LEFT JOIN clientes_grupos cg ON cg.id_grupo = g.id
+        LEFT JOIN clientes c ON c.id = cg.id_cliente
+        WHERE u.username = ?
+        ''', (username,))
+
+        linhas = cursor.fetchall()
+        conexao.close()
+
+        if not linhas:
+            return None
+
+        grupos = {linha['id_grupo'] for linha in linhas if linha['id_grupo'] is not None}
+        clientes = {linha['id_cliente']: linha['cliente'] for linha in linhas if linha['id_cliente'] is not None}
+
+        return {
+            'id_usuario': linhas[0]['id_usuario'],
+            # Administradores (por tipo ou pelo grupo 'admin') acessam todos os clientes
+            'admin': linhas[0]['tipo'] == 'admin' or 'admin' in grupos,
+            'grupos': grupos,
+            'clientes': clientes,
+            'nomes_clientes': set(clientes.values())
+        }
+
+    @classmethod
+    def obter(cls, username):
+        """
+        Retorna as permissões do usuário, resolvendo-as na primeira consulta da sessão.
+
+        Args:
+            username (str): Nome do usuário
+
+        Returns:
+            dict: Permissões (ver resolver) ou None se o usuário não existe
+        """
+        if not username:
+            return None
+
+        with cls._lock:
+            if username in cls._cache:
+                return cls._cache[username]
+
+        try:
+            permissoes = cls.resolver(username)
+        except Exception as e:
+            Logger.log(f"Erro ao resolver permissões de {username}: {e}", "ERROR")
+            return None
+
+        # Usuários inexistentes não são guardados (podem ser criados depois)
+        if permissoes is not None:
+            with cls._lock:
+                cls._cache[username] = permissoes
+
+        return permissoes
+
+    @classmethod
+    def invalidar(cls, username=None):
+        """
+        Descarta as permissões em cache após mudanças de grupos, clientes ou usuários.
+
+        Args:
+            username (str, optional): Usuário afetado (None = todos)
+        """
+        with cls._lock:
+            if username is None:
+                cls._cache.clear()
+            else:
+                cls._cache.pop(username, None)
+
+    @classmethod
+    def eh_admin(cls, username):
+        """
+        Returns:
+            bool: True se o usuário é administrador (tipo ou grupo 'admin')
+        """
+        permissoes = cls.obter(username)
+        return bool(permissoes and permissoes['admin'])
+
+    @classmethod
+    def pertence_grupo(cls, username, id_grupo):
+        """
+        Returns:
+            bool: True se o usuário pertence ao grupo (campo id_grupo)
+        """
+        permissoes = cls.obter(username)
+        return bool(permissoes and id_grupo in permissoes['grupos'])
+
+    @classmethod
+    def pode_acessar_cliente(cls, username, cliente):
+        """
+        Verifica o acesso do usuário a um cliente.
+
+        Args:
+            username (str): Nome do usuário
+            cliente (str | int): Nome ou ID do cliente
+
+        Returns:
+            bool: True se o usuário tem permissão, False caso contrário
+        """
+        permissoes = cls.obter(username)
+
+        if not permissoes:
+            return False
+        if permissoes['admin']:
+            return True
+        if isinstance(cliente, int):
+            return cliente in permissoes['clientes']
+        return cliente in permissoes['nomes_clientes']
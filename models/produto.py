@@ -9,6 +9,7 @@ from datetime import datetime
 from database.connector import DatabaseConnector
 from utils.logger import Logger
 from scraper.price_scraper import PriceScraper
+from models.gravador_precos import GravadorPrecos
 
 class Produto:
     def __init__(self, id=None, id_cliente=None, nome=None, concorrente=None, 
@@ -31,40 +32,40 @@ class Produto:
             bool: True se a operação foi bem-sucedida, False caso contrário
         """
         try:
-            conexao, cursor = self.db.criar_conexao()
-            
-            # Verificar se o produto já existe para este cliente e grupo
-            cursor.execute('''
-            SELECT id FROM produtos 
-            WHERE id_cliente = ? AND nome = ? AND url = ? AND id_grupo = ?
-            ''', (self.id_cliente, self.nome, self.url, self.id_grupo))
-            
-            resultado = cursor.fetchone()
-            
-            if resultado:
-                self.id = resultado['id']
-                
-                # Atualizar produto existente
+            with self.db.transacao() as cursor:
+                # Verificar se o produto já existe para este cliente e grupo
                 cursor.execute('''
-                UPDATE produtos 
-                SET concorrente = ?, id_plataforma = ?
-                WHERE id = ?
-                ''', (self.concorrente, self.id_plataforma, self.id))
-            else:
-                # Inserir novo produto
-                cursor.execute('''
-                INSERT INTO produtos (id_cliente, nome, concorrente, url, id_plataforma, id_grupo, data_criacao)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                ''', (self.id_cliente, self.nome, self.concorrente, self.url, 
-                      self.id_plataforma, self.id_grupo, self.data_criacao))
+                SELECT id FROM produtos 
+                WHERE id_cliente = ? AND nome = ? AND url = ? AND id_grupo = ?
+                ''', (self.id_cliente, self.nome, self.url, self.id_grupo))
                 
-                self.id = cursor.lastrowid
-            
-            conexao.commit()
-            conexao.close()
+                resultado = cursor.fetchone()
+                
+                if resultado:
+                    self.id = resultado['id']
+                    
+                    # Atualizar produto existente
+                    cursor.execute('''
+                    UPDATE produtos 
+                    SET concorrente = ?, id_plataforma = ?
+                    WHERE id = ?
+                    ''', (self.concorrente, self.id_plataforma, self.id))
+                else:
+                    # Inserir novo produto
+                    cursor.execute('''
+                    INSERT INTO produtos (id_cliente, nome, concorrente, url, id_plataforma, id_grupo, data_criacao)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ''', (self.id_cliente, self.nome, self.concorrente, self.url, 
+                          self.id_plataforma, self.id_grupo, self.data_criacao))
+                    
+                    self.id = cursor.lastrowid
+                
+                # Adicionar o produto à fila de agendamento na mesma transação
+                self.adicionar_a_fila()
             
-            # Adicionar o produto à fila de agendamento
-            self.adicionar_a_fila()
+            # Produtos com plataforma alimentam o índice de seletores
+            if self.id_plataforma:
+                PriceScraper.invalidar_indice_seletores()
             
             Logger.log(f"Produto '{self.nome}' (ID: {self.id}) salvo com sucesso", "INFO")
             return True
@@ -73,54 +74,62 @@ class Produto:
             Logger.log(f"Erro ao salvar produto: {e}", "ERROR")
             return False
     
-    def registrar_preco(self, seletor_css, verificacao_manual=False):
+    def coletar_preco(self, seletor_css, scraper=None):
+        """
+        Extrai e converte o preço atual do produto, sem gravá-lo.
+        
+        Args:
+            seletor_css (str, optional): Seletor CSS para extrair o preço
+            scraper (PriceScraper, optional): Scraper a reutilizar
+            
+        Returns:
+            float: Preço encontrado ou None se não foi possível extraí-lo
+        """
+        scraper = scraper or PriceScraper()
+        
+        # Extrair o preço usando o seletor
+        preco_texto = scraper.extrair_preco(self.url, seletor_css)
+        
+        if not preco_texto:
+            Logger.log(f"Não foi possível extrair o preço para o produto ID {self.id}", "WARNING")
+            return None
+            
+        valor = scraper.converter_preco(preco_texto)
+        
+        if valor is None:
+            Logger.log(f"Não foi possível converter o preço '{preco_texto}' para o produto ID {self.id}", "WARNING")
+            return None
+        
+        return valor
+    
+    def registrar_preco(self, seletor_css, verificacao_manual=False, gravador=None, scraper=None):
         """
         Registra o preço atual do produto.
         
         Args:
-            seletor_css (str): Seletor CSS para extrair o preço
+            seletor_css (str, optional): Seletor CSS para extrair o preço
             verificacao_manual (bool): Se True, marca como verificação manual
+            gravador (GravadorPrecos, optional): Gravador em lote; se informado,
+                o preço é acumulado e gravado junto com o restante do lote
+            scraper (PriceScraper, optional): Scraper a reutilizar
             
         Returns:
-            bool: True se a operação foi bem-sucedida, False caso contrário
+            bool: True se o preço foi coletado (e, sem gravador, gravado), False caso contrário
         """
         try:
-            scraper = PriceScraper()
-            
-            # Extrair o preço usando o seletor
-            preco_texto = scraper.extrair_preco(self.url, seletor_css)
-            
-            if not preco_texto:
-                Logger.log(f"Não foi possível extrair o preço para o produto ID {self.id}", "WARNING")
-                return False
-                
-            valor = scraper.converter_preco(preco_texto)
+            valor = self.coletar_preco(seletor_css, scraper)
             
             if valor is None:
-                Logger.log(f"Não foi possível converter o preço '{preco_texto}' para o produto ID {self.id}", "WARNING")
                 return False
             
-            # Registrar o preço no histórico
-            conexao, cursor = self.db.criar_conexao()
-            data_hoje = datetime.now().strftime('%Y-%m-%d')
-            
-            cursor.execute('''
-            INSERT INTO historico_precos (id_produto, preco, data) 
-            VALUES (?, ?, ?)
-            ''', (self.id, valor, data_hoje))
-            
-            conexao.commit()
-            conexao.close()
-            
-            # Atualizar o status na fila de agendamento
-            if verificacao_manual:
-                self.remover_da_fila_do_dia()
-                Logger.log(f"Preço R$ {valor:.2f} registrado para o produto ID {self.id} (verificação manual)", "INFO")
-            else:
-                self.mover_para_final_da_fila()
-                Logger.log(f"Preço R$ {valor:.2f} registrado para o produto ID {self.id}", "INFO")
+            if gravador is not None:
+                # Gravação adiada para o próximo lote (o gravador registra no log o que gravar)
+                gravador.adicionar(self.id, valor, verificacao_manual)
+                return True
             
-            return True
+            # Registrar o preço e atualizar a fila em uma única transação
+            gravador_unico = GravadorPrecos(tamanho_lote=1)
+            return gravador_unico.adicionar(self.id, valor, verificacao_manual)
             
         except Exception as e:
             Logger.log(f"Erro ao registrar preço: {e}", "ERROR")
@@ -134,28 +143,16 @@ class Produto:
             bool: True se a operação foi bem-sucedida, False caso contrário
         """
         try:
-            conexao, cursor = self.db.criar_conexao()
-            
-            # Verificar se o produto já está na fila
-            cursor.execute("SELECT id FROM fila_agendamento WHERE id_produto = ?", (self.id,))
-            if cursor.fetchone():
-                conexao.close()
-                return True  # Produto já está na fila
-            
-            # Buscar a última posição da fila
-            cursor.execute("SELECT MAX(posicao_fila) as ultima_posicao FROM fila_agendamento")
-            resultado = cursor.fetchone()
-            ultima_posicao = resultado['ultima_posicao'] if resultado and resultado['ultima_posicao'] is not None else 0
-            
-            # Adicionar o produto na última posição
-            data_atual = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            cursor.execute('''
-            INSERT INTO fila_agendamento (id_produto, posicao_fila, data_inclusao)
-            VALUES (?, ?, ?)
-            ''', (self.id, ultima_posicao + 1, data_atual))
-            
-            conexao.commit()
-            conexao.close()
+            with self.db.transacao() as cursor:
+                # Adicionar o produto na última posição (ignorado se já estiver na fila)
+                data_atual = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                cursor.execute('''
+                INSERT OR IGNORE INTO fila_agendamento (id_produto, posicao_fila, data_inclusao)
+                VALUES (?, (SELECT COALESCE(MAX(posicao_fila), 0) + 1 FROM fila_agendamento), ?)
+                ''', (self.id, data_atual))
+                
+                if cursor.rowcount == 0:
+                    return True  # Produto já está na fila
             
             Logger.log(f"Produto ID {self.id} adicionado à fila de agendamento", "INFO")
             return True
@@ -168,49 +165,26 @@ class Produto:
         """
         Move o produto para o final da fila de agendamento.
         
+        As posições formam uma sequência crescente: mover para o final é uma
+        única atualização com MAX(posicao_fila) + 1 (resolvido pelo índice
+        idx_fila_posicao), sem renumerar os demais itens da fila.
+        
         Returns:
             bool: True se a operação foi bem-sucedida, False caso contrário
         """
         try:
-            conexao, cursor = self.db.criar_conexao()
-            
-            # Verificar se o produto está na fila
-            cursor.execute("SELECT id FROM fila_agendamento WHERE id_produto = ?", (self.id,))
-            if not cursor.fetchone():
-                conexao.close()
-                return self.adicionar_a_fila()  # Se não estiver na fila, adiciona
-            
-            # Buscar a última posição da fila
-            cursor.execute("SELECT MAX(posicao_fila) as ultima_posicao FROM fila_agendamento")
-            resultado = cursor.fetchone()
-            ultima_posicao = resultado['ultima_posicao'] if resultado and resultado['ultima_posicao'] is not None else 0
-            
-            # Atualizar a posição do produto para o final da fila
-            data_atual = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            cursor.execute('''
-            UPDATE fila_agendamento 
-            SET posicao_fila = ?, ultima_verificacao = ?, verificacao_manual = 0
-            WHERE id_produto = ?
-            ''', (ultima_posicao + 1, data_atual, self.id))
-            
-            # Reorganizar a fila (opcional, mas mantém os números sequenciais)
-            cursor.execute('''
-            SELECT id, id_produto, posicao_fila
-            FROM fila_agendamento
-            ORDER BY posicao_fila
-            ''')
-            
-            produtos_fila = cursor.fetchall()
-            
-            for i, produto in enumerate(produtos_fila, 1):
+            with self.db.transacao() as cursor:
+                # Atualizar a posição do produto para o final da fila
+                data_atual = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
                 cursor.execute('''
-                UPDATE fila_agendamento
-                SET posicao_fila = ?
-                WHERE id = ?
-                ''', (i, produto['id']))
-            
-            conexao.commit()
-            conexao.close()
+                UPDATE fila_agendamento 
+                SET posicao_fila = (SELECT COALESCE(MAX(posicao_fila), 0) + 1 FROM fila_agendamento),
+                    ultima_verificacao = ?, verificacao_manual = 0
+                WHERE id_produto = ?
+                ''', (data_atual, self.id))
+                
+                if cursor.rowcount == 0:
+                    return self.adicionar_a_fila()  # Se não estiver na fila, adiciona
             
             Logger.log(f"Produto ID {self.id} movido para o final da fila", "INFO")
             return True
@@ -227,24 +201,17 @@ class Produto:
             bool: True se a operação foi bem-sucedida, False caso contrário
         """
         try:
-            conexao, cursor = self.db.criar_conexao()
-            
-            # Verificar se o produto está na fila
-            cursor.execute("SELECT id FROM fila_agendamento WHERE id_produto = ?", (self.id,))
-            if not cursor.fetchone():
-                conexao.close()
-                return self.adicionar_a_fila()  # Se não estiver na fila, adiciona
-            
-            # Marcar o produto como verificado manualmente
-            data_atual = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            cursor.execute('''
-            UPDATE fila_agendamento 
-            SET verificacao_manual = 1, ultima_verificacao = ?
-            WHERE id_produto = ?
-            ''', (data_atual, self.id))
-            
-            conexao.commit()
-            conexao.close()
+            with self.db.transacao() as cursor:
+                # Marcar o produto como verificado manualmente
+                data_atual = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                cursor.execute('''
+                UPDATE fila_agendamento 
+                SET verificacao_manual = 1, ultima_verificacao = ?
+                WHERE id_produto = ?
+                ''', (data_atual, self.id))
+                
+                if cursor.rowcount == 0:
+                    return self.adicionar_a_fila()  # Se não estiver na fila, adiciona
             
             Logger.log(f"Produto ID {self.id} removido da fila do dia (verificação manual)", "INFO")
             return True
@@ -326,6 +293,132 @@ class Produto:
             Logger.log(f"Erro ao buscar produto por ID: {e}", "ERROR")
             return None
     
+    @classmethod
+    def de_registro(cls, registro):
+        """
+        Cria um Produto a partir de uma linha com as colunas de 'produtos'.
+        
+        Args:
+            registro (Mapping): Linha do banco ou dicionário equivalente
+            
+        Returns:
+            Produto: Objeto Produto
+        """
+        return cls(
+            id=registro['id'],
+            id_cliente=registro['id_cliente'],
+            nome=registro['nome'],
+            concorrente=registro['concorrente'],
+            url=registro['url'],
+            id_plataforma=registro['id_plataforma'],
+            id_grupo=registro['id_grupo'],
+            data_criacao=registro['data_criacao']
+        )
+    
+    @classmethod
+    def buscar_por_ids(cls, ids_produtos):
+        """
+        Busca vários produtos em uma única consulta.
+        
+        Args:
+            ids_produtos (list): IDs dos produtos
+            
+        Returns:
+            list: Objetos Produto na ordem dos IDs informados (IDs inexistentes são ignorados)
+        """
+        try:
+            ids_produtos = list(ids_produtos)
+            db = DatabaseConnector()
+            conexao, cursor = db.criar_conexao()
+            
+            encontrados = {}
+            # Blocos abaixo do limite de parâmetros do SQLite
+            for inicio in range(0, len(ids_produtos), 500):
+                bloco = ids_produtos[inicio:inicio + 500]
+                cursor.execute(f'''
+                SELECT * FROM produtos WHERE id IN ({', '.join('?' * len(bloco))})
+                ''', bloco)
+                
+                for resultado in cursor.fetchall():
+                    encontrados[resultado['id']] = cls.de_registro(resultado)
+            
+            conexao.close()
+            
+            return [encontrados[id_produto] for id_produto in ids_produtos if id_produto in encontrados]
+            
+        except Exception as e:
+            Logger.log(f"Erro ao buscar produtos por ID: {e}", "ERROR")
+            return []
+    
+    @classmethod
+    def iterar_detalhados(cls, id_usuario=None, nome_cliente=None, limite=None, deslocamento=0,
+                          tamanho_bloco=500):
+        """
+        Percorre os produtos com o nome do cliente e o identificador do grupo
+        em uma única consulta (produtos ⋈ clientes ⋈ grupos), lendo as linhas
+        em blocos para que o consumidor comece antes do fim da consulta.
+        
+        Args:
+            id_usuario (int, optional): Restringe aos clientes dos grupos deste usuário
+                (None = sem restrição, ex.: administradores)
+            nome_cliente (str, optional): Restringe a um cliente
+            limite (int, optional): Número máximo de produtos (paginação)
+            deslocamento (int): Produtos a pular (paginação)
+            tamanho_bloco (int): Linhas lidas do banco por vez
+            
+        Yields:
+            dict: Colunas de 'produtos' mais 'cliente' (nome) e 'grupo' (id_grupo do grupo)
+        """
+        condicoes = []
+        parametros = []
+        
+        if id_usuario is not None:
+            condicoes.append('''p.id_cliente IN (
+                SELECT cg.id_cliente
+                FROM clientes_grupos cg
+                JOIN usuarios_grupos ug ON ug.id_grupo = cg.id_grupo
+                WHERE ug.id_usuario = ?
+            )''')
+            parametros.append(id_usuario)
+        
+        if nome_cliente is not None:
+            condicoes.append("c.nome = ?")
+            parametros.append(nome_cliente)
+        
+        where = f"WHERE {' AND '.join(condicoes)}" if condicoes else ""
+        
+        paginacao = ""
+        if limite is not None or deslocamento:
+            paginacao = "LIMIT ? OFFSET ?"
+            parametros += [-1 if limite is None else limite, deslocamento]
+        
+        db = DatabaseConnector()
+        conexao, _ = db.criar_conexao()
+        # Cursor próprio: o consumidor pode usar a mesma conexão durante a leitura
+        cursor = conexao.cursor()
+        
+        try:
+            cursor.execute(f'''
+            SELECT p.*, c.nome AS cliente, g.id_grupo AS grupo
+            FROM produtos p
+            JOIN clientes c ON c.id = p.id_cliente
+            LEFT JOIN grupos g ON g.id = p.id_grupo
+            {where}
+            ORDER BY c.nome, p.nome, p.id
+            {paginacao}
+            ''', parametros)
+            
+            while True:
+                linhas = cursor.fetchmany(tamanho_bloco)
+                if not linhas:
+                    break
+                for linha in linhas:
+                    yield dict(linha)
+        
+        finally:
+            cursor.close()
+            conexao.close()
+    
     @classmethod
     def listar_por_cliente(cls, id_cliente, id_grupo=None):
         """
@@ -395,6 +488,8 @@ class Produto:
             # Remover registros de histórico de preços
             cursor.execute("DELETE FROM historico_precos WHERE id_produto = ?", (id_produto,))
             
+            cursor.execute("DELETE FROM resumo_precos WHERE id_produto = ?", (id_produto,))
+            
             # Remover da fila de agendamento
             cursor.execute("DELETE FROM fila_agendamento WHERE id_produto = ?", (id_produto,))
             
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Resumo materializado dos preços de cada produto, mantido a cada preço gravado.
+"""
+
+from database.connector import DatabaseConnector
+from models.frequencia_adaptativa import FrequenciaAdaptativa
+from utils.logger import Logger
+
+class ResumoPrecos:
+    # Diferença mínima (em reais) considerada mudança de preço
+    TOLERANCIA_PRECO = FrequenciaAdaptativa.TOLERANCIA_PRECO
+
+    @classmethod
+    def sql_atualizacao(cls):
+        """
+        Comando que incorpora um novo preço ao resumo do produto, sem consultar o
+        histórico: mínimo, máximo, média móvel e contagem são atualizados a partir
+        dos valores atuais. Preços com data anterior ao último registrado entram
+        nas estatísticas sem substituir o preço atual.
+
+        Parâmetros nomeados: id_produto, valor, data ('AAAA-MM-DD') e tolerancia.
+
+        Returns:
+            str: Comando INSERT ... ON CONFLICT
+        """
+        return '''
+        INSERT INTO resumo_precos (id_produto, preco_atual, ultima_data, ultima_alteracao,
+                                   preco_minimo, preco_maximo, preco_medio, total_registros)
+        VALUES (:id_produto, :valor, :data, :data, :valor, :valor, :valor, 1)
+        ON CONFLICT(id_produto) DO UPDATE SET
+            ultima_alteracao = CASE
+                WHEN :data >= ultima_data AND ABS(preco_atual - :valor) >= :tolerancia THEN :data
+                ELSE ultima_alteracao
+            END,
+            preco_atual = CASE WHEN :data >= ultima_data THEN :valor ELSE preco_atual END,
+            ultima_data = MAX(ultima_data, :data),
+            preco_minimo = MIN(preco_minimo, :valor),
+            preco_maximo = MAX(preco_maximo, :valor),
+            preco_medio = preco_medio + (:valor - preco_medio) / (total_registros + 1),
+            total_registros = total_registros + 1
+        '''
+
+    @classmethod
+    def parametros(cls, id_produto, valor, data):
+        """
+        Returns:
+            dict: Parâmetros de sql_atualizacao() para um preço
+        """
+        return {'id_produto': id_produto, 'valor': valor, 'data': data, 'tolerancia': cls.TOLERANCIA_PRECO}
+
+    @classmethod
+    def obter(cls, id_produto):
+        """
+        Lê o resumo de um produto (consulta pela chave primária).
+
+        Args:
+            id_produto (int): ID do produto
+
+        Returns:
+            dict: Colunas de 'resumo_precos' ou None se o produto não tem preços
+        """
+        db = DatabaseConnector()
+        conexao, cursor = db.criar_conexao()
+
+        cursor.execute("SELECT * FROM resumo_precos WHERE id_produto = ?", (id_produto,))
+        resultado = cursor.fetchone()
+        conexao.close()
+
+        return dict(resultado) if resultado else None
+
+    @classmethod
+    def reconstruir(cls, id_produto=None):
+        """
+        Recalcula o resumo a partir do histórico de preços completo.
+
+        Args:
+            id_produto (int, optional): Produto a recalcular (padrão: todos)
+
+        Returns:
+            int: Número de produtos resumidos ou None em caso de erro
+        """
+        filtro = "WHERE id_produto = :id_produto" if id_produto is not None else ""
+
+        try:
+            with DatabaseConnector().transacao(imediata=True) as cursor:
+                cursor.execute(f"DELETE FROM resumo_precos {filtro}", {'id_produto': id_produto})
+
+                # Mudança de preço: registro que difere do anterior (o primeiro conta como mudança)
+                cursor.execute(f'''
+                INSERT INTO resumo_precos (id_produto, preco_atual, ultima_data, ultima_alteracao,
+                                           preco_minimo, preco_maximo, preco_medio, total_registros)
+                SELECT id_produto,
+                       MAX(CASE WHEN ordem = 1 THEN preco END),
+                       MAX(data),
+                       MAX(CASE WHEN anterior IS NULL OR ABS(preco - anterior) >= :tolerancia THEN data END),
+                       MIN(preco), MAX(preco), AVG(preco), COUNT(*)
+                FROM (
+                    SELECT id_produto, preco, data,
+                           LAG(preco) OVER (PARTITION BY id_produto ORDER BY data, id) AS anterior,
+                           ROW_NUMBER() OVER (PARTITION BY id_produto ORDER BY data DESC, id DESC) AS ordem
+                    FROM historico_precos
+                    {filtro}
+                )
+                GROUP BY id_produto
+                ''', {'id_produto': id_produto, 'tolerancia': cls.TOLERANCIA_PRECO})
+
+                total = cursor.rowcount
+
+            Logger.log(f"Resumo de preços reconstruído para {total} produtos", "INFO")
+            return total
+
+        except Exception as e:
+            Logger.log(f"Erro ao reconstruir resumo de preços: {e}", "ERROR")
+            return None
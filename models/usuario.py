@@ -8,6 +8,7 @@ Model que representa um usuário no sistema.
 import hashlib
 from datetime import datetime
 from database.connector import DatabaseConnector
+from models.permissao import PermissoesUsuario
 from utils.logger import Logger
 
 class Usuario:
@@ -85,6 +86,9 @@ class Usuario:
             conexao.commit()
             conexao.close()
             
+            # O tipo do usuário (admin ou não) faz parte das permissões
+            PermissoesUsuario.invalidar(self.username)
+            
             Logger.log(f"Usuário {self.username} salvo com sucesso", "INFO")
             return True
             
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Pool de navegadores Selenium reutilizáveis para extração em sites dinâmicos.
+"""
+
+import atexit
+import queue
+import threading
+from contextlib import contextmanager
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+from webdriver_manager.chrome import ChromeDriverManager
+from utils.logger import Logger
+
+class _NavegadorPool:
+    def __init__(self, driver):
+        self.driver = driver
+        self.paginas = 0
+
+class BrowserPool:
+    # Número máximo de navegadores abertos simultaneamente
+    TAMANHO_MAXIMO = 2
+    # Número de páginas carregadas antes de reciclar o navegador
+    MAX_PAGINAS_POR_NAVEGADOR = 50
+    # Tempo máximo (segundos) de espera explícita pelo seletor
+    TEMPO_MAXIMO_ESPERA = 15
+    # Tempo máximo (segundos) para carregar uma página
+    TEMPO_MAXIMO_CARREGAMENTO = 30
+
+    _instancia = None
+    _lock_instancia = threading.Lock()
+
+    def __init__(self, tamanho_maximo=None, max_paginas=None):
+        self.tamanho_maximo = tamanho_maximo or self.TAMANHO_MAXIMO
+        self.max_paginas = max_paginas or self.MAX_PAGINAS_POR_NAVEGADOR
+        self._ociosos = queue.LifoQueue()
+        self._vagas = threading.BoundedSemaphore(self.tamanho_maximo)
+        self._lock = threading.Lock()
+        self._todos = set()
+        self._caminho_driver = None
+
+    @classmethod
+    def obter_instancia(cls):
+        """
+        Retorna o pool compartilhado pelo processo, criando-o se necessário.
+
+        Returns:
+            BrowserPool: Instância compartilhada do pool
+        """
+        with cls._lock_instancia:
+            if cls._instancia is None:
+                cls._instancia = cls()
+                atexit.register(cls._instancia.fechar_todos)
+            return cls._instancia
+
+    def _obter_caminho_driver(self):
+        """
+        Resolve o caminho do ChromeDriver uma única vez por processo.
+
+        Returns:
+            str: Caminho do executável do ChromeDriver
+        """
+        with self._lock:
+            if self._caminho_driver is None:
+                self._caminho_driver = ChromeDriverManager().install()
+            return self._caminho_driver
+
+    def _criar_navegador(self):
+        """
+        Inicia uma nova instância headless do Chrome.
+
+        Returns:
+            _NavegadorPool: Navegador pronto para uso
+        """
+        chrome_options = Options()
+        chrome_options.add_argument("--headless")  # Executa sem interface gráfica
+        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        # Não espera recursos secundários (imagens, fontes) para liberar o driver.get
+        chrome_options.page_load_strategy = 'eager'
+
+        driver = webdriver.Chrome(service=Service(self._obter_caminho_driver()), options=chrome_options)
+        driver.set_page_load_timeout(self.TEMPO_MAXIMO_CARREGAMENTO)
+
+        navegador = _NavegadorPool(driver)
+        with self._lock:
+            self._todos.add(navegador)
+
+        Logger.log("Novo navegador adicionado ao pool", "INFO")
+        return navegador
+
+    def _esta_saudavel(self, navegador):
+        """
+        Verifica se o navegador ainda responde a comandos.
+
+        Args:
+            navegador (_NavegadorPool): Navegador a ser verificado
+
+        Returns:
+            bool: True se o navegador está operacional, False caso contrário
+        """
+        try:
+            navegador.driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    def _descartar(self, navegador):
+        """
+        Encerra um navegador e libera sua vaga no pool.
+
+        Args:
+            navegador (_NavegadorPool): Navegador a ser descartado
+        """
+        with self._lock:
+            self._todos.discard(navegador)
+        try:
+            navegador.driver.quit()
+        except Exception as e:
+            Logger.log(f"Erro ao encerrar navegador do pool: {e}", "WARNING")
+        finally:
+            self._vagas.release()
+
+    def adquirir(self):
+        """
+        Obtém um navegador do pool, reutilizando um ocioso quando possível.
+
+        Returns:
+            _NavegadorPool: Navegador reservado para o chamador
+        """
+        while True:
+            try:
+                navegador = self._ociosos.get_nowait()
+            except queue.Empty:
+                # Abre um novo navegador se houver vaga; caso contrário aguarda devolução
+                if self._vagas.acquire(blocking=False):
+                    try:
+                        return self._criar_navegador()
+                    except Exception:
+                        self._vagas.release()
+                        raise
+
+                try:
+                    navegador = self._ociosos.get(timeout=self.TEMPO_MAXIMO_CARREGAMENTO)
+                except queue.Empty:
+                    continue
+
+            if self._esta_saudavel(navegador):
+                return navegador
+
+            Logger.log("Navegador do pool não respondeu e será substituído", "WARNING")
+            self._descartar(navegador)
+
+    def devolver(self, navegador):
+        """
+        Devolve um navegador ao pool, reciclando-o após o limite de páginas.
+
+        Args:
+            navegador (_NavegadorPool): Navegador a ser devolvido
+        """
+        navegador.paginas += 1
+
+        if navegador.paginas >= self.max_paginas or not self._esta_saudavel(navegador):
+            self._descartar(navegador)
+            return
+
+        self._ociosos.put(navegador)
+
+    @contextmanager
+    def navegador(self):
+        """
+        Context manager que reserva um WebDriver e o devolve ao final.
+
+        Yields:
+            WebDriver: Driver pronto para navegar
+        """
+        navegador = self.adquirir()
+        try:
+            yield navegador.driver
+        finally:
+            self.devolver(navegador)
+
+    def fechar_todos(self):
+        """
+        Encerra todos os navegadores ociosos do pool.
+        """
+        while True:
+            try:
+                navegador = self._ociosos.get_nowait()
+            except queue.Empty:
+                break
+            self._descartar(navegador)
@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Cache HTTP em disco com requisições condicionais (ETag/Last-Modified).
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from utils.logger import Logger
+
+class CacheHTTP:
+    # Diretório onde as respostas são armazenadas
+    DIRETORIO = 'cache_http'
+    # Tempo (segundos) em que uma resposta armazenada é reutilizada sem consultar o site
+    TTL_SEGUNDOS = int(os.environ.get('MONITOR_PRECOS_CACHE_TTL', 3600))
+    # Limite (MB de texto) das respostas memorizadas na execução; as menos usadas saem
+    # primeiro e, se necessárias de novo, são lidas do disco
+    LIMITE_MEMORIA_MB = float(os.environ.get('MONITOR_PRECOS_CACHE_MEMORIA_MB', 64))
+    # Idade máxima (segundos) de uma resposta em disco; depois dela não vale mais revalidar
+    IDADE_MAXIMA_SEGUNDOS = int(os.environ.get('MONITOR_PRECOS_CACHE_IDADE_MAXIMA', 7 * 24 * 3600))
+    # Limite (MB) do cache em disco; acima dele as respostas mais antigas são removidas
+    LIMITE_DISCO_MB = float(os.environ.get('MONITOR_PRECOS_CACHE_DISCO_MB', 500))
+    # Intervalo mínimo (segundos) entre duas podas automáticas ao final das execuções
+    INTERVALO_PODA = 3600
+
+    _instancia = None
+    _lock_instancia = threading.Lock()
+
+    def __init__(self, diretorio=None, ttl=None):
+        self.diretorio = diretorio or self.DIRETORIO
+        self.ttl = self.TTL_SEGUNDOS if ttl is None else ttl
+        # Respostas já obtidas na execução atual: url -> (status, texto), em ordem de uso;
+        # só há memorização enquanto alguma execução estiver ativa
+        self._memoria = OrderedDict()
+        self._execucoes_ativas = 0
+        self._tamanho_memoria = 0
+        self.limite_memoria = int(self.LIMITE_MEMORIA_MB * 1024 * 1024)
+        # Locks das URLs em download: url -> [lock, threads que o usam]
+        self._locks_url = {}
+        self._lock = threading.Lock()
+        self._ultima_poda = 0
+
+    @classmethod
+    def obter_instancia(cls):
+        """
+        Retorna o cache compartilhado pelo processo.
+
+        Returns:
+            CacheHTTP: Instância compartilhada
+        """
+        with cls._lock_instancia:
+            if cls._instancia is None:
+                cls._instancia = cls()
+            return cls._instancia
+
+    def iniciar_execucao(self):
+        """
+        Descarta as respostas memorizadas da execução anterior e passa a memorizar
+        as novas até encerrar_execucao. O cache em disco é mantido.
+        """
+        with self._lock:
+            self._memoria = OrderedDict()
+            self._tamanho_memoria = 0
+            self._execucoes_ativas += 1
+
+    def descartar(self, urls):
+        """
+        Remove da memória as respostas de URLs que não serão mais consultadas.
+
+        Args:
+            urls (iterable): URLs a descartar
+        """
+        with self._lock:
+            for url in urls:
+                resposta = self._memoria.pop(url, None)
+                if resposta is not None:
+                    self._tamanho_memoria -= len(resposta[1] or '')
+
+    def encerrar_execucao(self):
+        """
+        Libera as respostas memorizadas ao final de uma execução, sem esperar a próxima,
+        e poda o cache em disco (no máximo uma vez a cada INTERVALO_PODA). Fora de uma
+        execução (testes de seletor, cadastro de produto) nada é memorizado, para que
+        essas consultas não recebam páginas antigas.
+        """
+        with self._lock:
+            self._execucoes_ativas = max(0, self._execucoes_ativas - 1)
+            if not self._execucoes_ativas:
+                self._memoria = OrderedDict()
+                self._tamanho_memoria = 0
+
+            if time.time() - self._ultima_poda < self.INTERVALO_PODA:
+                return
+            self._ultima_poda = time.time()
+
+        self.podar()
+
+    @contextmanager
+    def bloqueio(self, url):
+        """
+        Bloqueia a URL, para que requisições simultâneas à mesma URL aguardem
+        a primeira em vez de repetirem o download. O lock é descartado quando
+        nenhuma thread o utiliza mais.
+
+        Args:
+            url (str): URL da página
+        """
+        with self._lock:
+            entrada = self._locks_url.setdefault(url, [threading.Lock(), 0])
+            entrada[1] += 1
+
+        try:
+            with entrada[0]:
+                yield
+        finally:
+            with self._lock:
+                entrada[1] -= 1
+                if entrada[1] == 0:
+                    del self._locks_url[url]
+
+    def _caminho(self, url):
+        chave = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.diretorio, chave[:2], f"{chave}.json")
+
+    def _ler(self, url):
+        """
+        Lê a entrada em disco de uma URL.
+
+        Args:
+            url (str): URL da página
+
+        Returns:
+            dict: Entrada armazenada ou None se ausente/ilegível
+        """
+        try:
+            with open(self._caminho(url), 'r', encoding='utf-8') as arquivo:
+                entrada = json.load(arquivo)
+            return entrada if entrada.get('url') == url else None
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            Logger.log(f"Entrada de cache ilegível para {url}: {e}", "WARNING")
+            return None
+
+    def _escrever(self, entrada):
+        caminho = self._caminho(entrada['url'])
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+
+        # Escrita atômica: grava em arquivo temporário e substitui
+        temporario = f"{caminho}.{threading.get_ident()}.tmp"
+        with open(temporario, 'w', encoding='utf-8') as arquivo:
+            json.dump(entrada, arquivo, ensure_ascii=False)
+        os.replace(temporario, caminho)
+
+    def obter_memorizado(self, url):
+        """
+        Retorna a resposta já obtida para a URL nesta execução.
+
+        Args:
+            url (str): URL da página
+
+        Returns:
+            tuple: (status, texto) ou None se a URL ainda não foi consultada
+        """
+        with self._lock:
+            resposta = self._memoria.get(url)
+            if resposta is not None:
+                self._memoria.move_to_end(url)
+            return resposta
+
+    def memorizar(self, url, status, texto):
+        """
+        Guarda a resposta da URL para as demais consultas desta execução
+        (ignorada se nenhuma execução estiver ativa).
+
+        Args:
+            url (str): URL da página
+            status (int): Código HTTP
+            texto (str): Corpo da resposta
+        """
+        tamanho = len(texto or '')
+        if tamanho > self.limite_memoria:
+            return
+
+        with self._lock:
+            if not self._execucoes_ativas:
+                return
+
+            anterior = self._memoria.pop(url, None)
+            if anterior is not None:
+                self._tamanho_memoria -= len(anterior[1] or '')
+
+            self._memoria[url] = (status, texto)
+            self._tamanho_memoria += tamanho
+
+            while self._tamanho_memoria > self.limite_memoria:
+                _, (_, removido) = self._memoria.popitem(last=False)
+                self._tamanho_memoria -= len(removido or '')
+
+    def obter_valido(self, url):
+        """
+        Retorna o corpo armazenado em disco se ele ainda estiver dentro do TTL.
+
+        Args:
+            url (str): URL da página
+
+        Returns:
+            str: Corpo da página ou None se ausente/expirado
+        """
+        if self.ttl <= 0:
+            return None
+
+        entrada = self._ler(url)
+        if entrada and time.time() - entrada.get('armazenado_em', 0) < self.ttl:
+            return entrada['texto']
+        return None
+
+    def cabecalhos_condicionais(self, url):
+        """
+        Monta os cabeçalhos If-None-Match/If-Modified-Since para revalidar a URL.
+
+        Args:
+            url (str): URL da página
+
+        Returns:
+            dict: Cabeçalhos condicionais (vazio se não houver entrada em disco)
+        """
+        entrada = self._ler(url)
+        cabecalhos = {}
+
+        if entrada:
+            if entrada.get('etag'):
+                cabecalhos['If-None-Match'] = entrada['etag']
+            if entrada.get('last_modified'):
+                cabecalhos['If-Modified-Since'] = entrada['last_modified']
+
+        return cabecalhos
+
+    def revalidar(self, url):
+        """
+        Renova a validade da entrada após uma resposta 304.
+
+        Args:
+            url (str): URL da página
+
+        Returns:
+            str: Corpo armazenado ou None se a entrada não existir mais
+        """
+        entrada = self._ler(url)
+        if not entrada:
+            return None
+
+        entrada['armazenado_em'] = time.time()
+        try:
+            self._escrever(entrada)
+        except Exception as e:
+            Logger.log(f"Erro ao atualizar cache de {url}: {e}", "WARNING")
+
+        return entrada['texto']
+
+    def armazenar(self, url, response):
+        """
+        Armazena em disco uma resposta 200 com seus validadores.
+
+        Args:
+            url (str): URL da página
+            response (Response): Resposta HTTP
+
+        Returns:
+            bool: True se a resposta foi armazenada, False caso contrário
+        """
+        return self.armazenar_texto(url, response.text, response.headers)
+
+    def armazenar_texto(self, url, texto, cabecalhos):
+        """
+        Armazena em disco o corpo de uma resposta 200 com seus validadores.
+
+        Args:
+            url (str): URL da página
+            texto (str): Corpo da resposta
+            cabecalhos (Mapping): Cabeçalhos da resposta
+
+        Returns:
+            bool: True se a resposta foi armazenada, False caso contrário
+        """
+        cache_control = (cabecalhos.get('Cache-Control') or '').lower()
+        if 'no-store' in cache_control:
+            return False
+
+        try:
+            self._escrever({
+                'url': url,
+                'etag': cabecalhos.get('ETag'),
+                'last_modified': cabecalhos.get('Last-Modified'),
+                'armazenado_em': time.time(),
+                'texto': texto
+            })
+            return True
+        except Exception as e:
+            Logger.log(f"Erro ao gravar cache de {url}: {e}", "WARNING")
+            return False
+
+    def podar(self):
+        """
+        Remove do disco as respostas mais antigas que IDADE_MAXIMA_SEGUNDOS e, se o
+        cache ainda passar de LIMITE_DISCO_MB, as mais antigas até voltar ao limite.
+
+        Returns:
+            int: Número de entradas removidas
+        """
+        limite_idade = time.time() - self.IDADE_MAXIMA_SEGUNDOS
+        limite_disco = int(self.LIMITE_DISCO_MB * 1024 * 1024)
+        removidos = 0
+        restantes = []
+
+        for raiz, _, arquivos in os.walk(self.diretorio):
+            for nome in arquivos:
+                caminho = os.path.join(raiz, nome)
+                try:
+                    estado = os.stat(caminho)
+                    if estado.st_mtime < limite_idade:
+                        os.remove(caminho)
+                        removidos += 1
+                    else:
+                        restantes.append((estado.st_mtime, estado.st_size, caminho))
+                except OSError as e:
+                    Logger.log(f"Erro ao podar {nome} do cache: {e}", "WARNING")
+
+        tamanho_total = sum(tamanho for _, tamanho, _ in restantes)
+        if tamanho_total > limite_disco:
+            restantes.sort()
+            for _, tamanho, caminho in restantes:
+                if tamanho_total <= limite_disco:
+                    break
+                try:
+                    os.remove(caminho)
+                    removidos += 1
+                    tamanho_total -= tamanho
+                except OSError as e:
+                    Logger.log(f"Erro ao podar {os.path.basename(caminho)} do cache: {e}", "WARNING")
+
+        if removidos:
+            Logger.log(f"Cache HTTP podado: {removidos} respostas antigas removidas", "INFO")
+
+        return removidos
+
+    def limpar(self):
+        """
+        Remove todas as respostas armazenadas em disco e em memória.
+
+        Returns:
+            int: Número de entradas removidas
+        """
+        with self._lock:
+            self._memoria = OrderedDict()
+            self._tamanho_memoria = 0
+        removidos = 0
+
+        for raiz, _, arquivos in os.walk(self.diretorio):
+            for nome in arquivos:
+                try:
+                    os.remove(os.path.join(raiz, nome))
+                    removidos += 1
+                except OSError as e:
+                    Logger.log(f"Erro ao remover {nome} do cache: {e}", "WARNING")
+
+        return removidos
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Extração de preços a partir de dados estruturados (JSON-LD, microdata e OpenGraph).
+"""
+
+import json
+import re
+
+class ExtratorDadosEstruturados:
+    # Blocos <script type="application/ld+json">
+    PADRAO_JSON_LD = re.compile(
+        r'<script[^>]+type\s*=\s*["\']application/ld\+json["\'][^>]*>(.*?)</script>',
+        re.IGNORECASE | re.DOTALL
+    )
+    # Tags com itemprop="price" (microdata)
+    PADRAO_ITEMPROP = re.compile(
+        r'<[a-z]+[^>]*\bitemprop\s*=\s*["\']price["\'][^>]*>([^<]*)',
+        re.IGNORECASE
+    )
+    # Meta tags og:price:amount / product:price:amount
+    PADRAO_OPENGRAPH = re.compile(
+        r'<meta[^>]+property\s*=\s*["\'](?:og|product):price:amount["\'][^>]*>',
+        re.IGNORECASE
+    )
+    PADRAO_CONTENT = re.compile(r'\bcontent\s*=\s*["\']([^"\']*)["\']', re.IGNORECASE)
+    # Abertura do elemento que delimita o produto principal (itemtype=".../Product")
+    PADRAO_ESCOPO_PRODUTO = re.compile(
+        r'<([a-z][a-z0-9]*)[^>]*\bitemtype\s*=\s*["\'][^"\']*schema\.org/Product["\'][^>]*>',
+        re.IGNORECASE
+    )
+
+    TIPOS_OFERTA = ('Offer', 'AggregateOffer')
+
+    # Fontes de dados estruturados, na ordem de busca
+    FONTES = ('json_ld', 'microdata', 'opengraph')
+    # Fontes menos confiáveis que um seletor CSS configurado para o domínio
+    # (microdata e OpenGraph costumam marcar também produtos relacionados)
+    FONTES_SECUNDARIAS = ('microdata', 'opengraph')
+
+    @classmethod
+    def extrair(cls, html, fontes=None):
+        """
+        Procura o preço do produto nos dados estruturados da página, sem montar o DOM.
+        A ordem de busca é JSON-LD, microdata e OpenGraph.
+
+        Args:
+            html (str): Documento HTML
+            fontes (tuple, optional): Fontes consultadas, entre as de FONTES (padrão: todas)
+
+        Returns:
+            str: Preço encontrado (ex.: "1299.90") ou None se a página não o declara
+        """
+        if not html:
+            return None
+
+        extratores = {
+            'json_ld': cls._extrair_json_ld,
+            'microdata': cls._extrair_itemprop,
+            'opengraph': cls._extrair_opengraph
+        }
+
+        for fonte in fontes or cls.FONTES:
+            preco = extratores[fonte](html)
+            if preco:
+                return preco
+
+        return None
+
+    @classmethod
+    def fontes_prioritarias(cls, seletor_css=None):
+        """
+        Fontes consultadas antes do seletor CSS: com um seletor configurado,
+        só o JSON-LD tem precedência; microdata e OpenGraph ficam para depois.
+
+        Args:
+            seletor_css (str, optional): Seletor configurado para a página
+
+        Returns:
+            tuple: Fontes a consultar antes do seletor
+        """
+        if not seletor_css:
+            return cls.FONTES
+        return tuple(fonte for fonte in cls.FONTES if fonte not in cls.FONTES_SECUNDARIAS)
+
+    @classmethod
+    def _extrair_json_ld(cls, html):
+        for bloco in cls.PADRAO_JSON_LD.findall(html):
+            try:
+                dados = json.loads(bloco.strip())
+            except ValueError:
+                continue
+
+            preco = cls._buscar_oferta(dados)
+            if preco:
+                return preco
+
+        return None
+
+    @classmethod
+    def _buscar_oferta(cls, dados):
+        """
+        Percorre a estrutura JSON-LD em busca do preço da primeira oferta.
+
+        Args:
+            dados (dict|list): Conteúdo de um bloco JSON-LD
+
+        Returns:
+            str: Preço da oferta ou None se não encontrado
+        """
+        if isinstance(dados, list):
+            for item in dados:
+                preco = cls._buscar_oferta(item)
+                if preco:
+                    return preco
+            return None
+
+        if not isinstance(dados, dict):
+            return None
+
+        tipos = dados.get('@type')
+        tipos = tipos if isinstance(tipos, list) else [tipos]
+
+        if any(tipo in cls.TIPOS_OFERTA for tipo in tipos):
+            for campo in ('price', 'lowPrice'):
+                if dados.get(campo) not in (None, ''):
+                    return str(dados[campo])
+
+            especificacao = dados.get('priceSpecification')
+            preco = cls._buscar_oferta({'@type': 'Offer', **especificacao}) if isinstance(especificacao, dict) else None
+            if preco:
+                return preco
+
+        # Product.offers, @graph e demais estruturas aninhadas
+        for chave in ('offers', '@graph', 'mainEntity', 'itemOffered'):
+            if chave in dados:
+                preco = cls._buscar_oferta(dados[chave])
+                if preco:
+                    return preco
+
+        return None
+
+    @classmethod
+    def _escopo_produto(cls, html):
+        """
+        Delimita o elemento do produto principal (o primeiro itemtype Product),
+        para que preços de produtos relacionados não sejam considerados.
+
+        Args:
+            html (str): Documento HTML
+
+        Returns:
+            tuple: (inicio, fim) do escopo, ou (0, len(html)) se a página não declara o produto
+        """
+        abertura = cls.PADRAO_ESCOPO_PRODUTO.search(html)
+        if not abertura:
+            return 0, len(html)
+
+        inicio = abertura.end()
+        fim = len(html)
+
+        # Outro produto marcado depois deste (relacionado ou aninhado) encerra o escopo
+        seguinte = cls.PADRAO_ESCOPO_PRODUTO.search(html, inicio)
+        if seguinte:
+            fim = seguinte.start()
+
+        # Fechamento do elemento, contando as tags de mesmo nome abertas dentro dele
+        tags = re.compile(rf'<(/?){abertura.group(1)}\b[^>]*>', re.IGNORECASE)
+        profundidade = 1
+        for tag in tags.finditer(html, inicio, fim):
+            profundidade += -1 if tag.group(1) else 1
+            if profundidade == 0:
+                fim = tag.start()
+                break
+
+        return inicio, fim
+
+    @classmethod
+    def _extrair_itemprop(cls, html):
+        inicio, fim = cls._escopo_produto(html)
+        for resultado in cls.PADRAO_ITEMPROP.finditer(html, inicio, fim):
+            conteudo = cls.PADRAO_CONTENT.search(resultado.group(0))
+            preco = conteudo.group(1) if conteudo else resultado.group(1)
+            if preco.strip():
+                return preco.strip()
+
+        return None
+
+    @classmethod
+    def _extrair_opengraph(cls, html):
+        for resultado in cls.PADRAO_OPENGRAPH.finditer(html):
+            conteudo = cls.PADRAO_CONTENT.search(resultado.group(0))
+            if conteudo and conteudo.group(1).strip():
+                return conteudo.group(1).strip()
+
+        return None
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Memória, por domínio, do método de extração (requests ou Selenium) que funciona.
+"""
+
+import threading
+from datetime import datetime
+from database.connector import DatabaseConnector
+from utils.logger import Logger
+
+class EstrategiasDominio:
+    REQUESTS = 'requests'
+    SELENIUM = 'selenium'
+
+    # Domínios roteados para o Selenium voltam a testar o requests a cada N extrações
+    SONDAGEM_A_CADA = 20
+
+    _instancia = None
+    _lock_instancia = threading.Lock()
+
+    def __init__(self):
+        self.db = DatabaseConnector()
+        self._estados = None
+        self._alterados = set()
+        self._lock = threading.Lock()
+        self._lock_carga = threading.Lock()
+
+    @classmethod
+    def obter_instancia(cls):
+        """
+        Retorna o registro de estratégias compartilhado pelo processo.
+
+        Returns:
+            EstrategiasDominio: Instância compartilhada
+        """
+        with cls._lock_instancia:
+            if cls._instancia is None:
+                cls._instancia = cls()
+            return cls._instancia
+
+    def carregar(self):
+        """
+        Carrega as estratégias gravadas em 'estrategias_dominio'.
+
+        Returns:
+            bool: True se a carga foi bem-sucedida, False caso contrário
+        """
+        try:
+            conexao, cursor = self.db.criar_conexao()
+            cursor.execute("SELECT * FROM estrategias_dominio")
+            estados = {resultado['dominio']: dict(resultado) for resultado in cursor.fetchall()}
+            conexao.close()
+
+            with self._lock:
+                self._estados = estados
+                self._alterados = set()
+            return True
+
+        except Exception as e:
+            Logger.log(f"Erro ao carregar estratégias por domínio: {e}", "ERROR")
+            with self._lock:
+                self._estados = {}
+            return False
+
+    def _garantir_carregado(self):
+        if self._estados is None:
+            with self._lock_carga:
+                if self._estados is None:
+                    self.carregar()
+
+    def _estado(self, dominio):
+        estado = self._estados.get(dominio)
+        if estado is None:
+            estado = {
+                'dominio': dominio,
+                'estrategia': self.REQUESTS,
+                'sucessos_requests': 0,
+                'falhas_requests': 0,
+                'sucessos_selenium': 0,
+                'falhas_selenium': 0,
+                'extracoes_desde_sondagem': 0,
+                'data_atualizacao': None
+            }
+            self._estados[dominio] = estado
+        return estado
+
+    def estrategia_atual(self, dominio):
+        """
+        Consulta a estratégia registrada para o domínio, sem contar como extração.
+
+        Args:
+            dominio (str): Domínio da URL
+
+        Returns:
+            str: 'requests' ou 'selenium'
+        """
+        self._garantir_carregado()
+
+        with self._lock:
+            estado = self._estados.get(dominio)
+            return estado['estrategia'] if estado else self.REQUESTS
+
+    def escolher(self, dominio):
+        """
+        Indica o método a tentar primeiro para o domínio.
+
+        Args:
+            dominio (str): Domínio da URL
+
+        Returns:
+            str: 'requests' ou 'selenium'
+        """
+        self._garantir_carregado()
+
+        with self._lock:
+            estado = self._estado(dominio)
+
+            if estado['estrategia'] != self.SELENIUM:
+                return self.REQUESTS
+
+            # Sondagem periódica: o site pode ter deixado de exigir JavaScript
+            estado['extracoes_desde_sondagem'] += 1
+            self._alterados.add(dominio)
+            if estado['extracoes_desde_sondagem'] >= self.SONDAGEM_A_CADA:
+                estado['extracoes_desde_sondagem'] = 0
+                return self.REQUESTS
+
+            return self.SELENIUM
+
+    def registrar(self, dominio, metodo, sucesso):
+        """
+        Registra o resultado de uma tentativa de extração e ajusta a estratégia do domínio.
+
+        Args:
+            dominio (str): Domínio da URL
+            metodo (str): 'requests' ou 'selenium'
+            sucesso (bool): Se o preço foi extraído
+        """
+        self._garantir_carregado()
+
+        with self._lock:
+            estado = self._estado(dominio)
+            estado[f"{'sucessos' if sucesso else 'falhas'}_{metodo}"] += 1
+
+            anterior = estado['estrategia']
+            if sucesso:
+                # O método que funcionou passa a ser o preferido
+                estado['estrategia'] = metodo
+
+            estado['data_atualizacao'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            self._alterados.add(dominio)
+
+        if sucesso and anterior != metodo:
+            Logger.log(f"Estratégia de extração de {dominio} alterada de '{anterior}' para '{metodo}'", "INFO")
+
+    def salvar(self):
+        """
+        Grava no banco as estratégias alteradas desde a última gravação.
+
+        Returns:
+            bool: True se a gravação foi bem-sucedida, False caso contrário
+        """
+        with self._lock:
+            if not self._alterados:
+                return True
+            linhas = [dict(self._estados[dominio]) for dominio in self._alterados]
+            self._alterados = set()
+
+        try:
+            with self.db.transacao() as cursor:
+                cursor.executemany('''
+                INSERT INTO estrategias_dominio (dominio, estrategia, sucessos_requests, falhas_requests,
+                                                 sucessos_selenium, falhas_selenium,
+                                                 extracoes_desde_sondagem, data_atualizacao)
+                VALUES (:dominio, :estrategia, :sucessos_requests, :falhas_requests,
+                        :sucessos_selenium, :falhas_selenium, :extracoes_desde_sondagem, :data_atualizacao)
+                ON CONFLICT(dominio) DO UPDATE SET
+                    estrategia = excluded.estrategia,
+                    sucessos_requests = excluded.sucessos_requests,
+                    falhas_requests = excluded.falhas_requests,
+                    sucessos_selenium = excluded.sucessos_selenium,
+                    falhas_selenium = excluded.falhas_selenium,
+                    extracoes_desde_sondagem = excluded.extracoes_desde_sondagem,
+                    data_atualizacao = excluded.data_atualizacao
+                ''', linhas)
+            return True
+
+        except Exception as e:
+            Logger.log(f"Erro ao salvar estratégias por domínio: {e}", "ERROR")
+            with self._lock:
+                self._alterados.update(linha['dominio'] for linha in linhas)
+            return False
+
+    def listar(self):
+        """
+        Lista as estratégias e estatísticas por domínio, incluindo alterações ainda não gravadas.
+
+        Returns:
+            list: Dicionários com os dados de cada domínio, ordenados pelo nome
+        """
+        self._garantir_carregado()
+
+        with self._lock:
+            return [dict(estado) for _, estado in sorted(self._estados.items())]
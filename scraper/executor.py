@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Módulo de execução concorrente das verificações de preço.
+"""
+
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from scraper.politica_dominios import ControladorDominios
+from utils.logger import Logger
+
+class ExecutorConcorrente:
+    # Limites padrão de concorrência
+    MAX_WORKERS = 8
+    MAX_POR_DOMINIO = 2
+
+    def __init__(self, max_workers=None, max_por_dominio=None, controlador=None):
+        self.max_workers = max(1, max_workers or self.MAX_WORKERS)
+        self.max_por_dominio = max(1, max_por_dominio or self.MAX_POR_DOMINIO)
+        self.controlador = controlador or ControladorDominios.obter_instancia()
+
+    def _limite_dominio(self, dominio):
+        """
+        Retorna quantas tarefas do domínio podem rodar ao mesmo tempo.
+
+        Um domínio em recuo (429/503, lentidão) recebe uma requisição por vez: as
+        demais só esperariam o intervalo dele ocupando threads de outros domínios.
+
+        Args:
+            dominio (str): Domínio dos itens
+
+        Returns:
+            int: Limite de tarefas simultâneas do domínio
+        """
+        return 1 if self.controlador.esta_em_recuo(dominio) else self.max_por_dominio
+
+    @staticmethod
+    def intercalar_por_dominio(itens, obter_dominio):
+        """
+        Reordena os itens em rodízio entre domínios, mantendo a ordem dentro de cada domínio.
+        Exemplo: [a1, a2, a3, b1, c1] -> [a1, b1, c1, a2, a3]
+
+        Args:
+            itens (list): Itens a serem reordenados
+            obter_dominio (callable): Função que retorna o domínio de um item
+
+        Returns:
+            list: Itens intercalados por domínio
+        """
+        grupos = OrderedDict()
+        for item in itens:
+            grupos.setdefault(obter_dominio(item), deque()).append(item)
+
+        intercalados = []
+        while grupos:
+            for dominio in list(grupos.keys()):
+                intercalados.append(grupos[dominio].popleft())
+                if not grupos[dominio]:
+                    del grupos[dominio]
+
+        return intercalados
+
+    def executar(self, itens, funcao, obter_dominio):
+        """
+        Executa uma função para cada item usando um pool limitado de threads.
+
+        O despacho é feito em rodízio entre os domínios, respeitando o limite
+        global de workers e o limite de requisições simultâneas por domínio (uma
+        só para domínios em recuo). Itens de um domínio saturado aguardam na fila
+        sem ocupar threads.
+
+        Args:
+            itens (list): Itens a serem processados
+            funcao (callable): Função chamada com cada item
+            obter_dominio (callable): Função que retorna o domínio de um item
+
+        Returns:
+            list: Lista de tuplas (item, resultado) na ordem de conclusão.
+                  O resultado é None quando a função lança uma exceção.
+        """
+        # Agrupar itens por domínio mantendo a ordem original
+        pendentes = OrderedDict()
+        for item in itens:
+            pendentes.setdefault(obter_dominio(item), deque()).append(item)
+
+        em_execucao = {}
+        ativos_por_dominio = {dominio: 0 for dominio in pendentes}
+        resultados = []
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while pendentes or em_execucao:
+                # Despachar em rodízio enquanto houver capacidade
+                despachou = True
+                while despachou and len(em_execucao) < self.max_workers:
+                    despachou = False
+                    for dominio in list(pendentes.keys()):
+                        if len(em_execucao) >= self.max_workers:
+                            break
+                        if ativos_por_dominio[dominio] >= self._limite_dominio(dominio):
+                            continue
+
+                        item = pendentes[dominio].popleft()
+                        if not pendentes[dominio]:
+                            del pendentes[dominio]
+
+                        futuro = pool.submit(funcao, item)
+                        em_execucao[futuro] = (dominio, item)
+                        ativos_por_dominio[dominio] += 1
+                        despachou = True
+
+                if not em_execucao:
+                    break
+
+                # Aguardar a conclusão de pelo menos uma tarefa
+                concluidos, _ = wait(list(em_execucao.keys()), return_when=FIRST_COMPLETED)
+
+                for futuro in concluidos:
+                    dominio, item = em_execucao.pop(futuro)
+                    ativos_por_dominio[dominio] -= 1
+
+                    try:
+                        resultados.append((item, futuro.result()))
+                    except Exception as e:
+                        Logger.log(f"Erro em tarefa concorrente ({dominio}): {e}", "ERROR")
+                        resultados.append((item, None))
+
+        return resultados
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Download assíncrono de páginas com um cliente HTTP de longa duração por execução.
+"""
+
+import asyncio
+import os
+import random
+import time
+from scraper.cache_http import CacheHTTP
+from scraper.price_scraper import PriceScraper
+from scraper.politica_dominios import ControladorDominios
+from utils.logger import Logger
+
+# Clientes HTTP assíncronos opcionais: httpx (preferido) ou aiohttp
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+try:
+    import h2  # noqa: F401 - habilita HTTP/2 no httpx
+    _HTTP2_DISPONIVEL = True
+except ImportError:
+    _HTTP2_DISPONIVEL = False
+
+class FetcherAssincrono:
+    # Tempo máximo (segundos) para estabelecer a conexão
+    TIMEOUT_CONEXAO = 10
+    # Tempo máximo (segundos) de cada requisição
+    TIMEOUT_TOTAL = 30
+    # Conexões abertas simultaneamente no total e por host
+    MAX_CONEXOES = 100
+    MAX_CONEXOES_POR_HOST = 4
+    # Produtos cujas páginas são baixadas antecipadamente por vez; só a janela em
+    # processamento e a seguinte ficam em memória
+    JANELA = int(os.environ.get('MONITOR_PRECOS_JANELA_ASYNC', 200))
+
+    def __init__(self, timeout_conexao=None, timeout_total=None, max_conexoes=None, max_por_host=None):
+        self.timeout_conexao = timeout_conexao or self.TIMEOUT_CONEXAO
+        self.timeout_total = timeout_total or self.TIMEOUT_TOTAL
+        self.max_conexoes = max_conexoes or self.MAX_CONEXOES
+        self.max_por_host = max_por_host or self.MAX_CONEXOES_POR_HOST
+        self.cache = CacheHTTP.obter_instancia()
+        self.controlador = ControladorDominios.obter_instancia()
+
+    @staticmethod
+    def backend():
+        """
+        Indica o cliente HTTP assíncrono instalado.
+
+        Returns:
+            str: 'httpx', 'aiohttp' ou None se nenhum estiver disponível
+        """
+        if httpx is not None:
+            return 'httpx'
+        if aiohttp is not None:
+            return 'aiohttp'
+        return None
+
+    @classmethod
+    def disponivel(cls):
+        """
+        Returns:
+            bool: True se há um cliente HTTP assíncrono instalado
+        """
+        return cls.backend() is not None
+
+    def baixar_paginas(self, urls):
+        """
+        Baixa as URLs de forma assíncrona e memoriza as respostas no CacheHTTP,
+        onde o PriceScraper as encontra sem nova requisição.
+
+        Args:
+            urls (iterable): URLs a baixar (duplicatas são ignoradas)
+
+        Returns:
+            int: Número de URLs obtidas (da rede ou do cache)
+        """
+        if not self.disponivel():
+            Logger.log("Nenhum cliente HTTP assíncrono instalado (httpx ou aiohttp)", "WARNING")
+            return 0
+
+        urls = list(dict.fromkeys(urls))
+        if not urls:
+            return 0
+
+        inicio = time.monotonic()
+        obtidas = asyncio.run(self._baixar_todas(urls))
+
+        Logger.log(f"{obtidas}/{len(urls)} páginas obtidas via {self.backend()} em "
+                   f"{time.monotonic() - inicio:.1f}s", "INFO")
+        return obtidas
+
+    async def _baixar_todas(self, urls):
+        cabecalhos = {"User-Agent": random.choice(PriceScraper.USER_AGENTS)}
+        semaforos = {}
+
+        if self.backend() == 'httpx':
+            cliente = httpx.AsyncClient(
+                http2=_HTTP2_DISPONIVEL,
+                headers=cabecalhos,
+                follow_redirects=True,
+                timeout=httpx.Timeout(self.timeout_total, connect=self.timeout_conexao),
+                limits=httpx.Limits(max_connections=self.max_conexoes)
+            )
+        else:
+            cliente = aiohttp.ClientSession(
+                headers=cabecalhos,
+                timeout=aiohttp.ClientTimeout(total=self.timeout_total, connect=self.timeout_conexao),
+                connector=aiohttp.TCPConnector(limit=self.max_conexoes, limit_per_host=self.max_por_host)
+            )
+
+        async with cliente:
+            resultados = await asyncio.gather(
+                *(self._baixar(cliente, url, semaforos) for url in urls)
+            )
+
+        return sum(1 for resultado in resultados if resultado)
+
+    async def _requisitar(self, cliente, url, cabecalhos):
+        """
+        Executa um GET com o cliente ativo.
+
+        Returns:
+            tuple: (status, texto, cabecalhos_resposta)
+        """
+        if httpx is not None and isinstance(cliente, httpx.AsyncClient):
+            resposta = await cliente.get(url, headers=cabecalhos)
+            return resposta.status_code, resposta.text, resposta.headers
+
+        async with cliente.get(url, headers=cabecalhos) as resposta:
+            texto = await resposta.text(errors='replace')
+            return resposta.status, texto, resposta.headers
+
+    async def _baixar(self, cliente, url, semaforos):
+        """
+        Baixa uma URL respeitando o limite por host e o intervalo do domínio.
+
+        Returns:
+            bool: True se a resposta foi obtida, False em caso de erro de rede
+        """
+        if self.cache.obter_memorizado(url):
+            return True
+
+        texto = self.cache.obter_valido(url)
+        if texto is not None:
+            self.cache.memorizar(url, 200, texto)
+            return True
+
+        dominio = PriceScraper.extrair_dominio(url)
+        semaforo = semaforos.setdefault(dominio, asyncio.Semaphore(self.max_por_host))
+
+        try:
+            async with semaforo:
+                espera = self.controlador.reservar(dominio)
+                if espera > 0:
+                    await asyncio.sleep(espera)
+
+                inicio = time.monotonic()
+                try:
+                    status, texto, cabecalhos = await self._requisitar(
+                        cliente, url, self.cache.cabecalhos_condicionais(url)
+                    )
+                except Exception:
+                    # Timeouts e erros de conexão também fazem o domínio recuar
+                    self.controlador.registrar_resposta(dominio, latencia=time.monotonic() - inicio, falha=True)
+                    raise
+                self.controlador.registrar_resposta(
+                    dominio, status, time.monotonic() - inicio,
+                    ControladorDominios.ler_retry_after(cabecalhos)
+                )
+
+            if status == 304:
+                texto = self.cache.revalidar(url)
+                if texto is None:
+                    # Entrada removida no meio do caminho: o scraper baixa a página de novo
+                    return False
+                status = 200
+            elif status == 200:
+                self.cache.armazenar_texto(url, texto, cabecalhos)
+
+            self.cache.memorizar(url, status, texto)
+            return True
+
+        except Exception as e:
+            Logger.log(f"Erro no download assíncrono de {url}: {e}", "WARNING")
+            return False
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Backends de parsing HTML para localizar o elemento de preço.
+"""
+
+import re
+from html import unescape
+from bs4 import BeautifulSoup
+from utils.logger import Logger
+
+# Backends opcionais: usados apenas quando instalados
+try:
+    from selectolax.parser import HTMLParser as _SelectolaxParser
+except ImportError:
+    _SelectolaxParser = None
+
+try:
+    import lxml  # noqa: F401 - usado pelo BeautifulSoup como construtor de árvore
+    _LXML_DISPONIVEL = True
+except ImportError:
+    _LXML_DISPONIVEL = False
+
+class ParserHTML:
+    # Ordem de preferência quando o backend é 'auto'
+    BACKENDS_PREFERIDOS = ('selectolax', 'lxml', 'html.parser')
+    # Tamanho (caracteres) do primeiro trecho analisado no modo progressivo
+    BLOCO_INICIAL = 256 * 1024
+    # Caracteres que precisam existir após o texto encontrado para aceitar o trecho
+    MARGEM_SEGURANCA = 8 * 1024
+
+    _TAGS = re.compile(r'<[^>]*>')
+    _ESPACOS = re.compile(r'\s+')
+
+    def __init__(self, backend='auto', progressivo=True, limite_caracteres=None):
+        """
+        Args:
+            backend (str): 'auto', 'selectolax', 'lxml' ou 'html.parser'
+            progressivo (bool): Se True, analisa trechos crescentes do documento
+                                e para assim que o seletor é encontrado
+            limite_caracteres (int, optional): Analisa no máximo este prefixo do documento
+        """
+        self.backend = self.resolver_backend(backend)
+        self.progressivo = progressivo
+        self.limite_caracteres = limite_caracteres
+
+    @staticmethod
+    def backends_disponiveis():
+        """
+        Lista os backends instalados, na ordem de preferência.
+
+        Returns:
+            list: Nomes dos backends disponíveis
+        """
+        disponiveis = []
+        if _SelectolaxParser is not None:
+            disponiveis.append('selectolax')
+        if _LXML_DISPONIVEL:
+            disponiveis.append('lxml')
+        disponiveis.append('html.parser')
+        return disponiveis
+
+    @classmethod
+    def resolver_backend(cls, backend):
+        """
+        Valida o backend solicitado, recorrendo ao melhor disponível.
+
+        Args:
+            backend (str): Backend solicitado ou 'auto'
+
+        Returns:
+            str: Backend efetivamente usado
+        """
+        disponiveis = cls.backends_disponiveis()
+
+        if backend in disponiveis:
+            return backend
+
+        if backend not in ('auto', None):
+            Logger.log(f"Parser '{backend}' indisponível, usando '{disponiveis[0]}'", "WARNING")
+
+        return disponiveis[0]
+
+    def selecionar_texto(self, html, seletor_css):
+        """
+        Retorna o texto do primeiro elemento que corresponde ao seletor.
+
+        Args:
+            html (str): Documento HTML
+            seletor_css (str): Seletor CSS do elemento
+
+        Returns:
+            str: Texto do elemento (sem espaços nas pontas) ou None se não encontrado
+        """
+        if self.limite_caracteres:
+            html = self._cortar(html, self.limite_caracteres)
+
+        if not self.progressivo:
+            return self._selecionar(html, seletor_css)
+
+        # Analisa trechos crescentes; o preço costuma estar no início da página
+        tamanho = self.BLOCO_INICIAL
+        while tamanho < len(html):
+            trecho = self._cortar(html, tamanho)
+            texto = self._selecionar(trecho, seletor_css)
+            if texto:
+                if self._texto_completo(trecho, texto):
+                    return texto
+                # Elemento encontrado mas não confirmado: uma única nova análise, da página inteira
+                break
+            tamanho *= 4
+
+        return self._selecionar(html, seletor_css)
+
+    @staticmethod
+    def _cortar(html, tamanho):
+        """
+        Corta o documento no último fechamento de tag antes do tamanho indicado,
+        para não deixar o texto de um elemento pela metade.
+
+        Args:
+            html (str): Documento HTML
+            tamanho (int): Número máximo de caracteres
+
+        Returns:
+            str: Prefixo do documento
+        """
+        if len(html) <= tamanho:
+            return html
+
+        fim = html.rfind('>', 0, tamanho)
+        return html[:fim + 1] if fim >= 0 else html[:tamanho]
+
+    def _texto_completo(self, trecho, texto):
+        """
+        Confere se o texto encontrado no trecho não foi truncado pelo corte:
+        ele precisa aparecer antes de uma margem final do trecho. Textos
+        divididos em várias tags ou com entidades (&nbsp;) são comparados com
+        o texto do trecho sem marcação, ignorando espaços.
+
+        Args:
+            trecho (str): Prefixo analisado
+            texto (str): Texto do elemento encontrado
+
+        Returns:
+            bool: True se o texto pode ser aceito
+        """
+        limite = len(trecho) - self.MARGEM_SEGURANCA
+        if limite <= 0:
+            return False
+
+        posicao = trecho.find(texto)
+        if posicao >= 0:
+            return posicao + len(texto) <= limite
+
+        seguro = unescape(self._TAGS.sub('', trecho[:limite]))
+        return self._ESPACOS.sub('', texto) in self._ESPACOS.sub('', seguro)
+
+    def _selecionar(self, html, seletor_css):
+        if self.backend == 'selectolax':
+            elemento = _SelectolaxParser(html).css_first(seletor_css)
+            if elemento is None:
+                return None
+            return elemento.text(strip=True) or None
+
+        soup = BeautifulSoup(html, self.backend)
+        elemento = soup.select_one(seletor_css)
+        if elemento is None:
+            return None
+        return elemento.get_text(strip=True) or None
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Pipeline de extração: download em threads e parsing em processos, em paralelo.
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from scraper.dados_estruturados import ExtratorDadosEstruturados
+from scraper.estrategias import EstrategiasDominio
+from scraper.executor import ExecutorConcorrente
+from scraper.parsers import ParserHTML
+from scraper.price_scraper import PriceScraper
+from utils.logger import Logger
+
+def extrair_precos_pagina(html, seletores, configuracao):
+    """
+    Extrai e converte o preço de uma página para cada seletor informado.
+    Executada nos processos do pipeline; recebe apenas dados serializáveis.
+
+    Args:
+        html (str): Corpo da página
+        seletores (list): Seletores CSS usados pelos produtos da página (None = só dados estruturados)
+        configuracao (tuple): (backend, progressivo, limite_caracteres, usar_dados_estruturados)
+
+    Returns:
+        dict: seletor -> preço (float) ou None se não encontrado
+    """
+    backend, progressivo, limite, usar_dados_estruturados = configuracao
+    parser = ParserHTML(backend, progressivo, limite)
+
+    # Os dados estruturados valem para todos os seletores da página; com seletor
+    # configurado, microdata e OpenGraph só são usados se ele falhar
+    estruturados = {}
+
+    def dados_estruturados(fontes):
+        if not usar_dados_estruturados:
+            return None
+        if fontes not in estruturados:
+            estruturados[fontes] = ExtratorDadosEstruturados.extrair(html, fontes)
+        return estruturados[fontes]
+
+    precos = {}
+    for seletor in seletores:
+        texto = dados_estruturados(ExtratorDadosEstruturados.fontes_prioritarias(seletor))
+        if not texto and seletor:
+            texto = (parser.selecionar_texto(html, seletor) or
+                     dados_estruturados(ExtratorDadosEstruturados.FONTES_SECUNDARIAS))
+        precos[seletor] = PriceScraper.converter_preco(texto) if texto else None
+
+    return precos
+
+class PipelineProcessos:
+    # Número de processos de parsing (um por núcleo)
+    PROCESSOS = os.cpu_count() or 1
+    # Abaixo deste número de páginas o parsing é feito no próprio processo
+    MIN_PAGINAS_PROCESSOS = 8
+    # Páginas baixadas aguardando extração, por processo; acima disso os downloads esperam
+    PAGINAS_POR_PROCESSO = 4
+
+    def __init__(self, processos=None, max_workers=None, max_por_dominio=None):
+        self.processos = max(1, processos or self.PROCESSOS)
+        self.executor = ExecutorConcorrente(max_workers, max_por_dominio)
+        # Pool criado na primeira extração que o justifica e reaproveitado até encerrar()
+        self._pool = None
+        self._lock_pool = threading.Lock()
+
+    def encerrar(self):
+        """
+        Encerra os processos de parsing; uma nova extração cria outro pool se precisar.
+        """
+        with self._lock_pool:
+            pool, self._pool = self._pool, None
+
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def extrair(self, produtos, scraper):
+        """
+        Baixa as páginas dos produtos em threads e extrai os preços em processos.
+        Cada página é enviada aos processos assim que seu download termina (e uma
+        única vez, mesmo que vários produtos apontem para ela); os downloads
+        aguardam quando há páginas demais esperando pelos processos.
+
+        Args:
+            produtos (list): Produtos a verificar
+            scraper (PriceScraper): Scraper usado no download e na escolha dos seletores
+
+        Returns:
+            tuple: (precos, pendentes) - dicionário id_produto -> preço dos produtos
+                   resolvidos e lista dos produtos que precisam da extração completa
+                   (Selenium, erros de rede ou seletor sem resultado)
+        """
+        estrategias = EstrategiasDominio.obter_instancia()
+        pendentes = []
+        produtos_por_url = {}
+
+        for produto in produtos:
+            dominio = scraper.extrair_dominio(produto.url)
+            if estrategias.estrategia_atual(dominio) == EstrategiasDominio.SELENIUM:
+                pendentes.append(produto)
+            else:
+                produtos_por_url.setdefault(produto.url, []).append(produto)
+
+        usar_processos = len(produtos_por_url) >= self.MIN_PAGINAS_PROCESSOS and self.processos > 1
+        pool = self._obter_pool() if usar_processos else None
+
+        # Download (E/S) em threads, com os limites por domínio; o parsing (CPU)
+        # começa nos processos enquanto as demais páginas ainda são baixadas
+        downloads = self.executor.executar(
+            list(produtos_por_url.keys()),
+            self._baixar_e_enviar(scraper, produtos_por_url, pool),
+            scraper.extrair_dominio
+        )
+
+        precos = {}
+        for url, enviado in downloads:
+            if enviado is None:
+                pendentes.extend(produtos_por_url[url])
+                continue
+
+            seletores, resultado = enviado
+            if isinstance(resultado, Future):
+                try:
+                    resultado = resultado.result()
+                except Exception as e:
+                    Logger.log(f"Erro ao extrair preço de {url} em processo: {e}", "WARNING")
+                    if isinstance(e, BrokenProcessPool):
+                        self._descartar_pool(pool)
+                    resultado = None
+
+            dominio = scraper.extrair_dominio(url)
+            for produto in produtos_por_url[url]:
+                valor = resultado.get(seletores[produto.id]) if resultado else None
+
+                # Falhas são registradas pela extração completa, que tenta o requests de novo
+                if valor is None:
+                    pendentes.append(produto)
+                else:
+                    precos[produto.id] = valor
+                    estrategias.registrar(dominio, EstrategiasDominio.REQUESTS, True)
+
+        Logger.log(f"Pipeline: {len(precos)} preços extraídos em processos, "
+                   f"{len(pendentes)} produtos para extração completa", "INFO")
+        return precos, pendentes
+
+    def _obter_pool(self):
+        """
+        Returns:
+            ProcessPoolExecutor: Pool de processos do pipeline, criado na primeira chamada
+        """
+        with self._lock_pool:
+            if self._pool is None:
+                # 'spawn' evita herdar as threads (navegadores, conexões) do processo principal
+                contexto = multiprocessing.get_context('spawn')
+                self._pool = ProcessPoolExecutor(max_workers=self.processos, mp_context=contexto)
+            return self._pool
+
+    def _descartar_pool(self, pool):
+        """
+        Descarta um pool quebrado (processo encerrado de forma anormal); a próxima
+        extração cria outro.
+        """
+        with self._lock_pool:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def _baixar_e_enviar(self, scraper, produtos_por_url, pool):
+        """
+        Monta a tarefa executada nas threads: baixa a página e, se ela foi obtida,
+        envia a extração ao pool (ou a executa localmente, sem pool).
+
+        Returns:
+            callable: Função url -> ({id_produto: seletor}, futuro ou resultado) ou None
+        """
+        configuracao = (PriceScraper.PARSER, PriceScraper.PARSE_PROGRESSIVO,
+                        PriceScraper.LIMITE_PARSE, PriceScraper.USAR_DADOS_ESTRUTURADOS)
+        em_processamento = threading.BoundedSemaphore(self.processos * self.PAGINAS_POR_PROCESSO)
+
+        def baixar_e_enviar(url):
+            try:
+                resposta = scraper.baixar_pagina(url)
+            except Exception as e:
+                Logger.log(f"Erro ao baixar {url}: {e}", "WARNING")
+                return None
+
+            if not resposta or resposta[0] != 200:
+                return None
+
+            seletores = {produto.id: scraper.obter_seletor_para_url(url) for produto in produtos_por_url[url]}
+            if pool is None:
+                return seletores, self._extrair_local(url, resposta[1], seletores, configuracao)
+
+            # Limita as páginas em memória aguardando os processos
+            em_processamento.acquire()
+            try:
+                futuro = pool.submit(extrair_precos_pagina, resposta[1], list(set(seletores.values())), configuracao)
+            except BrokenProcessPool as e:
+                em_processamento.release()
+                Logger.log(f"Pool de processos indisponível ({e}); extraindo {url} localmente", "WARNING")
+                self._descartar_pool(pool)
+                return seletores, self._extrair_local(url, resposta[1], seletores, configuracao)
+            except Exception:
+                em_processamento.release()
+                raise
+            futuro.add_done_callback(lambda _: em_processamento.release())
+            return seletores, futuro
+
+        return baixar_e_enviar
+
+    @staticmethod
+    def _extrair_local(url, html, seletores, configuracao):
+        try:
+            return extrair_precos_pagina(html, list(set(seletores.values())), configuracao)
+        except Exception as e:
+            Logger.log(f"Erro ao extrair preço de {url}: {e}", "WARNING")
+            return None
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Controle de cortesia por domínio: intervalo mínimo entre requisições e recuo adaptativo.
+"""
+
+import threading
+import time
+from utils.logger import Logger
+
+class _EstadoDominio:
+    def __init__(self, intervalo):
+        self.intervalo = intervalo
+        self.proxima_liberacao = 0.0
+        self.latencia_media = None
+        self.latencia_base = None
+
+class ControladorDominios:
+    # Intervalo mínimo (segundos) entre requisições ao mesmo domínio
+    INTERVALO_MINIMO = 1.0
+    # Intervalo máximo (segundos) atingido pelo recuo
+    INTERVALO_MAXIMO = 60.0
+    # Multiplicador aplicado ao intervalo em respostas 429/503
+    FATOR_RECUO = 2.0
+    # Multiplicador aplicado quando a latência sobe acima do limiar
+    FATOR_RECUO_LATENCIA = 1.5
+    # Multiplicador aplicado após respostas normais (volta gradual ao mínimo)
+    FATOR_RECUPERACAO = 0.8
+    # Latência média acima de LIMIAR_LATENCIA x latência base indica sobrecarga
+    LIMIAR_LATENCIA = 2.0
+    # Peso da última amostra na média móvel exponencial da latência
+    PESO_LATENCIA = 0.3
+    # Códigos HTTP que indicam que o site está limitando as requisições
+    CODIGOS_RECUO = (429, 503)
+
+    _instancia = None
+    _lock_instancia = threading.Lock()
+
+    def __init__(self, intervalo_minimo=None):
+        self.intervalo_minimo = self.INTERVALO_MINIMO if intervalo_minimo is None else intervalo_minimo
+        self._estados = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def obter_instancia(cls):
+        """
+        Retorna o controlador compartilhado pelo processo.
+
+        Returns:
+            ControladorDominios: Instância compartilhada
+        """
+        with cls._lock_instancia:
+            if cls._instancia is None:
+                cls._instancia = cls()
+            return cls._instancia
+
+    def _estado(self, dominio):
+        estado = self._estados.get(dominio)
+        if estado is None:
+            estado = _EstadoDominio(self.intervalo_minimo)
+            self._estados[dominio] = estado
+        return estado
+
+    def reservar(self, dominio):
+        """
+        Reserva o próximo horário livre para uma requisição ao domínio.
+
+        Args:
+            dominio (str): Domínio da requisição
+
+        Returns:
+            float: Segundos que o chamador deve aguardar antes de enviar a requisição
+        """
+        with self._lock:
+            estado = self._estado(dominio)
+            agora = time.monotonic()
+            inicio = max(agora, estado.proxima_liberacao)
+            estado.proxima_liberacao = inicio + estado.intervalo
+            return inicio - agora
+
+    def aguardar(self, dominio):
+        """
+        Bloqueia a thread atual até que o domínio possa receber uma nova requisição.
+
+        Args:
+            dominio (str): Domínio da requisição
+        """
+        espera = self.reservar(dominio)
+        if espera > 0:
+            time.sleep(espera)
+
+    def registrar_resposta(self, dominio, status=None, latencia=None, retry_after=None, falha=False):
+        """
+        Ajusta o intervalo do domínio de acordo com o resultado de uma requisição.
+
+        Args:
+            dominio (str): Domínio da requisição
+            status (int, optional): Código HTTP da resposta (None se não houver)
+            latencia (float, optional): Tempo de resposta em segundos
+            retry_after (float, optional): Valor do cabeçalho Retry-After, em segundos
+            falha (bool): True se a requisição terminou sem resposta (timeout ou
+                erro de conexão); recua como em CODIGOS_RECUO
+        """
+        recuo = falha or status in self.CODIGOS_RECUO
+
+        with self._lock:
+            estado = self._estado(dominio)
+            anterior = estado.intervalo
+
+            if latencia is not None:
+                if estado.latencia_media is None:
+                    estado.latencia_media = latencia
+                else:
+                    estado.latencia_media = (self.PESO_LATENCIA * latencia +
+                                             (1 - self.PESO_LATENCIA) * estado.latencia_media)
+
+                if estado.latencia_base is None or estado.latencia_media < estado.latencia_base:
+                    estado.latencia_base = estado.latencia_media
+
+            if recuo:
+                estado.intervalo = max(estado.intervalo * self.FATOR_RECUO, retry_after or 0)
+            elif (estado.latencia_base and estado.latencia_media and
+                  estado.latencia_media > estado.latencia_base * self.LIMIAR_LATENCIA):
+                estado.intervalo *= self.FATOR_RECUO_LATENCIA
+            else:
+                estado.intervalo *= self.FATOR_RECUPERACAO
+
+            estado.intervalo = min(self.INTERVALO_MAXIMO, max(self.intervalo_minimo, estado.intervalo))
+
+            if recuo:
+                # Nenhuma nova requisição ao domínio antes do fim do recuo
+                estado.proxima_liberacao = max(estado.proxima_liberacao, time.monotonic() + estado.intervalo)
+
+        if estado.intervalo > anterior and estado.intervalo >= anterior * self.FATOR_RECUO_LATENCIA:
+            Logger.log(f"Recuo em {dominio}: intervalo entre requisições de {anterior:.1f}s para "
+                       f"{estado.intervalo:.1f}s ({'sem resposta' if falha else f'status {status}'})", "INFO")
+
+    @staticmethod
+    def ler_retry_after(cabecalhos):
+        """
+        Lê o cabeçalho Retry-After quando ele está expresso em segundos.
+
+        Args:
+            cabecalhos (Mapping): Cabeçalhos da resposta HTTP
+
+        Returns:
+            float: Segundos a aguardar ou None se ausente/inválido
+        """
+        try:
+            return float(cabecalhos.get('Retry-After'))
+        except (TypeError, ValueError):
+            return None
+
+    def esta_em_recuo(self, dominio):
+        """
+        Indica se o domínio está com o intervalo acima do mínimo configurado.
+
+        Args:
+            dominio (str): Domínio a consultar
+
+        Returns:
+            bool: True se o domínio está em recuo, False caso contrário
+        """
+        with self._lock:
+            estado = self._estados.get(dominio)
+            return bool(estado and estado.intervalo > self.intervalo_minimo)
@@ -5,19 +5,25 @@
 Módulo para extração de preços de produtos em sites.
 """
 
+import os
 import re
-import time
 import random
+import threading
+import time
 import requests
+from datetime import datetime
 from urllib.parse import urlparse
-from bs4 import BeautifulSoup
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException, StaleElementReferenceException, WebDriverException
 from utils.logger import Logger
 from database.connector import DatabaseConnector
+from scraper.browser_pool import BrowserPool
+from scraper.politica_dominios import ControladorDominios
+from scraper.cache_http import CacheHTTP
+from scraper.parsers import ParserHTML
+from scraper.dados_estruturados import ExtratorDadosEstruturados
+from scraper.estrategias import EstrategiasDominio
 
 class PriceScraper:
     # Lista de user agents para requests
@@ -28,15 +34,76 @@ class PriceScraper:
         'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36 Edg/91.0.864.59'
     ]
     
+    # Backend de parsing HTML: 'auto', 'selectolax', 'lxml' ou 'html.parser'
+    PARSER = os.environ.get('MONITOR_PRECOS_PARSER', 'auto')
+    # Analisa trechos crescentes da página e para quando o seletor é encontrado
+    PARSE_PROGRESSIVO = True
+    # Limite opcional (caracteres) do prefixo da página analisado; None analisa tudo
+    LIMITE_PARSE = None
+    
+    # Procura o preço em JSON-LD/microdata/OpenGraph antes de usar o seletor CSS
+    USAR_DADOS_ESTRUTURADOS = True
+    
+    # Sufixos públicos de dois níveis: nenhum seletor é compartilhado entre lojas
+    # registradas sob eles (ex.: loja-a.com.br e loja-b.com.br)
+    SUFIXOS_PUBLICOS = frozenset({
+        'com.br', 'net.br', 'org.br', 'gov.br', 'edu.br', 'art.br', 'blog.br', 'eco.br',
+        'emp.br', 'ind.br', 'inf.br', 'tur.br', 'app.br', 'dev.br', 'log.br', 'srv.br',
+        'com.ar', 'com.mx', 'com.co', 'com.pe', 'com.uy', 'com.py', 'com.bo', 'com.ec',
+        'com.ve', 'com.pt', 'co.uk', 'org.uk', 'ac.uk', 'gov.uk', 'com.au',
+        'net.au', 'org.au', 'co.jp', 'ne.jp', 'co.nz', 'co.za', 'com.cn', 'com.tw',
+        'com.hk', 'co.in', 'co.kr', 'com.sg', 'com.tr', 'com.es', 'co.il',
+    })
+    
+    # Índice em memória domínio -> seletor, compartilhado entre instâncias
+    _indice_seletores = None
+    _lock_indice = threading.Lock()
+    
+    # Sessões HTTP por thread, reaproveitando conexões keep-alive entre produtos
+    _sessoes = threading.local()
+    
     def __init__(self):
-        # Criamos a sessão uma vez
-        self.session = requests.Session()
-        self.session.headers.update({
-            "User-Agent": random.choice(self.USER_AGENTS)
-        })
+        self.controlador = ControladorDominios.obter_instancia()
+        self.cache = CacheHTTP.obter_instancia()
+        self.parser = ParserHTML(self.PARSER, self.PARSE_PROGRESSIVO, self.LIMITE_PARSE)
+        self.estrategias = EstrategiasDominio.obter_instancia()
+        # Estado por thread: a mesma instância pode ser usada pelos workers do monitoramento
+        self._local = threading.local()
         self.db = DatabaseConnector()
     
-    def extrair_dominio(self, url):
+    @property
+    def session(self):
+        """
+        Sessão HTTP da thread atual, criada no primeiro uso.
+        
+        Returns:
+            requests.Session: Sessão compartilhada pelos scrapers da thread
+        """
+        sessao = getattr(self._sessoes, 'sessao', None)
+        if sessao is None:
+            sessao = requests.Session()
+            sessao.headers.update({
+                "User-Agent": random.choice(self.USER_AGENTS)
+            })
+            self._sessoes.sessao = sessao
+        return sessao
+    
+    @property
+    def ultimo_status(self):
+        """
+        Status HTTP da última requisição feita por esta instância na thread atual.
+        
+        Returns:
+            int: Código HTTP ou None se a requisição não obteve resposta
+        """
+        return getattr(self._local, 'ultimo_status', None)
+    
+    @ultimo_status.setter
+    def ultimo_status(self, status):
+        self._local.ultimo_status = status
+    
+    @staticmethod
+    def extrair_dominio(url):
         """
         Extrai o domínio base de uma URL.
         Exemplo: https://www.tuningparts.com.br/produtos/123 -> tuningparts.com.br
@@ -48,7 +115,7 @@ class PriceScraper:
             str: Domínio extraído
         """
         parsed_url = urlparse(url)
-        dominio = parsed_url.netloc
+        dominio = parsed_url.hostname or ''  # Sem porta, credenciais e em minúsculas
         
         # Remove 'www.' se presente
         if dominio.startswith('www.'):
@@ -56,7 +123,8 @@ class PriceScraper:
         
         return dominio
     
-    def converter_preco(self, preco_texto):
+    @staticmethod
+    def converter_preco(preco_texto):
         """
         Converte uma string de preço em float.
         Considera separadores de milhar e decimal (ex.: "R$ 1.234,56" ou "1234.56").
@@ -68,7 +136,8 @@ class PriceScraper:
             float: Valor numérico do preço
         """
         preco_texto = preco_texto.replace("R$", "").strip()
-        padrao = re.compile(r'(\d{1,3}(?:[.,]\d{3})*(?:[.,]\d+)?)')
+        # Números com separador de milhar ("1.234,56") ou sem ele ("1234.56")
+        padrao = re.compile(r'(\d{1,3}(?:[.,]\d{3})+(?:[.,]\d+)?|\d+(?:[.,]\d+)?)')
         resultado = padrao.search(preco_texto)
         
         if resultado:
@@ -87,88 +156,304 @@ class PriceScraper:
                 return None
         return None
     
-    def extrair_preco_requests(self, url, seletor_css):
+    def baixar_pagina(self, url):
+        """
+        Obtém o HTML de uma URL, reutilizando o cache sempre que possível.
+        URLs repetidas na mesma execução são baixadas uma única vez; respostas
+        dentro do TTL são lidas do disco e as demais são revalidadas com
+        requisições condicionais (ETag/Last-Modified).
+        
+        Args:
+            url (str): URL da página
+            
+        Returns:
+            tuple: (status, texto) da resposta
+        """
+        memorizado = self.cache.obter_memorizado(url)
+        if memorizado:
+            return memorizado
+        
+        with self.cache.bloqueio(url):
+            # Outra thread pode ter baixado a mesma URL enquanto aguardávamos
+            memorizado = self.cache.obter_memorizado(url)
+            if memorizado:
+                return memorizado
+            
+            texto = self.cache.obter_valido(url)
+            if texto is not None:
+                self.cache.memorizar(url, 200, texto)
+                return 200, texto
+            
+            dominio = self.extrair_dominio(url)
+            self.controlador.aguardar(dominio)
+            
+            inicio = time.monotonic()
+            try:
+                response = self.session.get(url, timeout=30, headers=self.cache.cabecalhos_condicionais(url))
+            except requests.exceptions.RequestException:
+                # Timeouts e erros de conexão também indicam um domínio sobrecarregado
+                self.controlador.registrar_resposta(dominio, latencia=time.monotonic() - inicio, falha=True)
+                raise
+            self.controlador.registrar_resposta(
+                dominio, response.status_code, time.monotonic() - inicio,
+                ControladorDominios.ler_retry_after(response.headers)
+            )
+            
+            status, texto = response.status_code, response.text
+            if status == 304:
+                texto = self.cache.revalidar(url)
+                if texto is None:
+                    # Entrada removida entre a requisição e a leitura: baixar de novo
+                    self.controlador.aguardar(dominio)
+                    inicio = time.monotonic()
+                    try:
+                        response = self.session.get(url, timeout=30)
+                    except requests.exceptions.RequestException:
+                        self.controlador.registrar_resposta(dominio, latencia=time.monotonic() - inicio, falha=True)
+                        raise
+                    self.controlador.registrar_resposta(
+                        dominio, response.status_code, time.monotonic() - inicio,
+                        ControladorDominios.ler_retry_after(response.headers)
+                    )
+                    status, texto = response.status_code, response.text
+                else:
+                    status = 200
+            
+            if response.status_code == 200:
+                self.cache.armazenar(url, response)
+            
+            self.cache.memorizar(url, status, texto)
+            return status, texto
+    
+    def extrair_preco_requests(self, url, seletor_css=None):
         """
-        Tenta extrair o preço usando requests e BeautifulSoup para sites estáticos.
+        Tenta extrair o preço usando requests para sites estáticos.
+        Os dados estruturados da página são consultados antes do seletor CSS.
         
         Args:
             url (str): URL do produto
-            seletor_css (str): Seletor CSS para encontrar o elemento de preço
+            seletor_css (str, optional): Seletor CSS para encontrar o elemento de preço
             
         Returns:
             str: Texto do preço encontrado ou None se não encontrado
         """
+        self.ultimo_status = None
+        
         try:
-            response = self.session.get(url, timeout=30)
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.text, "html.parser")
-                elemento = soup.select_one(seletor_css)
-                if elemento:
-                    return elemento.get_text(strip=True)
+            status, texto = self.baixar_pagina(url)
+            self.ultimo_status = status
+            
+            if status == 200:
+                # Com seletor configurado, microdata e OpenGraph só são usados se ele falhar
+                if self.USAR_DADOS_ESTRUTURADOS:
+                    preco = ExtratorDadosEstruturados.extrair(
+                        texto, ExtratorDadosEstruturados.fontes_prioritarias(seletor_css)
+                    )
+                    if preco:
+                        return preco
+                
+                if seletor_css:
+                    preco = self.parser.selecionar_texto(texto, seletor_css)
+                    if preco or not self.USAR_DADOS_ESTRUTURADOS:
+                        return preco
+                    return ExtratorDadosEstruturados.extrair(texto, ExtratorDadosEstruturados.FONTES_SECUNDARIAS)
         except Exception as e:
             Logger.log(f"Erro com requests em {url}: {e}", "WARNING")
         return None
     
-    def extrair_preco_selenium(self, url, seletor_css):
+    def extrair_preco_selenium(self, url, seletor_css=None):
         """
         Usa Selenium para extrair o preço em sites que carregam conteúdo via JavaScript.
+        Sem seletor CSS, procura o preço nos dados estruturados da página renderizada.
         
         Args:
             url (str): URL do produto
-            seletor_css (str): Seletor CSS para encontrar o elemento de preço
+            seletor_css (str, optional): Seletor CSS para encontrar o elemento de preço
             
         Returns:
             str: Texto do preço encontrado ou None se não encontrado
         """
-        driver = None
         try:
-            chrome_options = Options()
-            chrome_options.add_argument("--headless")  # Executa sem interface gráfica
-            chrome_options.add_argument("--disable-gpu")
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            # Inicializa o WebDriver automaticamente com webdriver-manager
-            driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
-            
-            driver.get(url)
-            time.sleep(5)  # Aguarda para que o JavaScript carregue o conteúdo
-            
-            elemento = driver.find_element(By.CSS_SELECTOR, seletor_css)
-            preco = elemento.text.strip()
+            pool = BrowserPool.obter_instancia()
+            
+            dominio = self.extrair_dominio(url)
+            
+            with pool.navegador() as driver:
+                self.controlador.aguardar(dominio)
+                inicio = time.monotonic()
+                try:
+                    driver.get(url)
+                except WebDriverException:
+                    # Tempo de carregamento esgotado ou falha de rede no navegador
+                    self.controlador.registrar_resposta(dominio, latencia=time.monotonic() - inicio, falha=True)
+                    raise
+                self.controlador.registrar_resposta(dominio, latencia=time.monotonic() - inicio)
+                
+                if not seletor_css:
+                    return ExtratorDadosEstruturados.extrair(driver.page_source)
+                
+                # Aguarda apenas o necessário para o elemento aparecer com texto
+                espera = WebDriverWait(
+                    driver, pool.TEMPO_MAXIMO_ESPERA,
+                    ignored_exceptions=(StaleElementReferenceException,)
+                )
+                elemento = espera.until(
+                    lambda d: self._elemento_com_texto(d, seletor_css)
+                )
+                
+                return elemento.text.strip()
             
-            return preco
+        except TimeoutException:
+            Logger.log(f"Seletor '{seletor_css}' não apareceu a tempo em {url}", "WARNING")
+            return None
             
         except Exception as e:
             Logger.log(f"Erro com Selenium em {url}: {e}", "WARNING")
             return None
+    
+    def _elemento_com_texto(self, driver, seletor_css):
+        """
+        Condição de espera: retorna o elemento quando ele existe e já tem texto.
+        
+        Args:
+            driver (WebDriver): Driver do Selenium
+            seletor_css (str): Seletor CSS do elemento de preço
             
-        finally:
-            if driver:
-                driver.quit()
+        Returns:
+            WebElement: Elemento encontrado ou False para continuar aguardando
+        """
+        elementos = driver.find_elements(By.CSS_SELECTOR, seletor_css)
+        if elementos and elementos[0].text.strip():
+            return elementos[0]
+        return False
     
-    def extrair_preco(self, url, seletor_css):
+    def extrair_preco(self, url, seletor_css=None):
         """
-        Tenta extrair o preço primeiro com requests.
-        Se não conseguir, recorre ao Selenium.
+        Extrai o preço com o método que já funcionou para o domínio.
+        Por padrão tenta requests (dados estruturados e seletor CSS) e recorre ao Selenium;
+        domínios que só funcionam com JavaScript vão direto ao Selenium, com
+        sondagens periódicas do requests.
         
         Args:
             url (str): URL do produto
-            seletor_css (str): Seletor CSS para encontrar o elemento de preço
+            seletor_css (str, optional): Seletor CSS para encontrar o elemento de preço;
+                                         sem ele, apenas os dados estruturados são usados
             
         Returns:
             str: Texto do preço encontrado ou None se não encontrado
         """
+        dominio = self.extrair_dominio(url)
+        
+        if self.estrategias.escolher(dominio) == EstrategiasDominio.SELENIUM:
+            preco = self.extrair_preco_selenium(url, seletor_css)
+            self.estrategias.registrar(dominio, EstrategiasDominio.SELENIUM, bool(preco))
+            if preco:
+                return preco
+            
+            Logger.log(f"Selenium falhou, tentando requests na URL: {url}", "INFO")
+            preco = self.extrair_preco_requests(url, seletor_css)
+            self.estrategias.registrar(dominio, EstrategiasDominio.REQUESTS, bool(preco))
+            return preco
+        
         preco = self.extrair_preco_requests(url, seletor_css)
+        self.estrategias.registrar(dominio, EstrategiasDominio.REQUESTS, bool(preco))
         if preco:
             return preco
+        elif self.ultimo_status in ControladorDominios.CODIGOS_RECUO:
+            # O site pediu para reduzir o ritmo; abrir o navegador só aumentaria a carga
+            Logger.log(f"Site limitando requisições ({self.ultimo_status}), Selenium ignorado para: {url}", "WARNING")
+            return None
         else:
             Logger.log(f"Fallback para Selenium na URL: {url}", "INFO")
-            return self.extrair_preco_selenium(url, seletor_css)
+            preco = self.extrair_preco_selenium(url, seletor_css)
+            self.estrategias.registrar(dominio, EstrategiasDominio.SELENIUM, bool(preco))
+            return preco
+    
+    @classmethod
+    def carregar_indice_seletores(cls):
+        """
+        Carrega o índice em memória de seletores a partir de 'plataformas' e 'dominios'.
+        
+        Returns:
+            dict: Índice com os mapeamentos domínio -> seletor por plataforma e por domínio
+        """
+        db = DatabaseConnector()
+        conexao, cursor = db.criar_conexao()
+        
+        # Seletores de plataforma, indexados pelo domínio dos produtos que a usam
+        cursor.execute('''
+        SELECT p.url, pl.seletor_css
+        FROM produtos p
+        JOIN plataformas pl ON p.id_plataforma = pl.id
+        ORDER BY p.id
+        ''')
+        
+        plataformas = {}
+        for resultado in cursor.fetchall():
+            if resultado['seletor_css']:
+                plataformas.setdefault(cls.extrair_dominio(resultado['url']), resultado['seletor_css'])
+        
+        # Seletores cadastrados por domínio
+        cursor.execute("SELECT nome, seletor_css FROM dominios")
+        
+        dominios = {}
+        for resultado in cursor.fetchall():
+            if resultado['seletor_css']:
+                dominios[cls._normalizar_dominio(resultado['nome'])] = resultado['seletor_css']
+        
+        conexao.close()
+        
+        indice = {'plataformas': plataformas, 'dominios': dominios}
+        
+        with cls._lock_indice:
+            cls._indice_seletores = indice
+        
+        return indice
+    
+    @classmethod
+    def invalidar_indice_seletores(cls):
+        """
+        Descarta o índice de seletores; ele será recarregado na próxima consulta.
+        """
+        with cls._lock_indice:
+            cls._indice_seletores = None
+    
+    @staticmethod
+    def _normalizar_dominio(dominio):
+        """
+        Normaliza um nome de domínio para comparação (minúsculas, sem 'www.').
+        
+        Args:
+            dominio (str): Domínio informado
+            
+        Returns:
+            str: Domínio normalizado
+        """
+        dominio = dominio.strip().lower().rstrip('.')
+        return dominio[4:] if dominio.startswith('www.') else dominio
+    
+    @classmethod
+    def _sufixos_dominio(cls, dominio):
+        """
+        Gera o domínio e seus sufixos, do mais específico ao domínio registrável.
+        Exemplo: loja.exemplo.com.br -> loja.exemplo.com.br, exemplo.com.br
+        
+        Args:
+            dominio (str): Domínio normalizado
+            
+        Returns:
+            list: Domínios candidatos, sem sufixos públicos (com.br, co.uk, ...)
+        """
+        partes = dominio.split('.')
+        # O domínio registrável tem um rótulo a mais que o sufixo público
+        rotulos_minimos = 3 if '.'.join(partes[-2:]) in cls.SUFIXOS_PUBLICOS else 2
+        return ['.'.join(partes[i:]) for i in range(max(len(partes) - rotulos_minimos + 1, 1))]
     
     def obter_seletor_para_url(self, url):
         """
         Busca o seletor CSS mais adequado para uma URL.
-        Primeiro verifica se já há seletor para a plataforma, depois para o domínio.
+        Primeiro verifica se já há seletor para a plataforma, depois para o domínio,
+        testando o domínio exato e em seguida seus sufixos.
         
         Args:
             url (str): URL do produto
@@ -176,50 +461,20 @@ class PriceScraper:
         Returns:
             str: Seletor CSS ou None se não encontrado
         """
-        dominio = self.extrair_dominio(url)
+        dominio = self._normalizar_dominio(self.extrair_dominio(url))
         
         try:
-            conexao, cursor = self.db.criar_conexao()
+            indice = self._indice_seletores
+            if indice is None:
+                indice = self.carregar_indice_seletores()
             
-            # 1. Primeiro tenta encontrar por plataforma (baseado em produtos anteriores com mesma URL)
-            cursor.execute('''
-            SELECT pl.seletor_css
-            FROM produtos p
-            JOIN plataformas pl ON p.id_plataforma = pl.id
-            WHERE p.url LIKE ?
-            LIMIT 1
-            ''', (f"%{dominio}%",))
-            
-            resultado = cursor.fetchone()
-            if resultado and resultado['seletor_css']:
-                conexao.close()
-                return resultado['seletor_css']
-            
-            # 2. Tenta encontrar pelo domínio exato
-            cursor.execute('''
-            SELECT seletor_css FROM dominios WHERE nome = ?
-            ''', (dominio,))
-            
-            resultado = cursor.fetchone()
-            if resultado and resultado['seletor_css']:
-                conexao.close()
-                return resultado['seletor_css']
-            
-            # 3. Tenta encontrar pelo domínio parcial
-            cursor.execute('''
-            SELECT seletor_css FROM dominios WHERE ? LIKE CONCAT('%', nome, '%')
-            LIMIT 1
-            ''', (dominio,))
-            
-            resultado = cursor.fetchone()
-            if resultado and resultado['seletor_css']:
-                conexao.close()
-                return resultado['seletor_css']
-            
-            conexao.close()
+            for candidato in self._sufixos_dominio(dominio):
+                seletor = indice['plataformas'].get(candidato) or indice['dominios'].get(candidato)
+                if seletor:
+                    return seletor
             
             # Se não encontrou nada, retorna None
-            Logger.log(f"Não foi encontrado seletor CSS para o domínio: {dominio}", "WARNING")
+            Logger.log(f"Não foi encontrado seletor CSS para o domínio: {dominio}", "INFO")
             return None
             
         except Exception as e:
@@ -260,6 +515,8 @@ class PriceScraper:
             conexao.commit()
             conexao.close()
             
+            self.invalidar_indice_seletores()
+            
             Logger.log(f"Seletor CSS salvo para o domínio: {dominio}", "INFO")
             return True
             
@@ -307,6 +564,8 @@ class PriceScraper:
             conexao.commit()
             conexao.close()
             
+            self.invalidar_indice_seletores()
+            
             Logger.log(f"Seletor CSS salvo para a plataforma: {nome_plataforma}", "INFO")
             return id_plataforma
             
@@ -60,9 +60,11 @@ class AdminView(UsuarioView):
             print("5. Configurar agendamento automático")
             print("6. Visualizar fila de agendamento")
             print("7. Iniciar agendador automático")
+            print("8. Frequência e prioridade de verificação")
+            print("9. Importar produtos de arquivo (CSV/JSONL)")
             print("0. Voltar ao menu principal")
             
-            opcao = input("\nEscolha uma opção (0-7): ")
+            opcao = input("\nEscolha uma opção (0-9): ")
             
             if opcao == '1':
                 # Se não tiver cliente selecionado, pede para selecionar
@@ -102,19 +104,23 @@ class AdminView(UsuarioView):
                 # Lista todos os produtos
                 if self.cliente_atual:
                     print(f"\nListando produtos para o cliente: {self.cliente_atual}")
-                    produtos = ProdutoController.listar_produtos(cliente=self.cliente_atual, usuario_atual=self.usuario_logado)
+                    produtos = ProdutoController.iterar_produtos(cliente=self.cliente_atual, usuario_atual=self.usuario_logado)
                 else:
                     print("\nListando todos os produtos:")
-                    produtos = ProdutoController.listar_produtos(usuario_atual=self.usuario_logado)
-                
-                if produtos:
-                    print(f"{'ID':<5} | {'Cliente':<20} | {'Produto':<30} | {'Concorrente':<20}")
-                    print("-" * 80)
+                    produtos = ProdutoController.iterar_produtos(usuario_atual=self.usuario_logado)
+                
+                # Os produtos são exibidos à medida que são lidos do banco
+                total = 0
+                for p in produtos:
+                    if total == 0:
+                        print(f"{'ID':<5} | {'Cliente':<20} | {'Produto':<30} | {'Concorrente':<20}")
+                        print("-" * 80)
                     
-                    for p in produtos:
-                        print(f"{p['id']:<5} | {p['cliente'][:20]:<20} | {p['produto'][:30]:<30} | {p['concorrente'][:20]:<20}")
-                        
-                    print(f"\nTotal: {len(produtos)} produtos")
+                    print(f"{p['id']:<5} | {p['cliente'][:20]:<20} | {p['produto'][:30]:<30} | {p['concorrente'][:20]:<20}")
+                    total += 1
+                
+                if total:
+                    print(f"\nTotal: {total} produtos")
                 else:
                     print("\nNenhum produto encontrado.")
                     
@@ -199,6 +205,16 @@ class AdminView(UsuarioView):
                 # Iniciar agendador
                 self.iniciar_agendador()
                 
+            elif opcao == '8':
+                # Frequência e prioridade por produto, cliente ou domínio
+                self.configurar_frequencia_verificacao()
+                input("\nPressione Enter para continuar...")
+                
+            elif opcao == '9':
+                # Cadastro de produtos em lote a partir de um arquivo
+                self.importar_produtos()
+                input("\nPressione Enter para continuar...")
+                
             elif opcao == '0':
                 return
                 
@@ -546,10 +562,149 @@ class AdminView(UsuarioView):
                 
                 input("\nPressione Enter para continuar...")
                 
+            elif opcao == '4':
+                self.gerenciar_clientes_grupo()
+                input("\nPressione Enter para continuar...")
+                
+            elif opcao == '5':
+                self.gerenciar_usuarios_grupo()
+                input("\nPressione Enter para continuar...")
+                
+            elif opcao == '6':
+                # Associa ao grupo 'all' todos os clientes cadastrados
+                from models.grupo import Grupo
+                if Grupo.sincronizar_grupo_all():
+                    print("\nGrupo 'Todos' sincronizado com todos os clientes.")
+                else:
+                    print("\nErro ao sincronizar o grupo 'Todos'.")
+                input("\nPressione Enter para continuar...")
+                
             elif opcao == '0':
                 return
             # ... implementar as outras opções
     
+    def _selecionar_grupo(self):
+        """
+        Pede o ID de um grupo e o carrega.
+        
+        Returns:
+            Grupo: Grupo escolhido ou None
+        """
+        from models.grupo import Grupo
+        
+        id_grupo = input("\nID do grupo: ").strip()
+        grupo = Grupo.buscar_por_id_grupo(id_grupo) if id_grupo else None
+        
+        if not grupo:
+            print("Grupo não encontrado.")
+        return grupo
+    
+    def _ler_ids(self, mensagem, ids_disponiveis):
+        """
+        Lê uma lista de IDs separados por vírgula ('*' seleciona todos os disponíveis).
+        
+        Args:
+            mensagem (str): Texto do prompt
+            ids_disponiveis (list): IDs aceitos
+            
+        Returns:
+            list: IDs escolhidos, sem os que não estão em ids_disponiveis
+        """
+        entrada = input(mensagem).strip()
+        
+        if entrada == '*':
+            return list(ids_disponiveis)
+        
+        aceitos = set(ids_disponiveis)
+        ids = []
+        for parte in entrada.replace(';', ',').split(','):
+            parte = parte.strip()
+            if parte.isdigit() and int(parte) in aceitos:
+                ids.append(int(parte))
+        return ids
+    
+    def gerenciar_clientes_grupo(self):
+        """Interface para adicionar ou remover clientes de um grupo em lote."""
+        from models.cliente import Cliente
+        
+        grupo = self._selecionar_grupo()
+        if not grupo:
+            return
+        
+        no_grupo = grupo.obter_clientes()
+        ids_no_grupo = {c['id'] for c in no_grupo}
+        fora_do_grupo = [c for c in Cliente.listar_todos() if c.id not in ids_no_grupo]
+        
+        print(f"\nClientes do grupo '{grupo.id_grupo}':")
+        for cliente in no_grupo:
+            print(f"  {cliente['id']:>5}. {cliente['nome']}")
+        print("\nClientes fora do grupo:")
+        for cliente in fora_do_grupo:
+            print(f"  {cliente.id:>5}. {cliente.nome}")
+        
+        print("\n1. Adicionar clientes")
+        print("2. Remover clientes")
+        print("0. Voltar")
+        
+        sub_opcao = input("\nEscolha uma opção (0-2): ")
+        
+        if sub_opcao == '1':
+            ids = self._ler_ids("IDs dos clientes a adicionar (separados por vírgula, * = todos): ",
+                                [c.id for c in fora_do_grupo])
+            resultado = grupo.adicionar_clientes(ids) if ids else 0
+        elif sub_opcao == '2':
+            ids = self._ler_ids("IDs dos clientes a remover (separados por vírgula, * = todos): ",
+                                sorted(ids_no_grupo))
+            resultado = grupo.remover_clientes(ids) if ids else 0
+        else:
+            return
+        
+        if resultado is None:
+            print("Erro ao atualizar os clientes do grupo.")
+        else:
+            print(f"{resultado} clientes atualizados no grupo '{grupo.id_grupo}'.")
+    
+    def gerenciar_usuarios_grupo(self):
+        """Interface para adicionar ou remover usuários de um grupo em lote."""
+        from models.usuario import Usuario
+        
+        grupo = self._selecionar_grupo()
+        if not grupo:
+            return
+        
+        no_grupo = grupo.obter_usuarios()
+        ids_no_grupo = {u['id'] for u in no_grupo}
+        fora_do_grupo = [u for u in Usuario.listar_todos() if u.id not in ids_no_grupo]
+        
+        print(f"\nUsuários do grupo '{grupo.id_grupo}':")
+        for usuario in no_grupo:
+            print(f"  {usuario['id']:>5}. {usuario['username']} ({usuario['nome']})")
+        print("\nUsuários fora do grupo:")
+        for usuario in fora_do_grupo:
+            print(f"  {usuario.id:>5}. {usuario.username} ({usuario.nome})")
+        
+        print("\n1. Adicionar usuários")
+        print("2. Remover usuários")
+        print("0. Voltar")
+        
+        sub_opcao = input("\nEscolha uma opção (0-2): ")
+        
+        if sub_opcao == '1':
+            ids = self._ler_ids("IDs dos usuários a adicionar (separados por vírgula, * = todos): ",
+                                [u.id for u in fora_do_grupo])
+            resultado = grupo.adicionar_usuarios(ids) if ids else 0
+        elif sub_opcao == '2':
+            ids = self._ler_ids("IDs dos usuários a remover (separados por vírgula, * = todos): ",
+                                sorted(ids_no_grupo))
+            resultado = grupo.remover_usuarios(ids) if ids else 0
+        else:
+            return
+        
+        if resultado is None:
+            print("Erro ao atualizar os usuários do grupo.")
+        else:
+            print(f"{resultado} usuários atualizados no grupo '{grupo.id_grupo}'.")
+    
     def menu_gerenciar_dominios(self):
         """Interface para gerenciar domínios e seletores."""
         while True:
@@ -562,9 +717,10 @@ class AdminView(UsuarioView):
             print("3. Testar seletor em URL")
             print("4. Listar plataformas")
             print("5. Adicionar plataforma")
+            print("6. Estratégias de extração por domínio")
             print("0. Voltar ao menu anterior")
             
-            opcao = input("\nEscolha uma opção (0-5): ")
+            opcao = input("\nEscolha uma opção (0-6): ")
             
             if opcao == '1':
                 # Listar domínios cadastrados
@@ -591,6 +747,11 @@ class AdminView(UsuarioView):
                 self.adicionar_plataforma()
                 input("\nPressione Enter para continuar...")
                 
+            elif opcao == '6':
+                # Estratégias de extração por domínio
+                self.listar_estrategias_dominio()
+                input("\nPressione Enter para continuar...")
+                
             elif opcao == '0':
                 return
                 
@@ -610,9 +771,11 @@ class AdminView(UsuarioView):
             print("3. Otimizar banco de dados")
             print("4. Reconstruir índices")
             print("5. Relatório de atividade")
+            print("6. Reconstruir resumo de preços")
+            print("7. Limpar cache de páginas")
             print("0. Voltar ao menu anterior")
             
-            opcao = input("\nEscolha uma opção (0-5): ")
+            opcao = input("\nEscolha uma opção (0-7): ")
             
             if opcao == '1':
                 # Criar backup
@@ -639,6 +802,16 @@ class AdminView(UsuarioView):
                 self.relatorio_atividade_sistema()
                 input("\nPressione Enter para continuar...")
                 
+            elif opcao == '6':
+                # Recalcular o resumo de preços a partir do histórico
+                self.reconstruir_resumo_precos()
+                input("\nPressione Enter para continuar...")
+                
+            elif opcao == '7':
+                # Remover páginas antigas (ou todas) do cache HTTP em disco
+                self.limpar_cache_paginas()
+                input("\nPressione Enter para continuar...")
+                
             elif opcao == '0':
                 return
                 
@@ -790,18 +963,105 @@ class AdminView(UsuarioView):
             print("- Os produtos são verificados na ordem da fila")
             print("- Produtos verificados manualmente não são verificados automaticamente no mesmo dia")
             print("- Após verificação, o produto vai para o final da fila")
+            print("- Produtos reservados por um agendador em execução não aparecem até a reserva terminar")
+            print("- Produtos com intervalo próprio só aparecem quando o intervalo vence; maior prioridade vem antes")
             
         except Exception as e:
             Logger.log(f"Erro ao visualizar fila de agendamento: {e}", "ERROR")
             print(f"Erro ao visualizar fila: {e}")
     
+    def configurar_frequencia_verificacao(self):
+        """Interface para definir intervalo e prioridade de verificação de produtos."""
+        print("\nFREQUÊNCIA E PRIORIDADE DE VERIFICAÇÃO")
+        print("-" * 60)
+        print("Produtos com intervalo fixo são verificados pelo agendador sempre que o intervalo")
+        print("vence. No modo automático o produto segue os dias e horários do agendamento (ou, com")
+        print("MONITOR_PRECOS_FREQUENCIA_ADAPTATIVA=1, um intervalo ajustado à frequência com que o preço muda).")
+        print("Produtos com maior prioridade são atendidos primeiro.\n")
+        print("Aplicar a:")
+        print("1. Um produto")
+        print("2. Todos os produtos de um cliente")
+        print("3. Todos os produtos de um domínio")
+        
+        try:
+            from controllers.scheduler_controller import SchedulerController
+            
+            escopo = input("\nEscolha uma opção (1-3): ")
+            
+            if escopo == '1':
+                ids_produtos = [int(input("ID do produto: "))]
+            elif escopo == '2':
+                ids_produtos = SchedulerController.produtos_por_cliente(int(input("ID do cliente: ")))
+            elif escopo == '3':
+                ids_produtos = SchedulerController.produtos_por_dominio(input("Domínio (ex: www.loja.com.br): ").strip())
+            else:
+                print("Opção inválida.")
+                return
+            
+            if not ids_produtos:
+                print("Nenhum produto encontrado.")
+                return
+            
+            intervalo = input("Intervalo em horas (ex: 1, 24, 168; 0 = automático; Enter = manter): ").strip()
+            prioridade = input("Prioridade (número inteiro, padrão 0; Enter = manter): ").strip()
+            
+            if intervalo:
+                horas = float(intervalo.replace(',', '.'))
+                segundos = int(horas * 3600) if horas > 0 else None
+                atualizados = SchedulerController.definir_intervalo_verificacao(ids_produtos, segundos)
+                print(f"Intervalo atualizado em {atualizados} produtos.")
+            
+            if prioridade:
+                atualizados = SchedulerController.definir_prioridade(ids_produtos, int(prioridade))
+                print(f"Prioridade atualizada em {atualizados} produtos.")
+            
+        except ValueError:
+            print("Valor inválido.")
+        except Exception as e:
+            Logger.log(f"Erro ao configurar frequência de verificação: {e}", "ERROR")
+            print(f"Erro ao configurar frequência de verificação: {e}")
+    
+    def importar_produtos(self):
+        """Interface para importar produtos de um arquivo CSV ou JSONL."""
+        print("\nIMPORTAR PRODUTOS")
+        print("-" * 60)
+        print("O arquivo deve ter os campos cliente, produto, concorrente e url")
+        print("(CSV com cabeçalho ou JSONL, um objeto por linha).\n")
+        
+        caminho = input("Caminho do arquivo: ").strip()
+        if not caminho:
+            return
+        if not os.path.isfile(caminho):
+            print("Arquivo não encontrado.")
+            return
+        
+        print("\nImportando... (os preços de cada produto são testados antes do cadastro)")
+        relatorio = ProdutoController.importar_produtos(caminho, usuario_atual=self.usuario_logado)
+        
+        print(f"\nRegistros lidos: {relatorio['lidos']}")
+        print(f"Produtos importados: {relatorio['importados']}")
+        print(f"Já cadastrados: {relatorio['existentes']}")
+        print(f"Falhas: {relatorio['total_falhas']}")
+        
+        for falha in relatorio['falhas'][:20]:
+            print(f"- linha {falha['linha']}: {falha['motivo']} {falha['url']}".rstrip())
+        if relatorio['total_falhas'] > 20:
+            print(f"... e mais {relatorio['total_falhas'] - 20} falhas")
+        
+        if relatorio['falhas'] and input("\nGravar as falhas em CSV? (s/n): ").lower() == 's':
+            from controllers.importador_produtos import ImportadorProdutos
+            destino = os.path.splitext(caminho)[0] + "_falhas.csv"
+            if ImportadorProdutos.salvar_falhas(relatorio, destino):
+                print(f"Falhas gravadas em {destino}")
+    
     def iniciar_agendador(self):
         """Interface para iniciar o agendador automático."""
         print("\nINICIAR AGENDADOR AUTOMÁTICO")
         print("-" * 60)
         print("ATENÇÃO: Esta operação iniciará o agendador em modo contínuo.")
         print("O sistema executará o monitoramento de preços nos dias e horários configurados.")
-        print("Para encerrar o agendador, pressione Ctrl+C.\n")
+        print("Para encerrar o agendador, pressione Ctrl+C.")
+        print("Para executá-lo sem esta interface (ex.: como serviço), use: python main.py agendador\n")
         
         confirmar = input("Deseja iniciar o agendador agora? (s/n): ")
         
@@ -958,6 +1218,35 @@ class AdminView(UsuarioView):
             Logger.log(f"Erro ao listar domínios: {e}", "ERROR")
             print(f"Erro ao listar domínios: {e}")
 
+    def listar_estrategias_dominio(self):
+        """Lista o método de extração preferido e as estatísticas de cada domínio."""
+        print("\nESTRATÉGIAS DE EXTRAÇÃO POR DOMÍNIO")
+        print("-" * 60)
+        
+        try:
+            from scraper.estrategias import EstrategiasDominio
+            estrategias = EstrategiasDominio.obter_instancia().listar()
+            
+            if estrategias:
+                print(f"{'Domínio':<30} | {'Estratégia':<10} | {'Requests (ok/falha)':<19} | "
+                      f"{'Selenium (ok/falha)':<19} | {'Atualização':<19}")
+                print("-" * 110)
+                
+                for e in estrategias:
+                    requests_stats = f"{e['sucessos_requests']}/{e['falhas_requests']}"
+                    selenium_stats = f"{e['sucessos_selenium']}/{e['falhas_selenium']}"
+                    print(f"{e['dominio'][:30]:<30} | {e['estrategia']:<10} | {requests_stats:<19} | "
+                          f"{selenium_stats:<19} | {(e['data_atualizacao'] or '-')[:19]:<19}")
+                
+                print(f"\nTotal: {len(estrategias)} domínios")
+                print(f"Domínios em Selenium testam o requests a cada {EstrategiasDominio.SONDAGEM_A_CADA} extrações.")
+            else:
+                print("Nenhuma estratégia registrada ainda.")
+                
+        except Exception as e:
+            Logger.log(f"Erro ao listar estratégias por domínio: {e}", "ERROR")
+            print(f"Erro ao listar estratégias por domínio: {e}")
+    
     def adicionar_dominio(self):
         """Adiciona um novo domínio com seletor CSS."""
         print("\nADICIONAR NOVO DOMÍNIO")
@@ -1107,6 +1396,19 @@ class AdminView(UsuarioView):
                 for indice, info in resultado['indices'].items():
                     print(f"- {indice} (tabela: {info['tabela']})")
                 
+                if resultado['indices_ausentes']:
+                    print("\nÍndices ausentes ou desatualizados:")
+                    for indice in resultado['indices_ausentes']:
+                        print(f"- {indice}")
+                    print("Use 'Reconstruir índices' para criá-los.")
+                
+                # Perfil de desempenho
+                perfil = resultado['perfil']
+                print(f"\nPerfil de desempenho: {perfil['perfil']}")
+                for pragma, valor in perfil['efetivo'].items():
+                    aviso = " (diverge do perfil)" if pragma in perfil['divergencias'] else ""
+                    print(f"- {pragma}: {valor}{aviso}")
+                
                 # Integridade
                 print(f"\nIntegridade do banco: {resultado['integridade']}")
                 
@@ -1172,4 +1474,62 @@ class AdminView(UsuarioView):
                 
         except Exception as e:
             Logger.log(f"Erro ao reconstruir índices: {e}", "ERROR")
-            print(f"Erro ao reconstruir índices: {e}")
\ No newline at end of file
+            print(f"Erro ao reconstruir índices: {e}")
+    
+    def reconstruir_resumo_precos(self):
+        """Recalcula o resumo de preços de todos os produtos a partir do histórico."""
+        print("\nRECONSTRUIR RESUMO DE PREÇOS")
+        print("-" * 60)
+        print("O resumo (preço atual, mínimo, máximo, média e contagem) é atualizado a cada")
+        print("preço gravado; reconstrua-o se o histórico tiver sido alterado diretamente no banco.\n")
+        
+        try:
+            from controllers.admin_controller import AdminController
+            
+            confirmar = input("Deseja reconstruir o resumo de preços agora? (s/n): ")
+            
+            if confirmar.lower() != 's':
+                print("Operação cancelada.")
+                return
+            
+            print("\nReconstruindo resumo...")
+            total = AdminController.reconstruir_resumo_precos()
+            
+            if total is not None:
+                print(f"Resumo reconstruído para {total} produtos!")
+            else:
+                print("Erro ao reconstruir o resumo de preços.")
+                
+        except Exception as e:
+            Logger.log(f"Erro ao reconstruir resumo de preços: {e}", "ERROR")
+            print(f"Erro ao reconstruir resumo de preços: {e}")
+    
+    def limpar_cache_paginas(self):
+        """Remove páginas antigas ou todas as páginas do cache HTTP em disco."""
+        print("\nLIMPAR CACHE DE PÁGINAS")
+        print("-" * 60)
+        print("As páginas baixadas ficam em disco para reutilização e revalidação; as antigas")
+        print("são podadas automaticamente ao final das execuções.\n")
+        print("1. Remover apenas páginas antigas (idade ou tamanho máximos)")
+        print("2. Remover todas as páginas")
+        print("0. Cancelar")
+        
+        try:
+            from controllers.admin_controller import AdminController
+            
+            opcao = input("\nEscolha uma opção (0-2): ")
+            
+            if opcao not in ('1', '2'):
+                print("Operação cancelada.")
+                return
+            
+            removidas = AdminController.limpar_cache_paginas(apenas_antigas=(opcao == '1'))
+            
+            if removidas is not None:
+                print(f"{removidas} páginas removidas do cache!")
+            else:
+                print("Erro ao limpar o cache de páginas.")
+                
+        except Exception as e:
+            Logger.log(f"Erro ao limpar cache de páginas: {e}", "ERROR")
+            print(f"Erro ao limpar cache de páginas: {e}")